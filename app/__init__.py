@@ -1,15 +1,50 @@
+import json
 import os
+import click
 from datetime import timedelta
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from flask_socketio import SocketIO
+from .bid_writer import BidWriter
+from .state_store import AuctionStateStore
+from .timer_wheel import TimerWheel
+from .fraud import FraudEngine
+from .budget_ledger import BudgetLedger
+from .journal import StateJournal
+from .live_cache import LivePageCache
+from .fanout import RoomFanout
+from .metrics import Metrics
+from .auction_runner import AuctionRunner
+from .passwords import LoginRateLimiter, PasswordHasher
+from .entity_cache import EntityCache
+from .db_executor import DBExecutor
+from .clock import Clock
+from .leaderboard import Leaderboard
+from .lobby import Lobby
 
 # Extensions
 
 db = SQLAlchemy()
 login_manager = LoginManager()
 socketio = SocketIO(async_mode="eventlet", cors_allowed_origins="*")
+clock = Clock()
+bid_writer = BidWriter()
+state_store = AuctionStateStore()
+timer_wheel = TimerWheel()
+fraud_engine = FraudEngine()
+budget_ledger = BudgetLedger()
+state_journal = StateJournal()
+live_cache = LivePageCache()
+fanout = RoomFanout()
+metrics = Metrics()
+auction_runner = AuctionRunner()
+password_hasher = PasswordHasher()
+login_limiter = LoginRateLimiter()
+entity_cache = EntityCache()
+db_executor = DBExecutor()
+leaderboard = Leaderboard()
+lobby = Lobby()
 
 
 def create_app() -> Flask:
@@ -18,11 +53,43 @@ def create_app() -> Flask:
 	app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL", "sqlite:////workspace/auction.db")
 	app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 	app.config["REMEMBER_COOKIE_DURATION"] = timedelta(days=7)
+	# Shared live-auction state and Socket.IO fan-out for multi-worker deployments
+	app.config["AUCTION_STATE_URL"] = os.environ.get("AUCTION_STATE_URL")
+	app.config["SOCKETIO_MESSAGE_QUEUE"] = os.environ.get("SOCKETIO_MESSAGE_QUEUE", app.config["AUCTION_STATE_URL"])
+	app.config["AUCTION_JOURNAL_PATH"] = os.environ.get("AUCTION_JOURNAL_PATH")
+	# /metrics: admins, or a scraper sending "Authorization: Bearer <METRICS_TOKEN>"
+	app.config["METRICS_ENABLED"] = os.environ.get("METRICS_ENABLED", "1") != "0"
+	app.config["METRICS_TOKEN"] = os.environ.get("METRICS_TOKEN")
+	app.config["PROFILE_REQUESTS"] = os.environ.get("PROFILE_REQUESTS") == "1"
+	app.config["PROFILE_DIR"] = os.environ.get("PROFILE_DIR")
+	# Password hashing runs off the hub, at most this many at once
+	app.config["PASSWORD_HASH_CONCURRENCY"] = int(os.environ.get("PASSWORD_HASH_CONCURRENCY", 4))
+	app.config["LOGIN_RATE_LIMIT"] = int(os.environ.get("LOGIN_RATE_LIMIT", 10))  # attempts per IP per minute
+	# Socket-path commits run on a native worker thread; SQLite gets WAL + synchronous=NORMAL
+	app.config["DB_EXECUTOR"] = os.environ.get("DB_EXECUTOR", "1") != "0"
+	app.config["SQLITE_BUSY_TIMEOUT"] = int(os.environ.get("SQLITE_BUSY_TIMEOUT", 5000))  # ms
 
 	# Init extensions
 	db.init_app(app)
 	login_manager.init_app(app)
-	socketio.init_app(app)
+	socketio.init_app(app, message_queue=app.config["SOCKETIO_MESSAGE_QUEUE"])
+	clock.init_app(app)
+	bid_writer.init_app(app)
+	state_store.init_app(app)
+	timer_wheel.init_app(app)
+	fraud_engine.init_app(app)
+	budget_ledger.init_app(app)
+	state_journal.init_app(app)
+	live_cache.init_app(app)
+	fanout.init_app(app)
+	metrics.init_app(app)
+	auction_runner.init_app(app)
+	password_hasher.init_app(app)
+	login_limiter.init_app(app)
+	entity_cache.init_app(app)
+	db_executor.init_app(app)
+	leaderboard.init_app(app)
+	lobby.init_app(app)
 
 	login_manager.login_view = "auth.login"
 
@@ -33,6 +100,7 @@ def create_app() -> Flask:
 	from .routes.player import player_bp
 	from .routes.spectator import spectator_bp
 	from .routes.auction import auction_bp
+	from .routes.metrics import metrics_bp
 
 	app.register_blueprint(auth_bp)
 	app.register_blueprint(admin_bp, url_prefix="/admin")
@@ -40,10 +108,59 @@ def create_app() -> Flask:
 	app.register_blueprint(player_bp, url_prefix="/player")
 	app.register_blueprint(spectator_bp, url_prefix="/spectator")
 	app.register_blueprint(auction_bp, url_prefix="/auction")
+	app.register_blueprint(metrics_bp)
 
 	# Import socket handlers to bind events
 	from . import sockets  # noqa: F401
 
+	@app.cli.command("revalue-players")
+	def revalue_players_command():
+		"""Recompute ai_valuation for every player with the current model."""
+		from .valuation import revalue_all
+		checked, updated = revalue_all()
+		click.echo(f"Re-valued {checked} players ({updated} changed)")
+
+	@app.cli.command("import-players")
+	@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+	@click.option("--auction-id", type=int, help="Also add the players to this auction's pool")
+	@click.option("--batch-size", type=int, default=1000)
+	def import_players_command(path, auction_id, batch_size):
+		"""Bulk-load players from a CSV or NDJSON file."""
+		from .player_import import import_players
+		fmt = "csv" if path.lower().endswith(".csv") else "ndjson"
+
+		def progress(stage, done, total):
+			click.echo(f"{stage}: {done}/{total}")
+
+		with open(path, encoding="utf-8-sig", newline="") as fh:
+			try:
+				report = import_players(fh, fmt, auction_id=auction_id, batch_size=batch_size, progress=progress)
+			except ValueError as exc:
+				click.echo(str(exc), err=True)
+				raise SystemExit(1)
+		for line_no, message in report.errors:
+			click.echo(f"line {line_no}: {message}", err=True)
+		for name, count in report.sets.items():
+			click.echo(f"  {name}: {count}")
+		click.echo(report.summary())
+
+	@app.cli.command("rebuild-leaderboards")
+	@click.option("--auction-id", type=int, help="Only this auction")
+	def rebuild_leaderboards_command(auction_id):
+		"""Print standings recomputed from auction_players; exit 1 if a team's budget disagrees with its purchases."""
+		# A running server keeps its own boards; this process only reads the
+		# database, so the check is of the incrementally kept team budgets
+		leaderboard.rebuild(auction_id)
+		for aid in leaderboard.loaded():
+			_, body = leaderboard.get(aid)
+			teams = [t for t in json.loads(body)["teams"] if t["players"]]
+			click.echo(f"auction {aid}: {sum(t['players'] for t in teams)} sold to {len(teams)} teams, {sum(t['spend'] for t in teams):,} spent")
+		drift = leaderboard.ledger_drift()
+		for team_id, spent, bought in drift:
+			click.echo(f"team {team_id}: budget says {spent:,} spent, purchases total {bought:,}", err=True)
+		if drift:
+			raise SystemExit(1)
+
 	# Root route
 	from flask import render_template, redirect, url_for
 
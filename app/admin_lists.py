@@ -0,0 +1,177 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import collate, or_, update
+from .models import db, Auction, AuctionPlayer, Player, Team
+
+# Admin dashboard lists: keyset pages (cost independent of page depth) and
+# set-based bulk approve/reject. Players sort by name, case-insensitively,
+# over ix_players_approved_name / ix_players_name so prefix search and
+# paging are both index range scans.
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+BULK_LIMIT = 5000
+
+
+@dataclass
+class Page:
+	items: list
+	next_cursor: Optional[str]
+
+
+def _limit(limit: int) -> int:
+	return max(1, min(limit or PAGE_SIZE, MAX_PAGE_SIZE))
+
+
+def _page(rows: list, limit: int, cursor_of) -> Page:
+	more = len(rows) > limit
+	rows = rows[:limit]
+	return Page(rows, cursor_of(rows[-1]) if more else None)
+
+
+def _parse_cursor(cursor: str, key: Optional[Callable[[str], object]] = None) -> Tuple[object, int]:
+	# Cursors come back in the query string: "key|id", or a bare id when the
+	# list is keyed by id alone. Raises ValueError for one we didn't issue.
+	text, sep, row_id = cursor.rpartition("|")
+	try:
+		if bool(sep) != (key is not None):
+			raise ValueError
+		row_id = int(row_id)
+		if not 0 <= row_id < 2 ** 63:  # SQLite integers
+			raise ValueError
+		return (key(text) if key else None), row_id
+	except (TypeError, ValueError):
+		raise ValueError(f"invalid cursor {cursor!r}") from None
+
+
+def counts() -> Dict[str, object]:
+	by_status = dict(db.session.query(Auction.status, db.func.count()).group_by(Auction.status))
+	return {
+		"pending_teams": Team.query.filter(Team.approved.is_(False)).count(),
+		"pending_players": Player.query.filter(Player.approved.is_(False)).count(),
+		"players": db.session.query(db.func.count(Player.id)).scalar(),
+		"auctions": by_status,
+	}
+
+
+def auction_page(cursor: Optional[str] = None, limit: int = PAGE_SIZE) -> Page:
+	# Newest first, on ix_auctions_scheduled_id
+	limit = _limit(limit)
+	q = db.session.query(Auction.id, Auction.name, Auction.scheduled_at, Auction.status)
+	if cursor:
+		ts, row_id = _parse_cursor(cursor, datetime.fromisoformat)
+		q = q.filter(Auction.scheduled_at <= ts, or_(Auction.scheduled_at < ts, Auction.id < row_id))
+	rows = q.order_by(Auction.scheduled_at.desc(), Auction.id.desc()).limit(limit + 1).all()
+	return _page(rows, limit, lambda r: f"{r.scheduled_at.isoformat()}|{r.id}")
+
+
+def pending_team_page(cursor: Optional[str] = None, limit: int = PAGE_SIZE) -> Page:
+	# Oldest registrations first, on ix_teams_approved
+	limit = _limit(limit)
+	q = db.session.query(Team.id, Team.name, Team.budget_total).filter(Team.approved.is_(False))
+	if cursor:
+		_, row_id = _parse_cursor(cursor)
+		q = q.filter(Team.id > row_id)
+	rows = q.order_by(Team.id.asc()).limit(limit + 1).all()
+	return _page(rows, limit, lambda r: str(r.id))
+
+
+def _escape_like(text: str) -> str:
+	return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def player_page(
+	q: Optional[str] = None,
+	role: Optional[str] = None,
+	min_price: Optional[int] = None,
+	max_price: Optional[int] = None,
+	approved: Optional[bool] = False,
+	cursor: Optional[str] = None,
+	limit: int = PAGE_SIZE,
+) -> Page:
+	# Name-prefix search (case-insensitive) with role and base price filters
+	limit = _limit(limit)
+	name = collate(Player.name, "NOCASE")
+	query = db.session.query(Player.id, Player.name, Player.role, Player.base_price, Player.ai_valuation, Player.approved)
+	if approved is not None:
+		query = query.filter(Player.approved.is_(approved))
+	if q:
+		query = query.filter(Player.name.like(_escape_like(q.strip()) + "%", escape="\\"))
+	if role:
+		query = query.filter(Player.role == role)
+	if min_price is not None:
+		query = query.filter(Player.base_price >= min_price)
+	if max_price is not None:
+		query = query.filter(Player.base_price <= max_price)
+	if cursor:
+		after, row_id = _parse_cursor(cursor, str)
+		# Spelled out rather than as a row value so SQLite seeks on the index
+		query = query.filter(name >= after, or_(name > after, Player.id > row_id))
+	rows = query.order_by(name.asc(), Player.id.asc()).limit(limit + 1).all()
+	return _page(rows, limit, lambda r: f"{r.name}|{r.id}")
+
+
+def _ids(ids: Iterable) -> List[int]:
+	out = []
+	for value in ids:
+		try:
+			out.append(int(value))
+		except (TypeError, ValueError):
+			continue
+	return out[:BULK_LIMIT]
+
+
+def approve_players(ids: Iterable) -> int:
+	ids = _ids(ids)
+	if not ids:
+		return 0
+	count = Player.query.filter(Player.id.in_(ids), Player.approved.is_(False)).update({Player.approved: True}, synchronize_session=False)
+	db.session.commit()
+	return count
+
+
+def reject_players(ids: Iterable) -> int:
+	# Only pending registrations that were never put in an auction
+	ids = _ids(ids)
+	if not ids:
+		return 0
+	linked = db.session.query(AuctionPlayer.player_id).filter(AuctionPlayer.player_id.in_(ids))
+	count = Player.query.filter(
+		Player.id.in_(ids),
+		Player.approved.is_(False),
+		Player.id.notin_(linked),
+	).delete(synchronize_session=False)
+	db.session.commit()
+	return count
+
+
+def approve_teams(ids: Iterable) -> List[int]:
+	# Returns the ids approved; an approved team starts with its full budget
+	ids = _ids(ids)
+	if not ids:
+		return []
+	stmt = (
+		update(Team)
+		.where(Team.id.in_(ids), Team.approved.is_(False))
+		.values(approved=True, budget_remaining=Team.budget_total)
+		.returning(Team.id)
+	)
+	approved = [tid for (tid,) in db.session.execute(stmt, execution_options={"synchronize_session": False})]
+	db.session.commit()
+	return approved
+
+
+def reject_teams(ids: Iterable) -> int:
+	# Only pending teams (the budget ledger never lets them bid) with no purchases
+	ids = _ids(ids)
+	if not ids:
+		return 0
+	bought = db.session.query(AuctionPlayer.sold_to_team_id).filter(AuctionPlayer.sold_to_team_id.in_(ids))
+	count = Team.query.filter(
+		Team.id.in_(ids),
+		Team.approved.is_(False),
+		Team.id.notin_(bought),
+	).delete(synchronize_session=False)
+	db.session.commit()
+	return count
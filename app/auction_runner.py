@@ -0,0 +1,211 @@
+from __future__ import annotations
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional
+from flask import Flask
+
+
+@dataclass
+class RunState:
+	auction_id: int
+	duration: int
+	gap: float
+	min_increment: int
+	unsold_round: bool
+	unsold_duration: int
+	queue: Deque[int] = field(default_factory=deque)  # auction_player ids still to call
+	unsold: List[int] = field(default_factory=list)  # passed in the main round
+	round: str = "main"  # main, unsold
+	paused: bool = False
+	current_ap_id: Optional[int] = None
+	next_card: Optional[dict] = None
+
+
+class AuctionRunner:
+	# Walks an auction's lots by order_index without an admin in the loop:
+	# when finalize_sale closes a lot the next one starts gap seconds later on
+	# the timer wheel. The next lot's card is loaded and broadcast as soon as
+	# the current lot starts, so the transition itself is in-memory work and
+	# clients already hold the card when player_start arrives. Lots that go
+	# unsold are called again, with a shorter clock, after the main round.
+
+	def __init__(self) -> None:
+		self.app: Optional[Flask] = None
+		self._runs: Dict[int, RunState] = {}
+
+	def init_app(self, app: Flask) -> None:
+		self.app = app
+		app.extensions["auction_runner"] = self
+
+	def get(self, auction_id: int) -> Optional[RunState]:
+		return self._runs.get(auction_id)
+
+	def next_card(self, auction_id: int) -> Optional[dict]:
+		run = self._runs.get(auction_id)
+		return run.next_card if run else None
+
+	def start(self, auction_id: int, duration: int = 30, gap: float = 3.0, min_increment: int = 100000, unsold_round: bool = True, unsold_duration: int = 15) -> RunState:
+		# Starting a running auction again is a no-op. A lot an admin put on the
+		# block by hand is adopted as the current lot rather than restarted, so
+		# its bids and reservations stand; so is one still closing, and the run
+		# moves on once its result is out.
+		from . import lobby, state_store
+		from .models import db, Auction, AuctionPlayer
+		run = self._runs.get(auction_id)
+		if run is not None:
+			return run
+		state = state_store.get(auction_id)
+		live_ap_id = state.current_ap_id
+		rows = (
+			db.session.query(AuctionPlayer.id)
+			.filter(AuctionPlayer.auction_id == auction_id, AuctionPlayer.status == "available")
+			.order_by(AuctionPlayer.order_index.asc(), AuctionPlayer.id.asc())
+		)
+		run = RunState(auction_id, duration, gap, min_increment, unsold_round, unsold_duration, deque(r.id for r in rows if r.id != live_ap_id))
+		run.current_ap_id = live_ap_id
+		self._runs[auction_id] = run
+		Auction.query.filter_by(id=auction_id).update({"status": "live"})
+		db.session.commit()
+		lobby.auctions_changed()
+		if live_ap_id is None:
+			self._advance(auction_id)
+		else:
+			self._prefetch(run)
+		return run
+
+	def pause(self, auction_id: int) -> None:
+		# The lot on the block still closes normally; the next one waits
+		from . import timer_wheel, fanout
+		run = self._runs.get(auction_id)
+		if run is None or run.paused:
+			return
+		run.paused = True
+		timer_wheel.cancel(("advance", auction_id))
+		fanout.emit(auction_id, "commentary", {"text": "Auction paused"})
+
+	def resume(self, auction_id: int) -> None:
+		from . import fanout
+		run = self._runs.get(auction_id)
+		if run is None or not run.paused:
+			return
+		run.paused = False
+		fanout.emit(auction_id, "commentary", {"text": "Auction resumed"})
+		if run.current_ap_id is None:
+			self._schedule(run, run.gap)
+
+	def skip(self, auction_id: int) -> None:
+		# Pass the lot on the block: it closes unsold whatever has been bid and,
+		# in the main round, comes back in the unsold round. The next lot
+		# follows after the usual gap unless the run is paused.
+		from .sockets import pass_lot
+		run = self._runs.get(auction_id)
+		if run is None or run.current_ap_id is None:
+			return
+		pass_lot(auction_id)
+
+	def stop(self, auction_id: int) -> None:
+		from . import timer_wheel
+		timer_wheel.cancel(("advance", auction_id))
+		self._runs.pop(auction_id, None)
+
+	def lot_closed(self, auction_id: int, ap_id: int, status: str) -> None:
+		# Called by finalize_sale once the result has been broadcast
+		run = self._runs.get(auction_id)
+		if run is None or run.current_ap_id != ap_id:
+			return
+		run.current_ap_id = None
+		if status == "unsold" and run.round == "main":
+			run.unsold.append(ap_id)
+		if not run.paused:
+			self._schedule(run, run.gap)
+
+	def _schedule(self, run: RunState, delay: float) -> None:
+		from . import timer_wheel
+		auction_id = run.auction_id
+		timer_wheel.schedule(("advance", auction_id), delay, lambda: self._advance(auction_id))
+
+	def _advance(self, auction_id: int) -> None:
+		from . import metrics
+		run = self._runs.get(auction_id)
+		if run is None or run.paused or run.current_ap_id is not None:
+			return
+		t0 = time.perf_counter()
+		if not run.queue and run.round == "main" and run.unsold_round and run.unsold:
+			self._begin_unsold_round(run)
+		if not run.queue:
+			self._finish(run)
+			return
+		from .sockets import on_start_player
+		ap_id = run.queue.popleft()
+		run.current_ap_id = ap_id
+		ack = on_start_player({
+			"auction_id": auction_id,
+			"auction_player_id": ap_id,
+			"duration": run.unsold_duration if run.round == "unsold" else run.duration,
+			"min_increment": run.min_increment,
+		})
+		if not ack["ok"]:
+			# A lot started by hand is still closing; try again after the gap
+			run.queue.appendleft(ap_id)
+			run.current_ap_id = None
+			self._schedule(run, run.gap)
+			return
+		metrics.lot_transition_seconds.observe(time.perf_counter() - t0)
+		# Off the transition's critical path: load and announce the lot after this one
+		self._prefetch(run)
+
+	def _prefetch(self, run: RunState) -> None:
+		from . import fanout
+		run.next_card = self._card(run.queue[0]) if run.queue else None
+		if run.next_card is not None:
+			fanout.emit(run.auction_id, "next_player", run.next_card)
+
+	def _card(self, ap_id: int) -> Optional[dict]:
+		# Same shape as the lots in the live page bootstrap
+		from .models import db, AuctionPlayer, Player
+		r = (
+			db.session.query(
+				AuctionPlayer.id, AuctionPlayer.player_id, AuctionPlayer.status, AuctionPlayer.order_index,
+				Player.name, Player.role, Player.base_price, Player.highlight_url,
+			)
+			.outerjoin(Player, Player.id == AuctionPlayer.player_id)
+			.filter(AuctionPlayer.id == ap_id)
+			.first()
+		)
+		if r is None:
+			return None
+		return {
+			"id": r.id,
+			"player_id": r.player_id,
+			"status": "available",
+			"order_index": r.order_index,
+			"player": {
+				"id": r.player_id,
+				"name": r.name,
+				"role": r.role,
+				"base_price": r.base_price or 0,
+				"highlight_url": r.highlight_url,
+			},
+		}
+
+	def _begin_unsold_round(self, run: RunState) -> None:
+		from . import fanout, live_cache
+		from .models import db, AuctionPlayer
+		# finalize_sale only settles lots that are still available
+		AuctionPlayer.query.filter(AuctionPlayer.id.in_(run.unsold)).update({"status": "available"}, synchronize_session=False)
+		db.session.commit()
+		live_cache.invalidate(run.auction_id)
+		run.round = "unsold"
+		run.queue = deque(run.unsold)
+		run.unsold = []
+		fanout.emit(run.auction_id, "commentary", {"text": f"Unsold round: {len(run.queue)} players return"})
+
+	def _finish(self, run: RunState) -> None:
+		from . import fanout, lobby
+		from .models import db, Auction
+		self._runs.pop(run.auction_id, None)
+		Auction.query.filter_by(id=run.auction_id).update({"status": "ended"})
+		db.session.commit()
+		lobby.auctions_changed()
+		fanout.emit(run.auction_id, "auction_complete", {"auction_id": run.auction_id})
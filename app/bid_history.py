@@ -0,0 +1,76 @@
+from __future__ import annotations
+import sys
+import time
+from array import array
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional, Tuple
+
+# Pairs a wall-clock reading with a monotonic one so monotonic timestamps can
+# be turned into wall-clock ISO strings when (and only when) serialized.
+_WALL_ANCHOR_NS = time.time_ns()
+_MONO_ANCHOR_NS = time.monotonic_ns()
+
+
+def monotonic_to_iso(ts_ns: int) -> str:
+	wall_ns = _WALL_ANCHOR_NS + (ts_ns - _MONO_ANCHOR_NS)
+	return datetime.fromtimestamp(wall_ns / 1e9, tz=timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def iso_to_monotonic(ts: str) -> int:
+	wall_ns = int(datetime.fromisoformat(ts).replace(tzinfo=timezone.utc).timestamp() * 1e9)
+	return _MONO_ANCHOR_NS + (wall_ns - _WALL_ANCHOR_NS)
+
+
+class BidHistory:
+	# Fixed-capacity ring buffer of accepted bids for one lot. Columns are
+	# preallocated typed arrays, so append is O(1), allocates nothing and
+	# memory per auction stays bounded however many bids arrive.
+	__slots__ = ("capacity", "_team", "_amount", "_ts", "_ip", "_next", "_len")
+
+	def __init__(self, capacity: int = 256) -> None:
+		self.capacity = capacity
+		self._team = array("q", bytes(8 * capacity))
+		self._amount = array("q", bytes(8 * capacity))
+		self._ts = array("q", bytes(8 * capacity))  # time.monotonic_ns()
+		self._ip: List[Optional[str]] = [None] * capacity  # interned
+		self._next = 0
+		self._len = 0
+
+	def __len__(self) -> int:
+		return self._len
+
+	def append(self, team_id: int, amount: int, ts_ns: int, ip: Optional[str]) -> None:
+		i = self._next
+		self._team[i] = team_id
+		self._amount[i] = amount
+		self._ts[i] = ts_ns
+		self._ip[i] = sys.intern(ip) if ip else None
+		self._next = (i + 1) % self.capacity
+		if self._len < self.capacity:
+			self._len += 1
+
+	def clear(self) -> None:
+		self._next = 0
+		self._len = 0
+
+	def _indices(self, k: int) -> range:
+		k = min(k, self._len)
+		return range(self._next - k, self._next)
+
+	def tail(self, k: int) -> Iterator[Tuple[int, int, int, Optional[str]]]:
+		# Oldest first; negative indices wrap around the ring
+		for i in self._indices(k):
+			yield self._team[i], self._amount[i], self._ts[i], self._ip[i]
+
+	def to_wire(self, k: Optional[int] = None) -> List[dict]:
+		return [
+			{"team_id": team_id, "amount": amount, "ts": monotonic_to_iso(ts), "ip": ip}
+			for team_id, amount, ts, ip in self.tail(self._len if k is None else k)
+		]
+
+	@classmethod
+	def from_wire(cls, entries: List[dict], capacity: int = 256) -> "BidHistory":
+		history = cls(capacity)
+		for e in entries:
+			history.append(e["team_id"], e["amount"], iso_to_monotonic(e["ts"]), e.get("ip"))
+		return history
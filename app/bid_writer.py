@@ -0,0 +1,130 @@
+from __future__ import annotations
+from collections import deque
+from typing import Deque, Optional
+from eventlet.semaphore import Semaphore
+from flask import Flask
+from sqlalchemy import insert
+
+
+class BidWriter:
+	# Single writer for Bid rows. Accepted bids are queued in memory and
+	# written in batched group commits by one background task instead of
+	# one commit per bid on the socket handler's critical path. A batch that
+	# keeps failing is written row by row so one bad row can't hold back
+	# every later bid (or the lot close that flushes them). Batches are written
+	# one at a time under a green lock.
+
+	def __init__(self, max_pending: int = 5000, batch_size: int = 500, flush_interval: float = 0.05, max_retries: int = 3) -> None:
+		self.app: Optional[Flask] = None
+		self.max_pending = max_pending
+		self.batch_size = batch_size
+		self.flush_interval = flush_interval
+		self.max_retries = max_retries
+		self.dropped = 0
+		self._pending: Deque[dict] = deque()
+		self._inflight = 0  # rows popped by the batch being written
+		self._lock = Semaphore(1)
+		self._task_started = False
+
+	def init_app(self, app: Flask) -> None:
+		self.app = app
+		self.max_pending = app.config.get("BID_WRITER_MAX_PENDING", self.max_pending)
+		self.batch_size = app.config.get("BID_WRITER_BATCH_SIZE", self.batch_size)
+		self.flush_interval = app.config.get("BID_WRITER_FLUSH_INTERVAL", self.flush_interval)
+		self.max_retries = app.config.get("BID_WRITER_MAX_RETRIES", self.max_retries)
+		app.extensions["bid_writer"] = self
+
+	@property
+	def pending(self) -> int:
+		return len(self._pending) + self._inflight
+
+	def submit(self, row: dict) -> None:
+		self._pending.append(row)
+		self._ensure_task()
+		# Bounded queue: if the writer falls behind, the producer pays for the flush
+		if len(self._pending) >= self.max_pending:
+			self.flush()
+
+	def flush(self) -> bool:
+		# Write every bid submitted before this call, after any batch another
+		# greenlet is committing. True once they are all durable; False if the
+		# database rejected a row (dropped) or is unavailable (requeued).
+		dropped = self.dropped
+		with self._lock:
+			while self._pending:
+				if not self._write_batch():
+					return False
+		return self.dropped == dropped
+
+	def _write_batch(self) -> bool:
+		# Caller holds the lock. False if the database is unavailable.
+		from sqlalchemy.exc import OperationalError
+		from . import db_executor
+		batch = []
+		while self._pending and len(batch) < self.batch_size:
+			batch.append(self._pending.popleft())
+		if not batch:
+			return True
+		self._inflight += len(batch)
+		try:
+			for attempt in range(self.max_retries):
+				try:
+					db_executor.run(self._insert, batch)
+					return True
+				except Exception:
+					if self.app is not None:
+						self.app.logger.warning("Bid group commit failed (attempt %d of %d)", attempt + 1, self.max_retries, exc_info=True)
+			try:
+				self._salvage(batch)
+			except OperationalError:
+				if self.app is not None:
+					self.app.logger.exception("Bid writer can't reach the database; %d bids requeued", len(self._pending))
+				return False
+			return True
+		finally:
+			self._inflight -= len(batch)
+
+	def _salvage(self, batch: list) -> None:
+		# Row by row: drop rows the database rejects; on an outage (it rejects
+		# everything) requeue what is left and let the caller retry later
+		from sqlalchemy.exc import OperationalError
+		from . import db_executor
+		for i, row in enumerate(batch):
+			try:
+				db_executor.run(self._insert, [row])
+			except OperationalError:
+				self._pending.extendleft(reversed(batch[i:]))
+				raise
+			except Exception:
+				self.dropped += 1
+				if self.app is not None:
+					self.app.logger.exception("Dropping a bid row the database rejected: %r", row)
+
+	@staticmethod
+	def _insert(batch: list) -> None:
+		from .models import db, Bid
+		try:
+			db.session.execute(insert(Bid), batch)
+			db.session.commit()
+		except Exception:
+			db.session.rollback()
+			raise
+
+	def _ensure_task(self) -> None:
+		if self._task_started or self.app is None:
+			return
+		from . import socketio
+		self._task_started = True
+		socketio.start_background_task(self._run)
+
+	def _run(self) -> None:
+		from . import clock
+		while True:
+			clock.sleep(self.flush_interval)
+			if not self._pending:
+				continue
+			try:
+				with self.app.app_context():
+					self.flush()
+			except Exception:
+				self.app.logger.exception("Bid group commit failed; will retry")
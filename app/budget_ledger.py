@@ -0,0 +1,297 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from flask import Flask
+
+
+@dataclass
+class TeamBudget:
+	team_id: int
+	approved: bool = False
+	remaining: int = 0  # committed spend already deducted, as in Team.budget_remaining
+	reservations: Dict[int, int] = field(default_factory=dict)  # auction_id -> standing high bid
+	reserved_total: int = 0
+	stale: bool = False
+
+	def available(self, auction_id: Optional[int] = None) -> int:
+		# A team's own high bid on this lot is about to be replaced, not added to
+		own = self.reservations.get(auction_id, 0) if auction_id is not None else 0
+		return self.remaining - self.reserved_total + own
+
+
+class InProcessLedger:
+	# Default backend: every team's purse in this process's memory, committed
+	# spend plus the high bids it holds in each live auction. Team rows are
+	# read once; admin/team edits mark entries stale.
+
+	def __init__(self) -> None:
+		self._teams: Dict[int, TeamBudget] = {}
+		self._loaded = False
+
+	def _load_all(self) -> None:
+		from .models import Team
+		for team_id, approved, remaining in Team.query.with_entities(Team.id, Team.approved, Team.budget_remaining):
+			entry = self._teams.get(team_id) or TeamBudget(team_id=team_id)
+			entry.approved = bool(approved)
+			entry.remaining = remaining or 0
+			entry.stale = False
+			self._teams[team_id] = entry
+		self._loaded = True
+
+	def _refresh(self, entry: TeamBudget) -> None:
+		from .models import Team
+		row = Team.query.with_entities(Team.approved, Team.budget_remaining).filter_by(id=entry.team_id).first()
+		entry.approved = bool(row.approved) if row else False
+		entry.remaining = (row.budget_remaining or 0) if row else 0
+		entry.stale = False
+
+	def get(self, team_id: int) -> Optional[TeamBudget]:
+		if not self._loaded:
+			self._load_all()
+		entry = self._teams.get(team_id)
+		if entry is None:
+			# Registered after the ledger was loaded
+			entry = self._teams[team_id] = TeamBudget(team_id=team_id, stale=True)
+		if entry.stale:
+			self._refresh(entry)
+		return entry
+
+	def available(self, team_id: int, auction_id: int) -> int:
+		entry = self.get(team_id)
+		return entry.available(auction_id) if entry.approved else 0
+
+	def can_bid(self, team_id: int, auction_id: int, amount: int) -> bool:
+		entry = self.get(team_id)
+		return entry.approved and entry.available(auction_id) >= amount
+
+	def _set(self, entry: TeamBudget, auction_id: int, amount: int) -> None:
+		entry.reserved_total += amount - entry.reservations.pop(auction_id, 0)
+		if amount:
+			entry.reservations[auction_id] = amount
+
+	def try_reserve(self, team_id: int, auction_id: int, amount: int) -> Optional[int]:
+		# Runs without yielding to the hub, so check-and-reserve is atomic per process
+		entry = self.get(team_id)
+		if not entry.approved or entry.available(auction_id) < amount:
+			return None
+		previous = entry.reservations.get(auction_id, 0)
+		self._set(entry, auction_id, amount)
+		return previous
+
+	def restore(self, team_id: int, auction_id: int, amount: int, previous: int) -> None:
+		# Undo try_reserve() when the bid itself lost, unless since replaced
+		entry = self._teams.get(team_id)
+		if entry is not None and entry.reservations.get(auction_id, 0) == amount:
+			self._set(entry, auction_id, previous)
+
+	def reserve(self, team_id: int, auction_id: int, amount: int) -> None:
+		self._set(self.get(team_id), auction_id, amount)
+
+	def release(self, team_id: int, auction_id: int) -> None:
+		entry = self._teams.get(team_id)
+		if entry is not None:
+			self._set(entry, auction_id, 0)
+
+	def release_others(self, auction_id: int, leader_team_id: int, amount: int) -> None:
+		# The outbid teams' high bids on this lot no longer hold their purse
+		for entry in self._teams.values():
+			if entry.team_id != leader_team_id and 0 < entry.reservations.get(auction_id, 0) < amount:
+				self._set(entry, auction_id, 0)
+
+	def commit(self, team_id: int, auction_id: int, budget_remaining: int) -> None:
+		# Called once finalize_sale has written the spend to Team.budget_remaining
+		self.release(team_id, auction_id)
+		entry = self._teams.get(team_id)
+		if entry is not None:
+			entry.remaining = budget_remaining
+
+	def release_auction(self, auction_id: int) -> None:
+		for entry in self._teams.values():
+			if auction_id in entry.reservations:
+				self._set(entry, auction_id, 0)
+
+	def invalidate(self, team_id: Optional[int] = None) -> None:
+		# Reservations are runtime state and survive; only DB-backed fields reload
+		if team_id is None:
+			for entry in self._teams.values():
+				entry.stale = True
+		elif team_id in self._teams:
+			self._teams[team_id].stale = True
+
+
+# Check-and-reserve: hold `amount` of the team's purse for its high bid in an
+# auction, net of what it already holds elsewhere. Returns the reservation it
+# replaced, -1 if the purse can't cover it, -2 if the team isn't loaded yet.
+_RESERVE_LUA = """
+local vals = redis.call('HMGET', KEYS[1], 'approved', 'remaining', 'reserved', 'r:' .. ARGV[1])
+if not vals[1] then return -2 end
+local remaining = tonumber(vals[2] or '0') or 0
+local reserved = tonumber(vals[3] or '0') or 0
+local own = tonumber(vals[4] or '0') or 0
+local amount = tonumber(ARGV[2])
+if vals[1] ~= '1' or remaining - reserved + own < amount then return -1 end
+redis.call('HSET', KEYS[1], 'r:' .. ARGV[1], amount, 'reserved', reserved - own + amount)
+redis.call('SADD', KEYS[2], ARGV[3])
+return own
+"""
+
+# Set a team's reservation in an auction, if ARGV[4] is given only while it
+# still equals that amount.
+_SET_LUA = """
+local f = 'r:' .. ARGV[1]
+local own = tonumber(redis.call('HGET', KEYS[1], f) or '0') or 0
+if ARGV[4] ~= '' and own ~= tonumber(ARGV[4]) then return 0 end
+local amount = tonumber(ARGV[2])
+if amount > 0 then
+	redis.call('HSET', KEYS[1], f, amount)
+	redis.call('SADD', KEYS[2], ARGV[3])
+else
+	redis.call('HDEL', KEYS[1], f)
+	redis.call('SREM', KEYS[2], ARGV[3])
+end
+redis.call('HINCRBY', KEYS[1], 'reserved', amount - own)
+return 1
+"""
+
+# Drop the reservations held in an auction, except the leader's (ARGV[3]) and
+# any at or above ARGV[4], so a stale caller can't release a newer high bid.
+_RELEASE_LUA = """
+local f = 'r:' .. ARGV[2]
+local below = tonumber(ARGV[4])
+for _, team_id in ipairs(redis.call('SMEMBERS', KEYS[1])) do
+	if team_id ~= ARGV[3] then
+		local k = ARGV[1] .. team_id
+		local own = tonumber(redis.call('HGET', k, f) or '0') or 0
+		if not below or own < below then
+			redis.call('HDEL', k, f)
+			redis.call('HINCRBY', k, 'reserved', -own)
+			redis.call('SREM', KEYS[1], team_id)
+		end
+	end
+end
+return 1
+"""
+
+
+class RedisLedger:
+	# Shared backend kept next to the auction state, so every Socket.IO worker
+	# sees the same purses: one hash per team with its committed remaining
+	# budget and its reservations, and per auction the set of teams holding one.
+
+	def __init__(self, client, prefix: str = "auction") -> None:
+		self.client = client
+		self.prefix = prefix
+
+	def _team_key(self, team_id) -> str:
+		return f"{self.prefix}:budget:team:{team_id}"
+
+	def _holders_key(self, auction_id: int) -> str:
+		return f"{self.prefix}:budget:holders:{auction_id}"
+
+	def _load(self, team_id: int) -> None:
+		from .models import Team
+		row = Team.query.with_entities(Team.approved, Team.budget_remaining).filter_by(id=team_id).first()
+		key = self._team_key(team_id)
+		pipe = self.client.pipeline()
+		# A remaining budget written by commit() meanwhile is newer than this read
+		pipe.hsetnx(key, "remaining", (row.budget_remaining or 0) if row else 0)
+		pipe.hset(key, "approved", "1" if row and row.approved else "0")
+		pipe.execute()
+
+	def available(self, team_id: int, auction_id: int) -> int:
+		key = self._team_key(team_id)
+		fields = ("approved", "remaining", "reserved", f"r:{auction_id}")
+		approved, remaining, reserved, own = self.client.hmget(key, fields)
+		if approved is None:
+			self._load(team_id)
+			approved, remaining, reserved, own = self.client.hmget(key, fields)
+		if approved != "1":
+			return 0
+		return int(remaining or 0) - int(reserved or 0) + int(own or 0)
+
+	def can_bid(self, team_id: int, auction_id: int, amount: int) -> bool:
+		return self.available(team_id, auction_id) >= amount
+
+	def try_reserve(self, team_id: int, auction_id: int, amount: int) -> Optional[int]:
+		keys = (self._team_key(team_id), self._holders_key(auction_id))
+		previous = int(self.client.eval(_RESERVE_LUA, 2, *keys, auction_id, amount, team_id))
+		if previous == -2:
+			self._load(team_id)
+			previous = int(self.client.eval(_RESERVE_LUA, 2, *keys, auction_id, amount, team_id))
+		return previous if previous >= 0 else None
+
+	def restore(self, team_id: int, auction_id: int, amount: int, previous: int) -> None:
+		self.client.eval(_SET_LUA, 2, self._team_key(team_id), self._holders_key(auction_id), auction_id, previous, team_id, amount)
+
+	def reserve(self, team_id: int, auction_id: int, amount: int) -> None:
+		self.client.eval(_SET_LUA, 2, self._team_key(team_id), self._holders_key(auction_id), auction_id, amount, team_id, "")
+
+	def release(self, team_id: int, auction_id: int) -> None:
+		self.reserve(team_id, auction_id, 0)
+
+	def release_others(self, auction_id: int, leader_team_id: int, amount: int) -> None:
+		self.client.eval(_RELEASE_LUA, 1, self._holders_key(auction_id), self._team_key(""), auction_id, leader_team_id, amount)
+
+	def commit(self, team_id: int, auction_id: int, budget_remaining: int) -> None:
+		pipe = self.client.pipeline()
+		pipe.eval(_SET_LUA, 2, self._team_key(team_id), self._holders_key(auction_id), auction_id, 0, team_id, "")
+		pipe.hset(self._team_key(team_id), "remaining", budget_remaining)
+		pipe.execute()
+
+	def release_auction(self, auction_id: int) -> None:
+		self.client.eval(_RELEASE_LUA, 1, self._holders_key(auction_id), self._team_key(""), auction_id, "", "")
+
+	def invalidate(self, team_id: Optional[int] = None) -> None:
+		# Reservations are runtime state and survive; only DB-backed fields reload
+		keys = [self._team_key(team_id)] if team_id is not None else list(self.client.scan_iter(match=self._team_key("*")))
+		if keys:
+			pipe = self.client.pipeline()
+			for key in keys:
+				pipe.hdel(key, "approved", "remaining")
+			pipe.execute()
+
+
+class BudgetLedger:
+	# Flask extension over every team's purse: committed spend plus the high
+	# bids it currently holds in each live auction. Answers "can team X bid Y"
+	# without a DB round-trip and stops a team overcommitting across
+	# simultaneous auctions. Shares the auction state's Redis when
+	# AUCTION_STATE_URL is set, so reservations hold across workers.
+
+	def __init__(self, backend=None) -> None:
+		self.backend = backend or InProcessLedger()
+
+	def init_app(self, app: Flask) -> None:
+		from .state_store import RedisBackend
+		state = app.extensions.get("auction_state_store")
+		if state is not None and isinstance(state.backend, RedisBackend):
+			self.backend = RedisLedger(state.backend.client, state.backend.prefix)
+		app.extensions["budget_ledger"] = self
+
+	def available(self, team_id: int, auction_id: int) -> int:
+		return self.backend.available(team_id, auction_id)
+
+	def can_bid(self, team_id: int, auction_id: int, amount: int) -> bool:
+		return self.backend.can_bid(team_id, auction_id, amount)
+
+	def try_reserve(self, team_id: int, auction_id: int, amount: int) -> Optional[int]:
+		return self.backend.try_reserve(team_id, auction_id, amount)
+
+	def restore(self, team_id: int, auction_id: int, amount: int, previous: int) -> None:
+		self.backend.restore(team_id, auction_id, amount, previous)
+
+	def reserve(self, team_id: int, auction_id: int, amount: int) -> None:
+		self.backend.reserve(team_id, auction_id, amount)
+
+	def release_others(self, auction_id: int, leader_team_id: int, amount: int) -> None:
+		self.backend.release_others(auction_id, leader_team_id, amount)
+
+	def commit(self, team_id: int, auction_id: int, budget_remaining: int) -> None:
+		# Called once finalize_sale has written the spend to Team.budget_remaining
+		self.backend.commit(team_id, auction_id, budget_remaining)
+
+	def release_auction(self, auction_id: int) -> None:
+		self.backend.release_auction(auction_id)
+
+	def invalidate(self, team_id: Optional[int] = None) -> None:
+		self.backend.invalidate(team_id)
@@ -0,0 +1,115 @@
+from __future__ import annotations
+import heapq
+import math
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from eventlet.hubs import get_hub
+from flask import Flask
+from greenlet import getcurrent
+
+
+class SystemClock:
+	def utcnow(self) -> datetime:
+		return datetime.utcnow()
+
+	def monotonic(self) -> float:
+		return time.monotonic()
+
+	def monotonic_ns(self) -> int:
+		return time.monotonic_ns()
+
+	def sleep(self, seconds: float) -> None:
+		from . import socketio
+		socketio.sleep(seconds)
+
+
+class VirtualClock:
+	# Discrete-event time for simulations. Time only moves in run_until() /
+	# advance(): sleepers (the engine's background loops, simulated bidders)
+	# are resumed in due order, each running until it sleeps on the clock again
+	# before time moves on. Resumption is a direct greenlet switch rather than a
+	# trip through the hub, so idle loops cost microseconds per wake-up; a
+	# sleeper that blocks on the hub in between holds time still until it sleeps
+	# here again. Starts at the real time so wall/monotonic conversions hold.
+
+	def __init__(self, start: Optional[datetime] = None) -> None:
+		self._wall0 = start or datetime.utcnow()
+		self._mono0_ns = time.monotonic_ns()
+		self.elapsed_ns = 0
+		self._sleepers: List[Tuple[int, int, object]] = []  # (wake at, order, greenlet)
+		self._order = 0
+		self._driver = None  # greenlet inside run_until
+		self._running = None  # sleeper it resumed
+
+	def utcnow(self) -> datetime:
+		return self._wall0 + timedelta(microseconds=self.elapsed_ns // 1000)
+
+	def monotonic(self) -> float:
+		return self.monotonic_ns() / 1e9
+
+	def monotonic_ns(self) -> int:
+		return self._mono0_ns + self.elapsed_ns
+
+	@property
+	def elapsed(self) -> float:
+		return self.elapsed_ns / 1e9
+
+	def sleep(self, seconds: float) -> None:
+		current = getcurrent()
+		self._order += 1
+		# Rounded up: a loop sleeping until a float deadline must not wake short of it
+		heapq.heappush(self._sleepers, (self.elapsed_ns + max(0, math.ceil(seconds * 1e9)), self._order, current))
+		if current is self._running:
+			self._driver.switch()
+		else:
+			get_hub().switch()
+
+	def next_wake(self) -> Optional[int]:
+		# elapsed_ns of the earliest sleeper, if any
+		return self._sleepers[0][0] if self._sleepers else None
+
+	def advance(self, seconds: float) -> None:
+		self.run_until(self.elapsed_ns + int(seconds * 1e9))
+
+	def run_until(self, elapsed_ns: int) -> None:
+		driver = getcurrent()
+		try:
+			while self._sleepers and self._sleepers[0][0] <= elapsed_ns:
+				wake_ns, _, sleeper = heapq.heappop(self._sleepers)
+				if sleeper.dead:
+					continue
+				self.elapsed_ns = max(self.elapsed_ns, wake_ns)
+				self._driver, self._running = driver, sleeper
+				sleeper.parent = driver  # so a sleeper that exits returns here too
+				sleeper.switch()
+		finally:
+			self._driver = self._running = None
+		self.elapsed_ns = max(self.elapsed_ns, elapsed_ns)
+
+
+class Clock:
+	# The auction engine's source of time: lot end times, anti-sniping
+	# extensions, bid timestamps and every background loop's interval go
+	# through here, so a VirtualClock can replace the system clock.
+
+	def __init__(self, source=None) -> None:
+		self.source = source or SystemClock()
+
+	def init_app(self, app: Flask) -> None:
+		app.extensions["clock"] = self
+
+	def use(self, source) -> None:
+		self.source = source or SystemClock()
+
+	def utcnow(self) -> datetime:
+		return self.source.utcnow()
+
+	def monotonic(self) -> float:
+		return self.source.monotonic()
+
+	def monotonic_ns(self) -> int:
+		return self.source.monotonic_ns()
+
+	def sleep(self, seconds: float) -> None:
+		self.source.sleep(seconds)
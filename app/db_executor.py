@@ -0,0 +1,79 @@
+from __future__ import annotations
+from typing import Callable, Optional
+from flask import Flask
+
+
+class DBExecutor:
+	# Runs DB work for socket handlers and background tasks on eventlet's
+	# native thread pool, one operation at a time (SQLite allows a single
+	# writer), so a slow query or fsync parks only the greenlet waiting on it
+	# while the hub keeps serving bids and ticks in other auctions.
+	# Operations get their own app context and session: pass ids in, return
+	# plain data out, never ORM objects.
+
+	def __init__(self) -> None:
+		self.app: Optional[Flask] = None
+		self.enabled = True
+		self._offload: Optional[bool] = None
+		from eventlet.patcher import original
+		threading = original("threading")
+		self._lock = threading.Lock()
+		self._local = threading.local()
+
+	def init_app(self, app: Flask) -> None:
+		self.app = app
+		self.enabled = app.config.get("DB_EXECUTOR", True)
+		self._offload = None
+		app.extensions["db_executor"] = self
+		from . import db
+		with app.app_context():
+			if db.engine.dialect.name == "sqlite":
+				self._tune_sqlite(db.engine, app.config.get("SQLITE_BUSY_TIMEOUT", 5000))
+
+	def run(self, fn: Callable, *args, **kwargs):
+		if not self._should_offload() or getattr(self._local, "busy", False):
+			return fn(*args, **kwargs)
+		from eventlet import tpool
+		return tpool.execute(self._call, fn, args, kwargs)
+
+	def submit(self, fn: Callable, *args, **kwargs):
+		# Green future: call .wait() for the result (or the exception)
+		import eventlet
+		return eventlet.spawn(self.run, fn, *args, **kwargs)
+
+	def _call(self, fn: Callable, args, kwargs):
+		with self._lock, self.app.app_context():
+			self._local.busy = True
+			try:
+				return fn(*args, **kwargs)
+			finally:
+				self._local.busy = False
+
+	def _should_offload(self) -> bool:
+		if self._offload is None:
+			from . import db, socketio
+			with self.app.app_context():
+				url = db.engine.url
+			# Every connection to an in-memory SQLite DB is a different database
+			in_memory = url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+			self._offload = bool(self.enabled) and socketio.async_mode == "eventlet" and not in_memory
+		return self._offload
+
+	@staticmethod
+	def _tune_sqlite(engine, busy_timeout_ms: int) -> None:
+		# WAL lets page reads proceed during the writer's commit, and with
+		# synchronous=NORMAL a commit no longer waits for an fsync (the WAL is
+		# synced at checkpoints; a power cut can lose the last commits but never
+		# corrupts the DB). busy_timeout makes a locked DB wait instead of erroring.
+		from sqlalchemy import event
+
+		def on_connect(dbapi_conn, _record):
+			cur = dbapi_conn.cursor()
+			if engine.url.database not in (None, "", ":memory:"):
+				cur.execute("PRAGMA journal_mode=WAL")
+			cur.execute("PRAGMA synchronous=NORMAL")
+			cur.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+			cur.close()
+
+		if not event.contains(engine, "connect", on_connect):
+			event.listen(engine, "connect", on_connect)
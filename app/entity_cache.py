@@ -0,0 +1,239 @@
+from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Hashable, Optional, Set, Tuple
+from flask import Flask
+from flask_login import UserMixin
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class UserSnapshot(UserMixin):
+	id: int
+	username: str
+	email: str
+	role: str
+
+	@property
+	def team(self) -> Optional["TeamSnapshot"]:
+		from . import entity_cache
+		return entity_cache.team_for_owner(self.id)
+
+
+@dataclass(frozen=True)
+class TeamSnapshot:
+	id: int
+	name: str
+	logo_url: Optional[str]
+	strategy: Optional[str]
+	budget_total: int
+	budget_remaining: int
+	approved: bool
+	owner_user_id: int
+
+
+@dataclass(frozen=True)
+class AuctionSnapshot:
+	id: int
+	name: str
+	scheduled_at: Optional[datetime]
+	budget_per_team: int
+	status: str
+	current_player_id: Optional[int]
+	created_by_id: Optional[int]
+
+
+class _LRU:
+	# Bounded LRU with a per-entry TTL; None results are cached as well.
+	# after_commit invalidations can arrive on a tpool thread (the DB
+	# executor), so every access holds a native lock; nothing inside yields.
+	def __init__(self, maxsize: int, ttl: float) -> None:
+		self.maxsize = maxsize
+		self.ttl = ttl
+		self._data: "OrderedDict[Hashable, Tuple[float, object]]" = OrderedDict()
+		self._lock = threading.Lock()
+		self.hits = 0
+		self.misses = 0
+		self.invalidations = 0
+
+	def get(self, key: Hashable):
+		with self._lock:
+			entry = self._data.get(key)
+			if entry is None or entry[0] < time.monotonic():
+				self.misses += 1
+				return _MISSING
+			self._data.move_to_end(key)
+			self.hits += 1
+			return entry[1]
+
+	def put(self, key: Hashable, value) -> None:
+		with self._lock:
+			self._data[key] = (time.monotonic() + self.ttl, value)
+			self._data.move_to_end(key)
+			while len(self._data) > self.maxsize:
+				self._data.popitem(last=False)
+
+	def discard(self, key: Hashable) -> None:
+		with self._lock:
+			if self._data.pop(key, None) is not None:
+				self.invalidations += 1
+
+	def clear(self) -> None:
+		with self._lock:
+			self.invalidations += len(self._data)
+			self._data.clear()
+
+	def stats(self) -> dict:
+		lookups = self.hits + self.misses
+		return {
+			"size": len(self._data),
+			"hits": self.hits,
+			"misses": self.misses,
+			"hit_rate": round(self.hits / lookups, 4) if lookups else None,
+			"invalidations": self.invalidations,
+		}
+
+
+class EntityCache:
+	# Read-through cache of User, Team and Auction rows as frozen snapshots,
+	# safe to hold across requests and greenlets. Entries are dropped when a
+	# commit touches the row (ORM flushes and bulk UPDATE/DELETE statements
+	# alike), so approvals and budget changes show up on the next read; the
+	# TTL bounds staleness from writes made by other processes.
+
+	def __init__(self, maxsize: int = 10000, ttl: float = 30.0) -> None:
+		self.app: Optional[Flask] = None
+		self.maxsize = maxsize
+		self.ttl = ttl
+		self._caches: Dict[str, _LRU] = {}
+		self._reset()
+
+	def init_app(self, app: Flask) -> None:
+		self.app = app
+		self.maxsize = app.config.get("ENTITY_CACHE_SIZE", self.maxsize)
+		self.ttl = app.config.get("ENTITY_CACHE_TTL", self.ttl)
+		self._reset()
+		self._watch_sessions()
+		app.extensions["entity_cache"] = self
+
+	def _reset(self) -> None:
+		self._caches = {kind: _LRU(self.maxsize, self.ttl) for kind in ("user", "team", "team_owner", "auction")}
+
+	def user(self, user_id: int) -> Optional[UserSnapshot]:
+		return self._read("user", user_id, self._load_user)
+
+	def team(self, team_id: int) -> Optional[TeamSnapshot]:
+		return self._read("team", team_id, self._load_team)
+
+	def team_for_owner(self, user_id: int) -> Optional[TeamSnapshot]:
+		return self._read("team_owner", user_id, self._load_team_for_owner)
+
+	def auction(self, auction_id: int) -> Optional[AuctionSnapshot]:
+		return self._read("auction", auction_id, self._load_auction)
+
+	def invalidate(self, kind: Optional[str] = None, key: Hashable = None) -> None:
+		if kind is None:
+			for cache in self._caches.values():
+				cache.clear()
+		elif key is None:
+			self._caches[kind].clear()
+		else:
+			self._caches[kind].discard(key)
+
+	def stats(self) -> Dict[str, dict]:
+		return {kind: cache.stats() for kind, cache in self._caches.items()}
+
+	def _read(self, kind: str, key: Hashable, load: Callable[[Hashable], object]):
+		cache = self._caches[kind]
+		value = cache.get(key)
+		if value is _MISSING:
+			value = load(key)
+			cache.put(key, value)
+		return value
+
+	@staticmethod
+	def _load_user(user_id: int) -> Optional[UserSnapshot]:
+		from .models import db, User
+		row = db.session.query(User.id, User.username, User.email, User.role).filter(User.id == user_id).first()
+		return UserSnapshot(*row) if row else None
+
+	@staticmethod
+	def _team_query():
+		from .models import db, Team
+		return db.session.query(
+			Team.id, Team.name, Team.logo_url, Team.strategy, Team.budget_total,
+			Team.budget_remaining, Team.approved, Team.owner_user_id,
+		)
+
+	def _load_team(self, team_id: int) -> Optional[TeamSnapshot]:
+		from .models import Team
+		row = self._team_query().filter(Team.id == team_id).first()
+		return TeamSnapshot(*row) if row else None
+
+	def _load_team_for_owner(self, user_id: int) -> Optional[TeamSnapshot]:
+		from .models import Team
+		row = self._team_query().filter(Team.owner_user_id == user_id).first()
+		return TeamSnapshot(*row) if row else None
+
+	@staticmethod
+	def _load_auction(auction_id: int) -> Optional[AuctionSnapshot]:
+		from .models import db, Auction
+		row = db.session.query(
+			Auction.id, Auction.name, Auction.scheduled_at, Auction.budget_per_team,
+			Auction.status, Auction.current_player_id, Auction.created_by_id,
+		).filter(Auction.id == auction_id).first()
+		return AuctionSnapshot(*row) if row else None
+
+	# Invalidation: collect what a transaction touched, drop it once committed
+
+	def _watch_sessions(self) -> None:
+		from sqlalchemy import event
+		from sqlalchemy.orm import Session
+		for name, fn in (("after_flush", self._after_flush), ("do_orm_execute", self._on_execute), ("after_commit", self._after_commit), ("after_rollback", self._after_rollback)):
+			if not event.contains(Session, name, fn):
+				event.listen(Session, name, fn)
+
+	@staticmethod
+	def _pending(session) -> Set[Tuple[str, Hashable]]:
+		return session.info.setdefault("entity_cache_pending", set())
+
+	def _after_flush(self, session, flush_context) -> None:
+		from .models import User, Team, Auction
+		pending = None
+		for obj in (*session.new, *session.dirty, *session.deleted):
+			if isinstance(obj, User):
+				keys = (("user", obj.id), ("team_owner", obj.id))
+			elif isinstance(obj, Team):
+				keys = (("team", obj.id), ("team_owner", obj.owner_user_id))
+			elif isinstance(obj, Auction):
+				keys = (("auction", obj.id),)
+			else:
+				continue
+			if pending is None:
+				pending = self._pending(session)
+			pending.update(keys)
+
+	def _on_execute(self, state) -> None:
+		# Bulk query.update()/delete() skip the flush; drop the whole kind
+		if not (state.is_update or state.is_delete) or state.bind_mapper is None:
+			return
+		from .models import User, Team, Auction
+		cls = state.bind_mapper.class_
+		if cls is User:
+			self._pending(state.session).update({("user", None), ("team_owner", None)})
+		elif cls is Team:
+			self._pending(state.session).update({("team", None), ("team_owner", None)})
+		elif cls is Auction:
+			self._pending(state.session).add(("auction", None))
+
+	def _after_commit(self, session) -> None:
+		pending = session.info.pop("entity_cache_pending", None)
+		for kind, key in pending or ():
+			self.invalidate(kind, key)
+
+	def _after_rollback(self, session) -> None:
+		session.info.pop("entity_cache_pending", None)
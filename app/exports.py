@@ -0,0 +1,97 @@
+from __future__ import annotations
+import csv
+import json
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from sqlalchemy import func
+from .models import db, Auction, AuctionPlayer, Bid, Player, Team
+
+# Rows are pulled from a server-side cursor in batches of this size, so memory
+# stays flat however large the auction (or season) is.
+STREAM_BATCH = 1000
+
+
+def _squads(auction_ids: Optional[Sequence[int]]):
+	header = ["Auction ID", "Auction", "Team", "Player", "Role", "Final Price"]
+	q = (
+		db.session.query(Auction.id, Auction.name, Team.name, Player.name, Player.role, func.coalesce(AuctionPlayer.final_price, 0))
+		.select_from(AuctionPlayer)
+		.join(Auction, Auction.id == AuctionPlayer.auction_id)
+		.outerjoin(Team, Team.id == AuctionPlayer.sold_to_team_id)
+		.outerjoin(Player, Player.id == AuctionPlayer.player_id)
+		.filter(AuctionPlayer.status == "sold")
+	)
+	if auction_ids is not None:
+		q = q.filter(AuctionPlayer.auction_id.in_(auction_ids))
+	return header, q.order_by(AuctionPlayer.auction_id, AuctionPlayer.id)
+
+
+def _bids(auction_ids: Optional[Sequence[int]]):
+	header = ["Auction ID", "Auction", "Bid ID", "Timestamp", "Team", "Player", "Amount", "IP"]
+	q = (
+		db.session.query(Auction.id, Auction.name, Bid.id, Bid.timestamp, Team.name, Player.name, Bid.amount, Bid.ip_address)
+		.select_from(Bid)
+		.join(Auction, Auction.id == Bid.auction_id)
+		.outerjoin(Team, Team.id == Bid.team_id)
+		.outerjoin(Player, Player.id == Bid.player_id)
+	)
+	if auction_ids is not None:
+		q = q.filter(Bid.auction_id.in_(auction_ids))
+	return header, q.order_by(Bid.auction_id, Bid.timestamp, Bid.id)
+
+
+def _spend(auction_ids: Optional[Sequence[int]]):
+	header = ["Auction ID", "Auction", "Team", "Players Bought", "Total Spend", "Most Expensive", "Budget Remaining"]
+	q = (
+		db.session.query(
+			Auction.id, Auction.name, Team.name,
+			func.count(AuctionPlayer.id), func.coalesce(func.sum(AuctionPlayer.final_price), 0),
+			func.coalesce(func.max(AuctionPlayer.final_price), 0), Team.budget_remaining,
+		)
+		.select_from(AuctionPlayer)
+		.join(Auction, Auction.id == AuctionPlayer.auction_id)
+		.join(Team, Team.id == AuctionPlayer.sold_to_team_id)
+		.filter(AuctionPlayer.status == "sold")
+		.group_by(Auction.id, Auction.name, Team.id, Team.name, Team.budget_remaining)
+	)
+	if auction_ids is not None:
+		q = q.filter(AuctionPlayer.auction_id.in_(auction_ids))
+	return header, q.order_by(Auction.id, Team.name)
+
+
+DATASETS: Dict[str, Callable] = {
+	"squads": _squads,
+	"bids": _bids,
+	"spend": _spend,
+}
+
+FORMATS = {
+	"csv": "text/csv",
+	"ndjson": "application/x-ndjson",
+}
+
+
+class _Echo:
+	# csv.writer target that hands each formatted line straight back
+	def write(self, value: str) -> str:
+		return value
+
+
+def _cell(value):
+	return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def stream_export(dataset: str, fmt: str, auction_ids: Optional[Sequence[int]] = None, with_auction: bool = True) -> Iterator[str]:
+	header, query = DATASETS[dataset](auction_ids)
+	# Single-auction exports drop the auction columns
+	skip = 0 if with_auction else 2
+	header = header[skip:]
+	rows = query.execution_options(stream_results=True, yield_per=STREAM_BATCH)
+	if fmt == "csv":
+		writer = csv.writer(_Echo())
+		yield writer.writerow(header)
+		for row in rows:
+			yield writer.writerow([_cell(v) for v in row[skip:]])
+	else:
+		keys = [h.lower().replace(" ", "_") for h in header]
+		for row in rows:
+			yield json.dumps(dict(zip(keys, (_cell(v) for v in row[skip:]))), separators=(",", ":")) + "\n"
@@ -0,0 +1,154 @@
+from __future__ import annotations
+import json
+import uuid
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+from flask import Flask
+
+
+def auction_room(auction_id: int) -> str:
+	return f"auction:{auction_id}"
+
+
+def bidders_room(auction_id: int) -> str:
+	return f"auction:{auction_id}:bidders"
+
+
+def spectators_room(auction_id: int) -> str:
+	return f"auction:{auction_id}:spectators"
+
+
+class RoomFanout:
+	# Broadcast layer for auction rooms. Bidders get every bid_update at once;
+	# spectators get at most one "frame" per frame_interval carrying only the
+	# fields that changed (latest state wins), pre-serialized once per room and
+	# stamped with a per-auction sequence number so clients can detect gaps.
+	# Other events go to the whole auction room, after any pending frame, so
+	# spectators never see a sale before the bid that won it.
+	#
+	# Room events (and bid_update) also carry "seq", a second per-auction
+	# counter, and are kept in a bounded log so a reconnecting client can be
+	# sent just what it missed (events_since). Sequence numbers are per process
+	# and per epoch; a client from another epoch gets a full snapshot.
+
+	def __init__(self, frame_interval: float = 0.1, log_size: int = 512) -> None:
+		self.app: Optional[Flask] = None
+		self.frame_interval = frame_interval
+		self.log_size = log_size
+		self.epoch = uuid.uuid4().hex[:8]
+		self._log: Dict[int, Deque[Tuple[int, str, dict, bool]]] = {}  # auction_id -> (seq, event, payload, bidders only)
+		self._event_seq: Dict[int, int] = {}
+		self._pending: Dict[int, dict] = {}  # auction_id -> latest state not yet framed
+		self._sent: Dict[int, dict] = {}  # auction_id -> state as of the last frame
+		self._seq: Dict[int, int] = {}
+		self.emits = 0
+		self.deliveries = 0
+		self.frame_bytes = 0  # spectator frames only: they're serialized here anyway
+		self._task_started = False
+
+	def init_app(self, app: Flask) -> None:
+		self.app = app
+		self.frame_interval = app.config.get("FANOUT_FRAME_INTERVAL", self.frame_interval)
+		self.log_size = app.config.get("FANOUT_EVENT_LOG_SIZE", self.log_size)
+		app.extensions["fanout"] = self
+
+	def emit(self, auction_id: int, event: str, payload: dict, log: bool = True) -> None:
+		# log=False for ephemeral events (timer resyncs) that a resume can skip
+		self.flush(auction_id)
+		if log:
+			payload = self._record(auction_id, event, payload, False)
+		self._emit(event, payload, auction_room(auction_id))
+
+	def bid_update(self, auction_id: int, payload: dict) -> None:
+		self._emit("bid_update", self._record(auction_id, "bid_update", payload, True), bidders_room(auction_id))
+		self._pending[auction_id] = {"a": payload["amount"], "t": payload["team_id"], "e": payload["end_time"]}
+		if not self._task_started:
+			self._ensure_task()
+
+	def reset(self, auction_id: int) -> None:
+		# New lot: the next frame carries every field again
+		self._pending.pop(auction_id, None)
+		self._sent.pop(auction_id, None)
+
+	def seq(self, auction_id: int) -> int:
+		return self._seq.get(auction_id, 0)
+
+	def event_seq(self, auction_id: int) -> int:
+		return self._event_seq.get(auction_id, 0)
+
+	def events_since(self, auction_id: int, last_seq: int, bidder: bool) -> Optional[List[Tuple[str, dict]]]:
+		# Events after last_seq, oldest first, or None if the log no longer
+		# reaches back that far. Spectators never got bid_update; the resume
+		# reply carries the current bid instead.
+		current = self._event_seq.get(auction_id, 0)
+		if last_seq > current:
+			return None
+		log = self._log.get(auction_id) or ()
+		if last_seq < current and (not log or log[0][0] > last_seq + 1):
+			return None
+		return [(event, payload) for seq, event, payload, bidders_only in log if seq > last_seq and (bidder or not bidders_only)]
+
+	def _record(self, auction_id: int, event: str, payload: dict, bidders_only: bool) -> dict:
+		seq = self._event_seq[auction_id] = self._event_seq.get(auction_id, 0) + 1
+		payload = dict(payload, seq=seq)
+		log = self._log.get(auction_id)
+		if log is None:
+			log = self._log[auction_id] = deque(maxlen=self.log_size)
+		log.append((seq, event, payload, bidders_only))
+		return payload
+
+	def flush(self, auction_id: int) -> None:
+		state = self._pending.pop(auction_id, None)
+		if state is None:
+			return
+		last = self._sent.get(auction_id, {})
+		delta = {k: v for k, v in state.items() if last.get(k) != v}
+		if "a" in delta:
+			delta["t"] = state["t"]  # a new price always names its bidder
+		if not delta:
+			return
+		self._sent[auction_id] = state
+		seq = self._seq[auction_id] = self._seq.get(auction_id, 0) + 1
+		delta["s"] = seq
+		data = json.dumps(delta, separators=(",", ":"))
+		self._emit("frame", data, spectators_room(auction_id), size=len(data))
+
+	def flush_all(self) -> None:
+		for auction_id in list(self._pending):
+			self.flush(auction_id)
+
+	def stats(self) -> dict:
+		return {"emits": self.emits, "deliveries": self.deliveries, "frame_bytes": self.frame_bytes}
+
+	def room_size(self, room: str) -> int:
+		from . import socketio
+		rooms = getattr(socketio.server, "manager", None)
+		return len(rooms.rooms.get("/", {}).get(room, ())) if rooms is not None else 0
+
+	def _emit(self, event: str, data, room: str, size: Optional[int] = None) -> None:
+		from . import socketio, metrics
+		with metrics.time(metrics.emit_seconds):
+			socketio.emit(event, data, room=room)
+		recipients = self.room_size(room)
+		self.emits += 1
+		self.deliveries += recipients
+		if size is not None:
+			self.frame_bytes += size * recipients
+
+	def _ensure_task(self) -> None:
+		if self.app is None:
+			return
+		from . import socketio
+		self._task_started = True
+		socketio.start_background_task(self._run)
+
+	def _run(self) -> None:
+		from . import clock
+		while True:
+			clock.sleep(self.frame_interval)
+			if not self._pending:
+				continue
+			try:
+				self.flush_all()
+			except Exception:
+				self.app.logger.exception("Failed to flush spectator frames")
@@ -0,0 +1,198 @@
+from __future__ import annotations
+from collections import Counter, deque
+from typing import Callable, Deque, Dict, Hashable, Optional, Tuple
+from flask import Flask
+
+# Accepted-bid event: (auction_id, team_id, amount, ip, ts_ns)
+BidEvent = Tuple[int, int, int, Optional[str], int]
+
+DEFAULT_RULES = {
+	# More than max_bids from one team, or one (IP, team) pair, inside window seconds
+	"rapid_fire": {"max_bids": 5, "window": 2.0},
+	# One IP bidding for at least min_teams different teams inside window seconds
+	"shared_ip": {"min_teams": 2, "window": 300.0},
+	# One IP switching team between consecutive bids at least alternations times
+	"bid_shading": {"alternations": 4, "window": 60.0},
+}
+
+
+class SlidingWindow:
+	# Time-based window with O(1) amortized add/evict and live per-item counts.
+	__slots__ = ("span_ns", "events", "counts")
+
+	def __init__(self, span: float) -> None:
+		self.span_ns = int(span * 1e9)
+		self.events: Deque[Tuple[int, Hashable]] = deque()
+		self.counts: Counter = Counter()
+
+	def __len__(self) -> int:
+		return len(self.events)
+
+	def add(self, ts_ns: int, item: Hashable = None) -> None:
+		self.events.append((ts_ns, item))
+		self.counts[item] += 1
+		self.evict(ts_ns)
+
+	def evict(self, now_ns: int) -> None:
+		horizon = now_ns - self.span_ns
+		events, counts = self.events, self.counts
+		while events and events[0][0] <= horizon:
+			_, item = events.popleft()
+			counts[item] -= 1
+			if not counts[item]:
+				del counts[item]
+
+
+class FraudEngine:
+	# Consumes accepted bids off the hot path. on_place_bid only enqueues an
+	# event; a background task maintains per-IP, per-team and per-(IP, team)
+	# windows across all live auctions and publishes alerts to admins.
+
+	def __init__(self, alert_cooldown: float = 30.0) -> None:
+		self.app: Optional[Flask] = None
+		self.rules: Dict[str, dict] = {k: dict(v) for k, v in DEFAULT_RULES.items()}
+		self.alert_cooldown_ns = int(alert_cooldown * 1e9)
+		self.publish: Optional[Callable[[dict], None]] = None
+		self._queue: Deque[BidEvent] = deque()
+		self._by_team: Dict[int, SlidingWindow] = {}
+		self._by_ip: Dict[str, SlidingWindow] = {}
+		self._by_ip_team: Dict[Tuple[str, int], SlidingWindow] = {}
+		self._ip_switches: Dict[str, SlidingWindow] = {}  # bids where an IP changed team
+		self._ip_last_team: Dict[str, int] = {}
+		self._last_alert: Dict[Tuple[str, Hashable], int] = {}
+		self._processed = 0
+		self._task_started = False
+
+	def init_app(self, app: Flask) -> None:
+		self.app = app
+		for name, params in app.config.get("FRAUD_RULES", {}).items():
+			if params is None:
+				self.rules.pop(name, None)
+			else:
+				self.rules.setdefault(name, {}).update(params)
+		app.extensions["fraud_engine"] = self
+
+	def submit(self, auction_id: int, team_id: int, amount: int, ip: Optional[str], ts_ns: int) -> None:
+		self._queue.append((auction_id, team_id, amount, ip, ts_ns))
+		if not self._task_started:
+			self._ensure_task()
+
+	def drain(self) -> None:
+		while self._queue:
+			self.process(self._queue.popleft())
+
+	def process(self, event: BidEvent) -> None:
+		auction_id, team_id, amount, ip, ts_ns = event
+		self._window(self._by_team, team_id, "rapid_fire").add(ts_ns)
+		if ip:
+			self._window(self._by_ip, ip, "shared_ip").add(ts_ns, team_id)
+			self._window(self._by_ip_team, (ip, team_id), "rapid_fire").add(ts_ns)
+			switches = self._window(self._ip_switches, ip, "bid_shading")
+			last_team = self._ip_last_team.get(ip)
+			if last_team is not None and last_team != team_id:
+				switches.add(ts_ns)
+			else:
+				switches.evict(ts_ns)
+			self._ip_last_team[ip] = team_id
+		for name in self.rules:
+			check = _RULE_CHECKS.get(name)
+			if check is None:
+				continue
+			hit = check(self, event)
+			if hit:
+				key, detail = hit
+				self._alert(name, key, event, detail)
+		self._processed += 1
+		if self._processed % 10000 == 0:
+			self._sweep(ts_ns)
+
+	def _window(self, windows: dict, key: Hashable, rule: str) -> SlidingWindow:
+		window = windows.get(key)
+		if window is None:
+			params = self.rules.get(rule) or DEFAULT_RULES[rule]
+			window = windows[key] = SlidingWindow(params["window"])
+		return window
+
+	def _alert(self, rule: str, key: Hashable, event: BidEvent, detail: str) -> None:
+		auction_id, team_id, amount, ip, ts_ns = event
+		last = self._last_alert.get((rule, key))
+		if last is not None and ts_ns - last < self.alert_cooldown_ns:
+			return
+		self._last_alert[(rule, key)] = ts_ns
+		alert = {"rule": rule, "auction_id": auction_id, "team_id": team_id, "amount": amount, "ip": ip, "detail": detail}
+		if self.publish is not None:
+			self.publish(alert)
+
+	def _sweep(self, now_ns: int) -> None:
+		# Drop windows for IPs/teams that went quiet so memory tracks live bidders
+		for windows in (self._by_team, self._by_ip, self._by_ip_team, self._ip_switches):
+			idle = []
+			for key, window in windows.items():
+				window.evict(now_ns)
+				if not window:
+					idle.append(key)
+			for key in idle:
+				del windows[key]
+		for ip in [ip for ip in self._ip_last_team if ip not in self._by_ip]:
+			del self._ip_last_team[ip]
+		horizon = now_ns - self.alert_cooldown_ns
+		for key in [k for k, ts in self._last_alert.items() if ts < horizon]:
+			del self._last_alert[key]
+
+	def _ensure_task(self) -> None:
+		if self.app is None:
+			return
+		from . import socketio
+		self._task_started = True
+		socketio.start_background_task(self._run)
+
+	def _run(self) -> None:
+		from . import clock
+		while True:
+			clock.sleep(0.05)
+			if not self._queue:
+				continue
+			try:
+				with self.app.app_context():
+					self.drain()
+			except Exception:
+				self.app.logger.exception("Fraud engine failed to process bids")
+
+
+def _check_rapid_fire(engine: FraudEngine, event: BidEvent):
+	_, team_id, _, ip, _ = event
+	limit = engine.rules["rapid_fire"]["max_bids"]
+	if len(engine._by_team[team_id]) > limit:
+		return team_id, f"{len(engine._by_team[team_id])} bids from Team {team_id} in {engine.rules['rapid_fire']['window']}s"
+	if ip and len(engine._by_ip_team[(ip, team_id)]) > limit:
+		return (ip, team_id), f"rapid bids from {ip} for Team {team_id}"
+	return None
+
+
+def _check_shared_ip(engine: FraudEngine, event: BidEvent):
+	_, _, _, ip, _ = event
+	if not ip:
+		return None
+	teams = engine._by_ip[ip].counts
+	if len(teams) >= engine.rules["shared_ip"]["min_teams"]:
+		return ip, f"{ip} bid for teams {sorted(teams)}"
+	return None
+
+
+def _check_bid_shading(engine: FraudEngine, event: BidEvent):
+	# Consecutive bids from one IP keep switching team: the same source is
+	# bidding both sides up.
+	_, _, _, ip, _ = event
+	if not ip:
+		return None
+	switches = len(engine._ip_switches[ip])
+	if switches >= engine.rules["bid_shading"]["alternations"]:
+		return ip, f"{ip} switched teams {switches} times in {engine.rules['bid_shading']['window']}s"
+	return None
+
+
+_RULE_CHECKS = {
+	"rapid_fire": _check_rapid_fire,
+	"shared_ip": _check_shared_ip,
+	"bid_shading": _check_bid_shading,
+}
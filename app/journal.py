@@ -0,0 +1,158 @@
+from __future__ import annotations
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Set
+from flask import Flask
+from .bid_history import BidHistory
+from .state_store import AuctionState
+
+
+def state_to_record(state: AuctionState, history_len: int = 30) -> dict:
+	return {
+		"auction_id": state.auction_id,
+		"current_ap_id": state.current_ap_id,
+		"highest_bid_amount": state.highest_bid_amount,
+		"highest_bid_team_id": state.highest_bid_team_id,
+		"end_time": state.end_time.isoformat() if state.end_time else None,
+		"min_increment": state.min_increment,
+		"timer_running": state.timer_running,
+		"auto_bids": list(state.auto_bids.items()),  # keeps registration order
+		"bid_history": state.bid_history.to_wire(history_len),
+	}
+
+
+def state_from_record(rec: dict) -> AuctionState:
+	return AuctionState(
+		auction_id=rec["auction_id"],
+		current_ap_id=rec["current_ap_id"],
+		highest_bid_amount=rec["highest_bid_amount"],
+		highest_bid_team_id=rec["highest_bid_team_id"],
+		end_time=datetime.fromisoformat(rec["end_time"]) if rec["end_time"] else None,
+		min_increment=rec["min_increment"],
+		timer_running=rec["timer_running"],
+		auto_bids={int(t): int(limit) for t, limit in rec["auto_bids"]},
+		bid_history=BidHistory.from_wire(rec["bid_history"]),
+	)
+
+
+class StateJournal:
+	# Append-only local journal of live AuctionStates for crash recovery.
+	# Changed auctions are marked dirty on the hot path (a set add) and written
+	# as "chg" records by a background task every flush_interval; every
+	# snapshot_interval a full "snap" record replaces the file, so recovery
+	# reads one snapshot plus a short tail instead of rescanning the bids table.
+
+	def __init__(self, flush_interval: float = 0.1, snapshot_interval: float = 30.0) -> None:
+		self.app: Optional[Flask] = None
+		self.path: Optional[str] = None
+		self.flush_interval = flush_interval
+		self.snapshot_interval = snapshot_interval
+		self._dirty: Set[int] = set()
+		self._live: Set[int] = set()
+		self._fh = None
+		self._last_snapshot = 0.0
+		self._task_started = False
+
+	def init_app(self, app: Flask) -> None:
+		self.app = app
+		self.path = app.config.get("AUCTION_JOURNAL_PATH") or os.path.join(app.instance_path, "auction_state.journal")
+		app.extensions["state_journal"] = self
+
+	def mark(self, auction_id: int) -> None:
+		self._dirty.add(auction_id)
+		if not self._task_started:
+			self._ensure_task()
+
+	def _snapshot_due(self) -> bool:
+		from . import clock
+		return bool(self._live or self._dirty) and clock.monotonic() - self._last_snapshot >= self.snapshot_interval
+
+	def flush(self) -> None:
+		from . import state_store
+		if self._snapshot_due():
+			self._live |= self._dirty
+			self._dirty.clear()
+			self.snapshot(state_store.get(aid) for aid in sorted(self._live))
+			return
+		if not self._dirty:
+			return
+		dirty, self._dirty = self._dirty, set()
+		fh = self._open()
+		for aid in sorted(dirty):
+			state = state_store.get(aid)
+			self._track(state)
+			fh.write(json.dumps({"t": "chg", "s": state_to_record(state)}, separators=(",", ":")) + "\n")
+		fh.flush()
+
+	def snapshot(self, states: Iterable[AuctionState]) -> None:
+		# Compaction: write the snapshot to a new file and atomically swap it in
+		from . import clock
+		records = []
+		for state in states:
+			self._track(state)
+			if state.current_ap_id is not None:
+				records.append(state_to_record(state))
+		os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+		tmp = self.path + ".tmp"
+		with open(tmp, "w", encoding="utf-8") as fh:
+			fh.write(json.dumps({"t": "snap", "ts": clock.utcnow().isoformat(), "s": records}, separators=(",", ":")) + "\n")
+			fh.flush()
+			os.fsync(fh.fileno())
+		if self._fh is not None:
+			self._fh.close()
+			self._fh = None
+		os.replace(tmp, self.path)
+		self._last_snapshot = clock.monotonic()
+
+	def load(self) -> Dict[int, AuctionState]:
+		# Latest snapshot plus every change after it; a torn last line is ignored
+		states: Dict[int, dict] = {}
+		if not self.path or not os.path.exists(self.path):
+			return {}
+		with open(self.path, encoding="utf-8") as fh:
+			for line in fh:
+				try:
+					rec = json.loads(line)
+				except ValueError:
+					break
+				if rec["t"] == "snap":
+					states = {s["auction_id"]: s for s in rec["s"]}
+				elif rec["s"]["current_ap_id"] is None:
+					states.pop(rec["s"]["auction_id"], None)
+				else:
+					states[rec["s"]["auction_id"]] = rec["s"]
+		self._live = set(states)
+		return {aid: state_from_record(s) for aid, s in states.items()}
+
+	def _track(self, state: AuctionState) -> None:
+		if state.current_ap_id is None:
+			self._live.discard(state.auction_id)
+		else:
+			self._live.add(state.auction_id)
+
+	def _open(self):
+		if self._fh is None:
+			os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+			self._fh = open(self.path, "a", encoding="utf-8")
+		return self._fh
+
+	def _ensure_task(self) -> None:
+		if self.app is None:
+			return
+		from . import clock, socketio
+		self._task_started = True
+		self._last_snapshot = clock.monotonic()
+		socketio.start_background_task(self._run)
+
+	def _run(self) -> None:
+		from . import clock
+		while True:
+			clock.sleep(self.flush_interval)
+			if not self._dirty and not self._snapshot_due():
+				continue
+			try:
+				with self.app.app_context():
+					self.flush()
+			except Exception:
+				self.app.logger.exception("Failed to write auction state journal")
@@ -0,0 +1,200 @@
+from __future__ import annotations
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from flask import Flask
+
+# Minimum squad a team must still be able to afford, by Player.role
+DEFAULT_SQUAD_REQUIREMENTS = {"Batter": 4, "Bowler": 4, "All-Rounder": 2, "Wicketkeeper": 1}
+
+
+@dataclass
+class Standing:
+	team_id: int
+	name: str
+	budget_total: int
+	purse: int
+	spend: int = 0
+	players: int = 0
+	by_role: Dict[str, int] = field(default_factory=dict)
+	top_buy: Optional[dict] = None
+
+	def add(self, player_id: int, name: Optional[str], role: Optional[str], price: int) -> None:
+		self.spend += price
+		self.players += 1
+		role = role or "Unknown"
+		self.by_role[role] = self.by_role.get(role, 0) + 1
+		if self.top_buy is None or price > self.top_buy["price"]:
+			self.top_buy = {"player_id": player_id, "name": name, "role": role, "price": price}
+
+	def to_dict(self, requirements: Dict[str, int], slot_price: int) -> dict:
+		needs = {role: n - self.by_role.get(role, 0) for role, n in requirements.items() if n > self.by_role.get(role, 0)}
+		slots = sum(needs.values())
+		# The most this team can bid now and still fill the other open slots at the floor price
+		max_bid = self.purse - max(slots - 1, 0) * slot_price
+		return {
+			"team_id": self.team_id,
+			"name": self.name,
+			"spend": self.spend,
+			"players": self.players,
+			"avg_price": self.spend // self.players if self.players else 0,
+			"by_role": dict(sorted(self.by_role.items())),
+			"top_buy": self.top_buy,
+			"budget_total": self.budget_total,
+			"purse": self.purse,
+			"needs": needs,
+			"max_bid": max(max_bid, 0),
+		}
+
+
+class _Board:
+	def __init__(self, standings: Dict[int, Standing]) -> None:
+		self.standings = standings
+		self.role_totals: Dict[str, List[int]] = {}  # role -> [count, spend]
+		self.payload: Optional[Tuple[str, str]] = None
+
+	def add(self, team_id: int, player_id: int, name: Optional[str], role: Optional[str], price: int) -> Optional[Standing]:
+		standing = self.standings.get(team_id)
+		if standing is None:
+			return None
+		standing.add(player_id, name, role, price)
+		totals = self.role_totals.setdefault(role or "Unknown", [0, 0])
+		totals[0] += 1
+		totals[1] += price
+		self.payload = None
+		return standing
+
+
+class Leaderboard:
+	# Per-auction standings (spend, squad by role, top buy, purse against the
+	# minimum squad) kept in memory and updated by finalize_sale as lots sell,
+	# so the JSON endpoint serves a pre-serialized payload instead of
+	# aggregating auction_players per request. A board is built in one pass on
+	# first use; team edits drop the boards and they rebuild lazily.
+
+	def __init__(self) -> None:
+		self.requirements: Dict[str, int] = dict(DEFAULT_SQUAD_REQUIREMENTS)
+		self.slot_price = 1000000
+		self._boards: Dict[int, _Board] = {}
+
+	def init_app(self, app: Flask) -> None:
+		self.requirements = app.config.get("SQUAD_REQUIREMENTS", self.requirements)
+		self.slot_price = app.config.get("SQUAD_SLOT_PRICE", self.slot_price)
+		self._boards = {}
+		app.extensions["leaderboard"] = self
+
+	def get(self, auction_id: int) -> Tuple[str, str]:
+		# Returns (etag, JSON body)
+		board = self._board(auction_id)
+		if board.payload is None:
+			body = json.dumps(self._serialize(auction_id, board), separators=(",", ":"))
+			board.payload = (hashlib.sha1(body.encode("utf-8")).hexdigest()[:20], body)
+		return board.payload
+
+	def record_sale(self, auction_id: int, team_id: int, player_id: int, name: Optional[str], role: Optional[str], price: int, purse: Optional[int]) -> Optional[dict]:
+		# Returns the team's new standing for the socket push, or None if no
+		# board is loaded (the next read builds it from the committed sale)
+		board = self._boards.get(auction_id)
+		if board is None:
+			return None
+		standing = board.add(team_id, player_id, name, role, price)
+		if standing is None:
+			self._boards.pop(auction_id, None)  # a team we haven't seen: rebuild on next read
+			return None
+		if purse is not None:
+			standing.purse = purse
+		return standing.to_dict(self.requirements, self.slot_price)
+
+	def loaded(self) -> List[int]:
+		return sorted(self._boards)
+
+	def invalidate(self, auction_id: Optional[int] = None) -> None:
+		if auction_id is None:
+			self._boards.clear()
+		else:
+			self._boards.pop(auction_id, None)
+
+	def rebuild(self, auction_id: Optional[int] = None) -> Dict[int, List[int]]:
+		# Recompute from auction_players in one pass. Returns, per auction, the
+		# teams whose incrementally maintained standing differed.
+		boards = self._load(auction_id)
+		mismatched: Dict[int, List[int]] = {}
+		for aid, board in boards.items():
+			old = self._boards.get(aid)
+			if old is not None:
+				diff = [
+					tid for tid, s in board.standings.items()
+					if tid not in old.standings or old.standings[tid].to_dict(self.requirements, self.slot_price) != s.to_dict(self.requirements, self.slot_price)
+				]
+				if diff:
+					mismatched[aid] = diff
+			self._boards[aid] = board
+		return mismatched
+
+	def _board(self, auction_id: int) -> _Board:
+		board = self._boards.get(auction_id)
+		if board is None:
+			board = self._load(auction_id).get(auction_id) or _Board(self._teams())
+			self._boards[auction_id] = board
+		return board
+
+	@staticmethod
+	def _teams() -> Dict[int, Standing]:
+		from .models import Team
+		rows = Team.query.with_entities(Team.id, Team.name, Team.budget_total, Team.budget_remaining).filter_by(approved=True)
+		return {r.id: Standing(r.id, r.name, r.budget_total or 0, r.budget_remaining or 0) for r in rows}
+
+	def _load(self, auction_id: Optional[int]) -> Dict[int, _Board]:
+		from .models import db, Auction, AuctionPlayer, Player, Team
+		teams = self._teams()
+		extra = Team.query.with_entities(Team.id, Team.name, Team.budget_total, Team.budget_remaining).filter(
+			Team.id.in_(db.session.query(AuctionPlayer.sold_to_team_id).filter(AuctionPlayer.status == "sold")),
+			Team.approved.isnot(True),
+		)
+		for r in extra:
+			teams[r.id] = Standing(r.id, r.name, r.budget_total or 0, r.budget_remaining or 0)
+
+		def fresh() -> _Board:
+			return _Board({tid: Standing(s.team_id, s.name, s.budget_total, s.purse) for tid, s in teams.items()})
+
+		ids = [auction_id] if auction_id is not None else [aid for (aid,) in db.session.query(Auction.id)]
+		boards = {aid: fresh() for aid in ids}
+		rows = (
+			db.session.query(AuctionPlayer.auction_id, AuctionPlayer.sold_to_team_id, AuctionPlayer.player_id, AuctionPlayer.final_price, Player.name, Player.role)
+			.outerjoin(Player, Player.id == AuctionPlayer.player_id)
+			.filter(AuctionPlayer.status == "sold", AuctionPlayer.sold_to_team_id.isnot(None))
+		)
+		if auction_id is not None:
+			rows = rows.filter(AuctionPlayer.auction_id == auction_id)
+		for r in rows:
+			board = boards.get(r.auction_id)
+			if board is not None:
+				board.add(r.sold_to_team_id, r.player_id, r.name, r.role, r.final_price or 0)
+		for board in boards.values():
+			board.payload = None
+		return boards
+
+	def _serialize(self, auction_id: int, board: _Board) -> dict:
+		standings = sorted(board.standings.values(), key=lambda s: (-s.spend, s.name))
+		return {
+			"auction_id": auction_id,
+			"teams": [s.to_dict(self.requirements, self.slot_price) for s in standings],
+			"roles": {role: {"count": c, "spend": sp, "avg_price": sp // c} for role, (c, sp) in sorted(board.role_totals.items())},
+		}
+
+	@staticmethod
+	def ledger_drift() -> List[Tuple[int, int, int]]:
+		# (team_id, budget spent per the teams table, sum of its purchases) where they disagree
+		from .models import db, AuctionPlayer, Team
+		bought = dict(
+			db.session.query(AuctionPlayer.sold_to_team_id, db.func.sum(AuctionPlayer.final_price))
+			.filter(AuctionPlayer.status == "sold", AuctionPlayer.sold_to_team_id.isnot(None))
+			.group_by(AuctionPlayer.sold_to_team_id)
+		)
+		drift = []
+		for tid, total, remaining in Team.query.with_entities(Team.id, Team.budget_total, Team.budget_remaining):
+			spent = (total or 0) - (remaining or 0)
+			if spent != (bought.get(tid) or 0):
+				drift.append((tid, spent, bought.get(tid) or 0))
+		return drift
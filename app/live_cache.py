@@ -0,0 +1,78 @@
+from __future__ import annotations
+import hashlib
+from typing import Dict, List, Optional, Tuple
+from flask import Flask
+from jinja2.utils import htmlsafe_json_dumps
+from markupsafe import Markup
+
+
+class LivePageCache:
+	# Bootstrap payload for auction.live (lots + teams), built with one joined
+	# query and serialized once per version. Lots are cached per auction and the
+	# team list once for all auctions; each is dropped only by the events that
+	# change it (a sale, a lot added, a team approved or edited).
+
+	def __init__(self) -> None:
+		self._lots: Dict[int, List[dict]] = {}
+		self._teams: Optional[List[dict]] = None
+		self._payloads: Dict[int, Tuple[str, Markup]] = {}
+
+	def init_app(self, app: Flask) -> None:
+		app.extensions["live_cache"] = self
+
+	def get(self, auction_id: int) -> Tuple[str, Markup]:
+		# Returns (etag, payload) where payload is HTML-safe JSON for embedding
+		cached = self._payloads.get(auction_id)
+		if cached is None:
+			payload = htmlsafe_json_dumps({"players": self._lots_for(auction_id), "teams": self._team_list()})
+			etag = hashlib.sha1(payload.encode("utf-8")).hexdigest()[:20]
+			cached = self._payloads[auction_id] = (etag, payload)
+		return cached
+
+	def invalidate(self, auction_id: int) -> None:
+		self._lots.pop(auction_id, None)
+		self._payloads.pop(auction_id, None)
+
+	def invalidate_teams(self) -> None:
+		self._teams = None
+		self._payloads.clear()
+
+	def _lots_for(self, auction_id: int) -> List[dict]:
+		lots = self._lots.get(auction_id)
+		if lots is None:
+			from .models import db, AuctionPlayer, Player
+			rows = (
+				db.session.query(
+					AuctionPlayer.id, AuctionPlayer.player_id, AuctionPlayer.status, AuctionPlayer.order_index,
+					Player.name, Player.role, Player.base_price, Player.highlight_url,
+				)
+				.outerjoin(Player, Player.id == AuctionPlayer.player_id)
+				.filter(AuctionPlayer.auction_id == auction_id)
+				.order_by(AuctionPlayer.order_index.asc())
+			)
+			lots = self._lots[auction_id] = [{
+				"id": r.id,
+				"player_id": r.player_id,
+				"status": r.status,
+				"order_index": r.order_index,
+				"player": {
+					"id": r.player_id if r.name is not None else None,
+					"name": r.name,
+					"role": r.role,
+					"base_price": r.base_price or 0,
+					"highlight_url": r.highlight_url,
+				},
+			} for r in rows]
+		return lots
+
+	def _team_list(self) -> List[dict]:
+		if self._teams is None:
+			from .models import Team
+			rows = Team.query.with_entities(Team.id, Team.name, Team.budget_total, Team.budget_remaining).filter_by(approved=True)
+			self._teams = [{
+				"id": r.id,
+				"name": r.name,
+				"budget_total": r.budget_total,
+				"budget_remaining": r.budget_remaining,
+			} for r in rows]
+		return self._teams
@@ -0,0 +1,170 @@
+from __future__ import annotations
+import hashlib
+import json
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from flask import Flask
+
+LOBBY_ROOM = "lobby"
+
+
+class Lobby:
+	# Spectator lobby: scheduled and live auctions with viewer counts and the
+	# current lot / high bid, kept in memory instead of queried per page view.
+	# The auction engine marks entries dirty on lot start, bids and closes; a
+	# background task folds those marks (and room sizes) into the list once per
+	# push_interval and pushes only the changed entries to the "lobby" room.
+	# The auction list itself is reloaded only when an auction is created or
+	# changes status.
+
+	def __init__(self, push_interval: float = 1.0, limit: int = 200) -> None:
+		self.app: Optional[Flask] = None
+		self.push_interval = push_interval
+		self.limit = limit
+		self._entries: Optional[Dict[int, dict]] = None
+		self._dirty: Set[int] = set()
+		self._reload = False
+		self._snapshot: Optional[Tuple[str, List[dict]]] = None
+		self._page: Optional[Tuple[str, str]] = None
+		self._task_started = False
+
+	def init_app(self, app: Flask) -> None:
+		self.app = app
+		self.push_interval = app.config.get("LOBBY_PUSH_INTERVAL", self.push_interval)
+		self.limit = app.config.get("LOBBY_LIMIT", self.limit)
+		self._entries = None
+		self._snapshot = self._page = None
+		app.extensions["lobby"] = self
+
+	# Engine hooks: cheap, no I/O; applied on the next push
+
+	def lot_changed(self, auction_id: int) -> None:
+		self._mark(auction_id)
+
+	def auctions_changed(self) -> None:
+		self._reload = True
+		self._ensure_task()
+
+	def _mark(self, auction_id: int) -> None:
+		if self._entries is not None and auction_id in self._entries:
+			self._dirty.add(auction_id)
+			self._ensure_task()
+
+	# Reads
+
+	def snapshot(self) -> Tuple[str, List[dict]]:
+		# (etag, entries) as of the last push
+		if self._entries is None or self._reload:
+			self.refresh()
+		self._ensure_task()
+		if self._snapshot is None:
+			entries = sorted(self._entries.values(), key=lambda e: (e["scheduled_at"] or "", e["id"]), reverse=True)
+			body = json.dumps(entries, separators=(",", ":"), sort_keys=True)
+			self._snapshot = (hashlib.sha1(body.encode("utf-8")).hexdigest()[:20], entries)
+		return self._snapshot
+
+	def page(self, render: Callable[[List[dict]], str]) -> Tuple[str, str]:
+		# Rendered once per version of the list
+		etag, entries = self.snapshot()
+		if self._page is None or self._page[0] != etag:
+			self._page = (etag, render(entries))
+		return self._page
+
+	def join(self, sid: str) -> None:
+		from flask_socketio import join_room
+		from . import socketio
+		join_room(LOBBY_ROOM)
+		_, entries = self.snapshot()
+		socketio.emit("lobby", {"auctions": entries}, room=sid)
+
+	# Refresh: runs on the push task (or the first read)
+
+	def refresh(self) -> Tuple[List[dict], List[int]]:
+		# Returns (changed entries, removed auction ids)
+		old = dict(self._entries or {})
+		if self._entries is None or self._reload:
+			self._reload = False
+			self._entries = self._load()
+			dirty = set(self._entries)
+		else:
+			dirty, self._dirty = self._dirty, set()
+		for auction_id in dirty & set(self._entries):
+			self._entries[auction_id] = dict(self._entries[auction_id], **self._live_fields(auction_id))
+		self._count_viewers()
+		changed = [e for aid, e in self._entries.items() if old.get(aid) != e]
+		removed = [aid for aid in old if aid not in self._entries]
+		if changed or removed:
+			self._snapshot = None
+		return changed, removed
+
+	def _load(self) -> Dict[int, dict]:
+		from .models import Auction
+		rows = (
+			Auction.query.with_entities(Auction.id, Auction.name, Auction.status, Auction.scheduled_at)
+			.filter(Auction.status != "ended")
+			.order_by(Auction.scheduled_at.desc())
+			.limit(self.limit)
+		)
+		return {r.id: {
+			"id": r.id,
+			"name": r.name,
+			"status": r.status,
+			"scheduled_at": r.scheduled_at.isoformat() if r.scheduled_at else None,
+			"viewers": 0,
+			"lot": None,
+			"high_bid": 0,
+			"high_bid_team": None,
+		} for r in rows}
+
+	def _live_fields(self, auction_id: int) -> dict:
+		# Entries are replaced, never mutated in place, so refresh() can diff them
+		from . import state_store, entity_cache
+		from .models import db, AuctionPlayer, Player
+		state = state_store.get(auction_id)
+		entry = self._entries[auction_id]
+		lot = None
+		if state.current_ap_id:
+			if entry["lot"] and entry["lot"]["auction_player_id"] == state.current_ap_id:
+				lot = entry["lot"]
+			else:
+				name = (
+					db.session.query(Player.name)
+					.join(AuctionPlayer, AuctionPlayer.player_id == Player.id)
+					.filter(AuctionPlayer.id == state.current_ap_id)
+					.scalar()
+				)
+				lot = {"auction_player_id": state.current_ap_id, "player_name": name}
+		team = entity_cache.team(state.highest_bid_team_id) if state.highest_bid_team_id else None
+		return {
+			"lot": lot,
+			"high_bid": state.highest_bid_amount if lot else 0,
+			"high_bid_team": team.name if team and lot else None,
+		}
+
+	def _count_viewers(self) -> None:
+		from . import fanout
+		from .fanout import auction_room
+		for auction_id, entry in list(self._entries.items()):
+			viewers = fanout.room_size(auction_room(auction_id))
+			if viewers != entry["viewers"]:
+				self._entries[auction_id] = dict(entry, viewers=viewers)
+
+	# Push task
+
+	def _ensure_task(self) -> None:
+		if self._task_started or self.app is None:
+			return
+		from . import socketio
+		self._task_started = True
+		socketio.start_background_task(self._run)
+
+	def _run(self) -> None:
+		from . import clock, socketio, fanout
+		while True:
+			clock.sleep(self.push_interval)
+			try:
+				with self.app.app_context():
+					changed, removed = self.refresh()
+				if (changed or removed) and fanout.room_size(LOBBY_ROOM):
+					socketio.emit("lobby_update", {"changed": changed, "removed": removed}, room=LOBBY_ROOM)
+			except Exception:
+				self.app.logger.exception("Failed to refresh the lobby")
@@ -0,0 +1,181 @@
+from __future__ import annotations
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from flask import Flask
+
+# Upper bounds in seconds; the hot paths we care about live between 100 µs and 1 s
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _labels(names: Tuple[str, ...], values: Tuple) -> str:
+	if not names:
+		return ""
+	return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+def _escape(value) -> str:
+	return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+	# Cumulative buckets are computed at scrape time; observe() is one bisect
+	# and two adds.
+
+	def __init__(self, name: str, doc: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+		self.name = name
+		self.doc = doc
+		self.buckets = buckets
+		self.counts = [0] * (len(buckets) + 1)
+		self.sum = 0.0
+
+	def observe(self, value: float) -> None:
+		self.counts[bisect_left(self.buckets, value)] += 1
+		self.sum += value
+
+	def render(self) -> Iterable[str]:
+		yield f"# HELP {self.name} {self.doc}"
+		yield f"# TYPE {self.name} histogram"
+		total = 0
+		for bound, count in zip(self.buckets, self.counts):
+			total += count
+			yield f'{self.name}_bucket{{le="{bound}"}} {total}'
+		total += self.counts[-1]
+		yield f'{self.name}_bucket{{le="+Inf"}} {total}'
+		yield f"{self.name}_sum {self.sum:.6f}"
+		yield f"{self.name}_count {total}"
+
+
+class Counter:
+	def __init__(self, name: str, doc: str, labels: Tuple[str, ...] = ()) -> None:
+		self.name = name
+		self.doc = doc
+		self.labels = labels
+		self.values: Dict[Tuple, float] = {}
+
+	def inc(self, *label_values, amount: float = 1) -> None:
+		self.values[label_values] = self.values.get(label_values, 0) + amount
+
+	def render(self) -> Iterable[str]:
+		yield f"# HELP {self.name} {self.doc}"
+		yield f"# TYPE {self.name} counter"
+		for values, total in sorted(self.values.items()):
+			yield f"{self.name}{_labels(self.labels, values)} {total}"
+
+
+class Gauge:
+	# Read at scrape time from a callback returning {label_values: value};
+	# kind="counter" for running totals kept elsewhere
+	def __init__(self, name: str, doc: str, collect: Callable[[], Dict[Tuple, float]], labels: Tuple[str, ...] = (), kind: str = "gauge") -> None:
+		self.name = name
+		self.doc = doc
+		self.labels = labels
+		self.collect = collect
+		self.kind = kind
+
+	def render(self) -> Iterable[str]:
+		yield f"# HELP {self.name} {self.doc}"
+		yield f"# TYPE {self.name} {self.kind}"
+		for values, value in sorted(self.collect().items()):
+			yield f"{self.name}{_labels(self.labels, values)} {value}"
+
+
+class Metrics:
+	# In-process instrumentation rendered as Prometheus text by /metrics.
+	# Hot paths only do a perf_counter pair and a bisect; everything derived
+	# (room sizes, live auctions, background tasks) is read at scrape time.
+	# METRICS_ENABLED=False turns every timer into a no-op.
+
+	def __init__(self) -> None:
+		self.app: Optional[Flask] = None
+		self.enabled = True
+		self.bid_seconds = Histogram("auction_bid_handle_seconds", "Time to validate and accept or reject a place_bid.")
+		self.db_commit_seconds = Histogram("auction_db_commit_seconds", "Time spent in db.session.commit().")
+		self.finalize_seconds = Histogram("auction_finalize_sale_seconds", "Time to close a lot in finalize_sale.")
+		self.emit_seconds = Histogram("auction_emit_seconds", "Time to fan one Socket.IO emit out to a room.")
+		self.lot_transition_seconds = Histogram("auction_lot_transition_seconds", "Time for the auction runner to put the next lot on the block.")
+		self.bids = Counter("auction_bids_total", "place_bid outcomes.", ("outcome",))
+		self.gauges: List[Gauge] = []
+
+	def init_app(self, app: Flask) -> None:
+		self.app = app
+		self.enabled = app.config.get("METRICS_ENABLED", True)
+		app.extensions["metrics"] = self
+		self.gauges = []
+		if self.enabled:
+			self._watch_commits()
+			self._default_gauges()
+		if app.config.get("PROFILE_REQUESTS"):
+			# Per-request cProfile dumps (one .prof file per request); debugging only
+			from werkzeug.middleware.profiler import ProfilerMiddleware
+			app.wsgi_app = ProfilerMiddleware(app.wsgi_app, profile_dir=app.config.get("PROFILE_DIR"), restrictions=(30,))
+
+	@contextmanager
+	def time(self, histogram: Histogram):
+		if not self.enabled:
+			yield
+			return
+		t0 = time.perf_counter()
+		try:
+			yield
+		finally:
+			histogram.observe(time.perf_counter() - t0)
+
+	def count_bid(self, outcome: str) -> None:
+		if self.enabled:
+			self.bids.inc(outcome)
+
+	def gauge(self, name: str, doc: str, collect: Callable[[], Dict[Tuple, float]], labels: Tuple[str, ...] = (), kind: str = "gauge") -> None:
+		self.gauges.append(Gauge(name, doc, collect, labels, kind))
+
+	def render(self) -> str:
+		lines: List[str] = []
+		for metric in (self.bid_seconds, self.db_commit_seconds, self.finalize_seconds, self.emit_seconds, self.lot_transition_seconds, self.bids, *self.gauges):
+			lines.extend(metric.render())
+		return "\n".join(lines) + "\n"
+
+	def _watch_commits(self) -> None:
+		# Every session commit in the process, including the bid writer's
+		from sqlalchemy import event
+		from sqlalchemy.orm import Session
+		for name, fn in (("before_commit", self._before_commit), ("after_commit", self._after_commit), ("after_rollback", self._after_rollback)):
+			if not event.contains(Session, name, fn):
+				event.listen(Session, name, fn)
+
+	def _before_commit(self, session) -> None:
+		session.info["commit_t0"] = time.perf_counter()
+
+	def _after_commit(self, session) -> None:
+		t0 = session.info.pop("commit_t0", None)
+		if t0 is not None:
+			self.db_commit_seconds.observe(time.perf_counter() - t0)
+
+	def _after_rollback(self, session) -> None:
+		session.info.pop("commit_t0", None)
+
+	def _default_gauges(self) -> None:
+		from . import socketio, timer_wheel, bid_writer, fraud_engine, state_journal, fanout, entity_cache
+
+		def live_auctions():
+			return {(): sum(1 for key in timer_wheel.keys() if key[0] == "close")}
+
+		def room_sizes():
+			manager = getattr(socketio.server, "manager", None)
+			if manager is None:
+				return {}
+			rooms = manager.rooms.get("/", {})
+			return {(room,): len(sids) for room, sids in list(rooms.items()) if isinstance(room, str) and room.startswith("auction:")}
+
+		def background_tasks():
+			tasks = {"bid_writer": bid_writer, "timer_wheel": timer_wheel, "fraud_engine": fraud_engine, "state_journal": state_journal, "fanout": fanout}
+			return {(name,): int(ext._task_started) for name, ext in tasks.items()}
+
+		self.gauge("auction_live_lots", "Lots with a running close timer in this process.", live_auctions)
+		self.gauge("auction_room_clients", "Connected clients per auction room.", room_sizes, ("room",))
+		self.gauge("auction_background_tasks", "Background tasks running, by owner.", background_tasks, ("task",))
+		self.gauge("auction_pending_timers", "Timers on the timer wheel.", lambda: {(): len(timer_wheel)})
+		self.gauge("auction_entity_cache_hits_total", "Entity cache hits, by kind.", lambda: {(k,): v["hits"] for k, v in entity_cache.stats().items()}, ("kind",), "counter")
+		self.gauge("auction_entity_cache_misses_total", "Entity cache misses, by kind.", lambda: {(k,): v["misses"] for k, v in entity_cache.stats().items()}, ("kind",), "counter")
+		self.gauge("auction_bid_writer_pending", "Accepted bids not yet committed.", lambda: {(): bid_writer.pending})
+		self.gauge("auction_bid_writer_dropped_total", "Bid rows the database rejected and the writer dropped.", lambda: {(): bid_writer.dropped}, kind="counter")
@@ -1,8 +1,6 @@
 from datetime import datetime
-from typing import Optional
-from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import UserMixin
-from . import db, login_manager
+from . import db, login_manager, password_hasher, entity_cache
 
 
 class User(UserMixin, db.Model):
@@ -18,18 +16,19 @@ class User(UserMixin, db.Model):
 	player = db.relationship("Player", back_populates="user", uselist=False)
 
 	def set_password(self, password: str) -> None:
-		self.password_hash = generate_password_hash(password)
+		self.password_hash = password_hasher.hash(password)
 
 	def check_password(self, password: str) -> bool:
-		return check_password_hash(self.password_hash, password)
+		return password_hasher.check(self.password_hash, password)
 
 	def __repr__(self) -> str:
 		return f"<User {self.username} ({self.role})>"
 
 
 @login_manager.user_loader
-def load_user(user_id: str) -> Optional["User"]:
-	return User.query.get(int(user_id))
+def load_user(user_id: str):
+	# Frozen snapshot from the entity cache, not a session-bound User
+	return entity_cache.user(int(user_id))
 
 
 class Team(db.Model):
@@ -40,7 +39,7 @@ class Team(db.Model):
 	strategy = db.Column(db.String(50), default="balanced")  # batting-heavy, bowling-heavy, balanced
 	budget_total = db.Column(db.Integer, default=100000000)  # in rupees
 	budget_remaining = db.Column(db.Integer, default=100000000)
-	approved = db.Column(db.Boolean, default=False)
+	approved = db.Column(db.Boolean, default=False, index=True)
 
 	owner_user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
 	owner = db.relationship("User", back_populates="team")
@@ -49,7 +48,10 @@ class Team(db.Model):
 	players = db.relationship("AuctionPlayer", back_populates="sold_to_team")
 
 	def spend_budget(self, amount: int) -> None:
-		self.budget_remaining = max(0, (self.budget_remaining or 0) - amount)
+		remaining = self.budget_remaining or 0
+		if amount > remaining:
+			raise ValueError(f"team {self.id} cannot spend {amount}, only {remaining} remaining")
+		self.budget_remaining = remaining - amount
 
 	def __repr__(self) -> str:
 		return f"<Team {self.name} rem={self.budget_remaining}>"
@@ -75,13 +77,19 @@ class Player(db.Model):
 		return f"<Player {self.name} {self.role}>"
 
 
+# Admin player lists page and prefix-search by name, case-insensitively
+db.Index("ix_players_approved_name", Player.approved, db.collate(Player.name, "NOCASE"))
+db.Index("ix_players_name", db.collate(Player.name, "NOCASE"))
+
+
 class Auction(db.Model):
 	__tablename__ = "auctions"
+	__table_args__ = (db.Index("ix_auctions_scheduled_id", "scheduled_at", "id"),)
 	id = db.Column(db.Integer, primary_key=True)
 	name = db.Column(db.String(120), nullable=False)
 	scheduled_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
 	budget_per_team = db.Column(db.Integer, default=100000000)
-	status = db.Column(db.String(20), default="scheduled")  # scheduled, live, ended
+	status = db.Column(db.String(20), default="scheduled", index=True)  # scheduled, live, ended
 	current_player_id = db.Column(db.Integer, db.ForeignKey("players.id"))
 	created_by_id = db.Column(db.Integer, db.ForeignKey("users.id"))
 
@@ -94,6 +102,7 @@ class Auction(db.Model):
 
 class AuctionPlayer(db.Model):
 	__tablename__ = "auction_players"
+	__table_args__ = (db.Index("ix_auction_players_auction_status", "auction_id", "status"),)
 	id = db.Column(db.Integer, primary_key=True)
 	auction_id = db.Column(db.Integer, db.ForeignKey("auctions.id"), nullable=False)
 	player_id = db.Column(db.Integer, db.ForeignKey("players.id"), nullable=False)
@@ -112,6 +121,8 @@ class AuctionPlayer(db.Model):
 
 class Bid(db.Model):
 	__tablename__ = "bids"
+	# Replay reads one lot's bids in time order, paging by (timestamp, id)
+	__table_args__ = (db.Index("ix_bids_auction_player_ts", "auction_id", "player_id", "timestamp"),)
 	id = db.Column(db.Integer, primary_key=True)
 	auction_id = db.Column(db.Integer, db.ForeignKey("auctions.id"), nullable=False)
 	player_id = db.Column(db.Integer, db.ForeignKey("players.id"), nullable=False)
@@ -124,4 +135,35 @@ class Bid(db.Model):
 	team = db.relationship("Team", back_populates="bids")
 
 	def __repr__(self) -> str:
-		return f"<Bid {self.amount} team={self.team_id} player={self.player_id}>"
\ No newline at end of file
+		return f"<Bid {self.amount} team={self.team_id} player={self.player_id}>"
+
+
+class PlayerTimeline(db.Model):
+	# Per-lot replay summary, materialized when the lot closes
+	__tablename__ = "player_timelines"
+	id = db.Column(db.Integer, primary_key=True)
+	auction_id = db.Column(db.Integer, db.ForeignKey("auctions.id"), nullable=False, index=True)
+	player_id = db.Column(db.Integer, db.ForeignKey("players.id"), nullable=False)
+	auction_player_id = db.Column(db.Integer, db.ForeignKey("auction_players.id"))
+	status = db.Column(db.String(20))
+	sold_to_team_id = db.Column(db.Integer, db.ForeignKey("teams.id"))
+	opened_at = db.Column(db.DateTime)
+	closed_at = db.Column(db.DateTime)
+	bid_count = db.Column(db.Integer, default=0)
+	opening_bid = db.Column(db.Integer)
+	final_price = db.Column(db.Integer)
+	price_steps = db.Column(db.JSON, default=list)  # [[ms since open, amount, team_id], ...]
+
+	__table_args__ = (db.UniqueConstraint("auction_id", "player_id", name="uq_timeline_auction_player"),)
+
+	player = db.relationship("Player")
+
+	def __repr__(self) -> str:
+		return f"<PlayerTimeline auction={self.auction_id} player={self.player_id} bids={self.bid_count}>"
+
+
+def create_missing_indexes() -> None:
+	# create_all() skips tables that already exist; add indexes declared since
+	for table in db.metadata.sorted_tables:
+		for index in table.indexes:
+			index.create(db.engine, checkfirst=True)
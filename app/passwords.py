@@ -0,0 +1,115 @@
+from __future__ import annotations
+import time
+from typing import Callable, Dict, Optional
+from flask import Flask
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+from .fraud import SlidingWindow
+
+
+class HasherBusy(Exception):
+	pass
+
+
+def method_spec(method: str) -> str:
+	# The parameter prefix werkzeug writes for `method`, with its defaults
+	# filled in, worked out without paying for a hash
+	name, *args = method.split(":")
+	if name == "scrypt":
+		n, r, p = args or (2 ** 15, 8, 1)
+		return f"scrypt:{int(n)}:{int(r)}:{int(p)}"
+	if name == "pbkdf2" and len(args) <= 2:
+		hash_name = args[0] if args else "sha256"
+		iterations = int(args[1]) if len(args) == 2 else DEFAULT_PBKDF2_ITERATIONS
+		return f"pbkdf2:{hash_name}:{iterations}"
+	raise ValueError(f"Invalid hash method {method!r}")
+
+
+class PasswordHasher:
+	# scrypt is CPU-bound by design. Hashes are computed on eventlet's native
+	# thread pool (hashlib releases the GIL) so the hub keeps serving bids and
+	# ticks; a green semaphore caps how many run at once and sheds load with
+	# HasherBusy once callers have queued for longer than queue_timeout.
+	# Hashes made with older parameters are upgraded by auth.login.
+
+	def __init__(self, method: str = "scrypt", max_concurrent: int = 4, queue_timeout: float = 20.0) -> None:
+		self.app: Optional[Flask] = None
+		self.method = method
+		self.max_concurrent = max_concurrent
+		self.queue_timeout = queue_timeout
+		self._slots = None
+		self._spec = method_spec(method)
+
+	def init_app(self, app: Flask) -> None:
+		self.app = app
+		self.method = app.config.get("PASSWORD_HASH_METHOD", self.method)
+		self.max_concurrent = app.config.get("PASSWORD_HASH_CONCURRENCY", self.max_concurrent)
+		self.queue_timeout = app.config.get("PASSWORD_HASH_QUEUE_TIMEOUT", self.queue_timeout)
+		self._slots = None
+		self._spec = method_spec(self.method)
+		app.extensions["password_hasher"] = self
+
+	def hash(self, password: str) -> str:
+		return self._run(generate_password_hash, password, self.method)
+
+	def check(self, pwhash: str, password: str) -> bool:
+		return self._run(check_password_hash, pwhash, password)
+
+	def needs_rehash(self, pwhash: str) -> bool:
+		# "scrypt:32768:8:1$salt$hash": compare the parameter prefix
+		return pwhash.split("$", 1)[0] != self._spec
+
+	def _run(self, fn: Callable, *args):
+		from . import socketio
+		if socketio.async_mode != "eventlet" or self.max_concurrent <= 0:
+			return fn(*args)  # inline on the caller (0 disables offloading)
+		from eventlet import tpool
+		slots = self._semaphore()
+		if not slots.acquire(timeout=self.queue_timeout):
+			raise HasherBusy()
+		try:
+			return tpool.execute(fn, *args)
+		finally:
+			slots.release()
+
+	def _semaphore(self):
+		if self._slots is None:
+			from eventlet.semaphore import Semaphore
+			self._slots = Semaphore(self.max_concurrent)
+		return self._slots
+
+
+class LoginRateLimiter:
+	# Per-IP sliding window over login attempts
+	def __init__(self, max_attempts: int = 10, window: float = 60.0) -> None:
+		self.max_attempts = max_attempts
+		self.window = window
+		self._windows: Dict[str, SlidingWindow] = {}
+		self._last_sweep = 0
+
+	def init_app(self, app: Flask) -> None:
+		self.max_attempts = app.config.get("LOGIN_RATE_LIMIT", self.max_attempts)
+		self.window = app.config.get("LOGIN_RATE_WINDOW", self.window)
+		app.extensions["login_limiter"] = self
+
+	def hit(self, ip: Optional[str]) -> bool:
+		# Records an attempt; False once the IP is over its limit
+		now_ns = time.monotonic_ns()
+		self._sweep(now_ns)
+		window = self._windows.get(ip)
+		if window is None:
+			window = self._windows[ip] = SlidingWindow(self.window)
+		window.evict(now_ns)
+		if len(window) >= self.max_attempts:
+			return False
+		window.add(now_ns)
+		return True
+
+	def _sweep(self, now_ns: int) -> None:
+		if now_ns - self._last_sweep < self.window * 1e9:
+			return
+		self._last_sweep = now_ns
+		for ip in list(self._windows):
+			window = self._windows[ip]
+			window.evict(now_ns)
+			if not len(window):
+				del self._windows[ip]
@@ -0,0 +1,246 @@
+from __future__ import annotations
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from typing import Callable, Dict, IO, Iterator, List, Optional, Sequence, Tuple
+from flask import current_app
+from sqlalchemy import func, insert
+from .models import db, Auction, AuctionPlayer, Player
+from .valuation import STAT_KEYS
+
+FORMATS = ("csv", "ndjson")
+MAX_ERRORS = 200  # further bad rows are counted but not itemized
+
+ROLE_ALIASES = {
+	"batter": "Batter", "batsman": "Batter", "bat": "Batter",
+	"bowler": "Bowler", "bowl": "Bowler",
+	"all-rounder": "All-Rounder", "allrounder": "All-Rounder", "all rounder": "All-Rounder", "ar": "All-Rounder",
+	"wicketkeeper": "Wicketkeeper", "wicket-keeper": "Wicketkeeper", "wicket keeper": "Wicketkeeper", "keeper": "Wicketkeeper", "wk": "Wicketkeeper",
+}
+
+# Lots are called set by set, in this order; a player goes into the first set
+# they match and each set runs from the highest base price down. Keys a set
+# may use: marquee (bool), role, min_price, max_price. Override per app with
+# AUCTION_ORDER_SETS.
+DEFAULT_ORDER_SETS: List[dict] = [
+	{"name": "Marquee", "marquee": True},
+	{"name": "Capped Batters", "role": "Batter", "min_price": 10000000},
+	{"name": "Capped All-Rounders", "role": "All-Rounder", "min_price": 10000000},
+	{"name": "Capped Wicketkeepers", "role": "Wicketkeeper", "min_price": 10000000},
+	{"name": "Capped Bowlers", "role": "Bowler", "min_price": 10000000},
+	{"name": "Batters", "role": "Batter"},
+	{"name": "All-Rounders", "role": "All-Rounder"},
+	{"name": "Wicketkeepers", "role": "Wicketkeeper"},
+	{"name": "Bowlers", "role": "Bowler"},
+]
+
+
+@dataclass
+class ImportReport:
+	read: int = 0
+	inserted: int = 0
+	reused: int = 0  # already in the players table; linked, not re-inserted
+	duplicates: int = 0  # repeated within the file
+	pooled: int = 0  # AuctionPlayer rows created
+	already_pooled: int = 0
+	invalid: int = 0
+	errors: List[Tuple[int, str]] = field(default_factory=list)
+	sets: Dict[str, int] = field(default_factory=dict)
+
+	def summary(self) -> str:
+		return (
+			f"{self.read} rows: {self.inserted} new players, {self.reused} existing, "
+			f"{self.duplicates} duplicates, {self.invalid} invalid; {self.pooled} added to auction"
+		)
+
+
+def _truthy(value) -> bool:
+	if isinstance(value, str):
+		return value.strip().lower() in ("1", "true", "yes", "y")
+	return bool(value)
+
+
+def normalize(raw: dict) -> dict:
+	# Raises ValueError with a message fit for the report
+	name = (raw.get("name") or "").strip()
+	if not name:
+		raise ValueError("missing name")
+	role = ROLE_ALIASES.get((raw.get("role") or "").strip().lower())
+	if role is None:
+		raise ValueError(f"unknown role {raw.get('role')!r}")
+	try:
+		base_price = int(float(raw.get("base_price") or 1000000))
+	except (TypeError, ValueError):
+		raise ValueError(f"bad base_price {raw.get('base_price')!r}")
+	if base_price <= 0:
+		raise ValueError("base_price must be positive")
+	# Stats as a nested object (NDJSON) or flat columns (CSV)
+	source = raw.get("stats") if isinstance(raw.get("stats"), dict) else raw
+	stats = {}
+	for key in STAT_KEYS:
+		value = source.get(key)
+		try:
+			stats[key] = (float(value) if key in ("strike_rate", "economy") else int(float(value))) if value not in (None, "") else 0
+		except (TypeError, ValueError):
+			raise ValueError(f"bad {key} {value!r}")
+	return {
+		"name": name,
+		"role": role,
+		"base_price": base_price,
+		"stats_json": stats,
+		"highlight_url": (raw.get("highlight_url") or "").strip() or None,
+		"marquee": _truthy(raw.get("marquee")),
+	}
+
+
+def _dedup_key(name: str, role: str) -> Tuple[str, str]:
+	return " ".join(name.split()).casefold(), role
+
+
+def assign_sets(players: Sequence[dict], sets: Sequence[dict]) -> List[Tuple[str, List[dict]]]:
+	groups: Dict[str, List[dict]] = {s["name"]: [] for s in sets}
+	rest: List[dict] = []
+	for p in players:
+		for s in sets:
+			if "marquee" in s and bool(s["marquee"]) != p["marquee"]:
+				continue
+			if "role" in s and s["role"] != p["role"]:
+				continue
+			if p["base_price"] < s.get("min_price", 0):
+				continue
+			if "max_price" in s and p["base_price"] > s["max_price"]:
+				continue
+			groups[s["name"]].append(p)
+			break
+		else:
+			rest.append(p)
+	ordered = [(s["name"], groups[s["name"]]) for s in sets]
+	ordered.append(("Others", rest))
+	for _, members in ordered:
+		members.sort(key=lambda p: (-p["base_price"], p["name"].casefold()))
+	return [(name, members) for name, members in ordered if members]
+
+
+def import_players(
+	stream: IO[str],
+	fmt: str,
+	auction_id: Optional[int] = None,
+	sets: Optional[Sequence[dict]] = None,
+	batch_size: int = 1000,
+	progress: Optional[Callable[[str, int, int], None]] = None,
+) -> ImportReport:
+	# Validate and dedupe the whole file, insert new players and (optionally)
+	# the auction pool with batched executemany INSERTs, commit once. Raises
+	# ValueError, before anything is written, if the auction doesn't exist.
+	from .valuation import load_market, stats_matrix, valuate
+	import numpy as np
+
+	if auction_id is not None and Auction.query.get(auction_id) is None:
+		raise ValueError(f"no auction with id {auction_id}")
+	report = ImportReport()
+	progress = progress or (lambda stage, done, total: None)
+	if sets is None:
+		sets = current_app.config.get("AUCTION_ORDER_SETS") or DEFAULT_ORDER_SETS
+
+	# 1. Parse, validate, dedupe within the file
+	players: List[dict] = []
+	seen = set()
+	for line_no, raw in _numbered(stream, fmt):
+		report.read += 1
+		try:
+			if raw is None:
+				raise ValueError("not a JSON object")
+			p = normalize(raw)
+		except ValueError as exc:
+			report.invalid += 1
+			if len(report.errors) < MAX_ERRORS:
+				report.errors.append((line_no, str(exc)))
+			continue
+		key = _dedup_key(p["name"], p["role"])
+		if key in seen:
+			report.duplicates += 1
+			continue
+		seen.add(key)
+		p["key"] = key
+		players.append(p)
+	progress("parsed", report.read, report.read)
+
+	# 2. Match against players already in the DB (one query)
+	existing: Dict[Tuple[str, str], int] = {}
+	for pid, name, role in db.session.query(Player.id, Player.name, Player.role):
+		existing.setdefault(_dedup_key(name, role), pid)
+	new = [p for p in players if p["key"] not in existing]
+	for p in players:
+		p["id"] = existing.get(p["key"])
+	report.reused = len(players) - len(new)
+
+	# 3. Bulk insert new players, valued in one vectorized pass
+	if new:
+		values = valuate(
+			stats_matrix([p["stats_json"] for p in new]),
+			[p["role"] for p in new],
+			np.array([p["base_price"] for p in new], dtype=np.int64),
+			load_market(),
+		).tolist()
+		stmt = insert(Player).returning(Player.id, sort_by_parameter_order=True)
+		for start in range(0, len(new), batch_size):
+			batch = new[start:start + batch_size]
+			rows = [{
+				"name": p["name"],
+				"role": p["role"],
+				"base_price": p["base_price"],
+				"stats_json": p["stats_json"],
+				"highlight_url": p["highlight_url"],
+				"ai_valuation": values[start + i],
+				"approved": True,
+			} for i, p in enumerate(batch)]
+			for p, pid in zip(batch, db.session.scalars(stmt, rows)):
+				p["id"] = pid
+			report.inserted += len(batch)
+			progress("players", report.inserted, len(new))
+
+	# 4. Auction pool, ordered by set
+	if auction_id is not None:
+		pooled = {pid for (pid,) in db.session.query(AuctionPlayer.player_id).filter(AuctionPlayer.auction_id == auction_id)}
+		candidates = [p for p in players if p["id"] not in pooled]
+		report.already_pooled = len(players) - len(candidates)
+		next_index = (db.session.query(func.max(AuctionPlayer.order_index)).filter(AuctionPlayer.auction_id == auction_id).scalar() or 0) + 1
+		links = []
+		for set_name, members in assign_sets(candidates, sets):
+			report.sets[set_name] = len(members)
+			for p in members:
+				links.append({"auction_id": auction_id, "player_id": p["id"], "order_index": next_index, "status": "available"})
+				next_index += 1
+		for start in range(0, len(links), batch_size):
+			db.session.execute(insert(AuctionPlayer), links[start:start + batch_size])
+			report.pooled += len(links[start:start + batch_size])
+			progress("pool", report.pooled, len(links))
+
+	db.session.commit()
+	if auction_id is not None and report.pooled:
+		from . import live_cache
+		live_cache.invalidate(auction_id)
+	return report
+
+
+def _numbered(stream: IO[str], fmt: str) -> Iterator[Tuple[int, dict]]:
+	# (source line number, raw row); unparseable NDJSON lines come back as None
+	if fmt == "csv":
+		reader = csv.DictReader(stream)
+		for row in reader:
+			yield reader.line_num, row
+	else:
+		for line_no, line in enumerate(stream, 1):
+			if not line.strip():
+				continue
+			try:
+				row = json.loads(line)
+			except ValueError:
+				row = None
+			yield line_no, row if isinstance(row, dict) else None
+
+
+def text_stream(binary: IO[bytes]) -> IO[str]:
+	# Uploaded files arrive as bytes; tolerate a UTF-8 BOM from spreadsheet exports
+	return io.TextIOWrapper(binary, encoding="utf-8-sig", newline="")
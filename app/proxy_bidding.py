@@ -0,0 +1,46 @@
+from __future__ import annotations
+import heapq
+from typing import Dict, List, Tuple
+
+
+def resolve_proxy_bids(
+	current_amount: int,
+	leader_team_id: int,
+	min_increment: int,
+	auto_bids: Dict[int, int],
+	budgets: Dict[int, int],
+) -> List[Tuple[int, int]]:
+	# Closed-form outcome of the auto-bid war that a new high bid triggers,
+	# instead of replaying it one increment at a time. Returns the bids to
+	# record in order: at most the runner-up's last bid and the winner's bid.
+	#
+	# auto_bids iterates in registration order (earliest first), which breaks
+	# ties between equal limits. A proxy is capped by its team's budget;
+	# teams absent from budgets (unapproved or unknown) cannot auto-bid.
+	floor = current_amount + min_increment
+	candidates = []
+	for seq, (team_id, max_limit) in enumerate(auto_bids.items()):
+		limit = min(max_limit, budgets.get(team_id, 0))
+		if team_id == leader_team_id:
+			limit = max(limit, current_amount)
+		elif limit < floor:
+			continue
+		candidates.append((-limit, seq, team_id))
+	if leader_team_id not in auto_bids:
+		candidates.append((-current_amount, -1, leader_team_id))
+
+	# Only the two best limits matter: O(n) selection over all proxies
+	top = heapq.nsmallest(2, candidates)
+	if len(top) < 2:
+		return []
+	(neg_win, _, winner), (neg_run, _, runner) = top
+	win_limit, run_limit = -neg_win, -neg_run
+
+	# Runner-up goes as high as it can while leaving the winner a legal raise
+	runner_bid = min(run_limit, win_limit - min_increment)
+	price = min(win_limit, run_limit + min_increment)
+	bids = []
+	if runner_bid >= floor:
+		bids.append((runner, runner_bid))
+	bids.append((winner, price))
+	return bids
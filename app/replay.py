@@ -0,0 +1,107 @@
+from __future__ import annotations
+from datetime import datetime
+from itertools import groupby
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import tuple_
+from .models import db, AuctionPlayer, Bid, PlayerTimeline
+
+MAX_PRICE_STEPS = 500  # longer bidding wars are thinned evenly, keeping the last step
+PAGE_LIMIT = 500
+
+
+def _fill(timeline: PlayerTimeline, ap: AuctionPlayer, rows: Iterable[Tuple[datetime, int, int]], closed_at: Optional[datetime] = None) -> None:
+	# rows: (timestamp, amount, team_id) for one lot in time order
+	steps: List[list] = []
+	opened_at = last_ts = None
+	count = 0
+	for ts, amount, team_id in rows:
+		if opened_at is None:
+			opened_at = ts
+		steps.append([int((ts - opened_at).total_seconds() * 1000), amount, team_id])
+		last_ts = ts
+		count += 1
+	if len(steps) > MAX_PRICE_STEPS:
+		stride = len(steps) / (MAX_PRICE_STEPS - 1)
+		steps = [steps[int(i * stride)] for i in range(MAX_PRICE_STEPS - 1)] + [steps[-1]]
+	timeline.auction_player_id = ap.id
+	timeline.status = ap.status
+	timeline.sold_to_team_id = ap.sold_to_team_id
+	timeline.final_price = ap.final_price
+	timeline.opened_at = opened_at
+	timeline.closed_at = closed_at or last_ts
+	timeline.bid_count = count
+	timeline.opening_bid = steps[0][1] if steps else None
+	timeline.price_steps = steps
+
+
+def _timeline_for(ap: AuctionPlayer) -> PlayerTimeline:
+	timeline = PlayerTimeline.query.filter_by(auction_id=ap.auction_id, player_id=ap.player_id).first()
+	if timeline is None:
+		timeline = PlayerTimeline(auction_id=ap.auction_id, player_id=ap.player_id)
+		db.session.add(timeline)
+	return timeline
+
+
+def materialize_timeline(ap: AuctionPlayer, closed_at: Optional[datetime] = None) -> PlayerTimeline:
+	# Called by finalize_sale; the caller commits
+	rows = (
+		db.session.query(Bid.timestamp, Bid.amount, Bid.team_id)
+		.filter(Bid.auction_id == ap.auction_id, Bid.player_id == ap.player_id)
+		.order_by(Bid.timestamp.asc(), Bid.id.asc())
+	)
+	timeline = _timeline_for(ap)
+	_fill(timeline, ap, rows, closed_at)
+	return timeline
+
+
+def build_timelines(auction_id: int) -> int:
+	# Backfill for auctions that closed lots before timelines existed: one
+	# streamed pass over the auction's bids in (player, time) order.
+	aps = {
+		ap.player_id: ap
+		for ap in AuctionPlayer.query.filter(AuctionPlayer.auction_id == auction_id, AuctionPlayer.status != "available")
+	}
+	rows = (
+		db.session.query(Bid.player_id, Bid.timestamp, Bid.amount, Bid.team_id)
+		.filter(Bid.auction_id == auction_id)
+		.order_by(Bid.player_id.asc(), Bid.timestamp.asc(), Bid.id.asc())
+		.yield_per(2000)
+	)
+	built = set()
+	for player_id, group in groupby(rows, key=lambda r: r[0]):
+		ap = aps.get(player_id)
+		if ap is None:
+			continue
+		_fill(_timeline_for(ap), ap, ((ts, amount, team_id) for _, ts, amount, team_id in group))
+		built.add(player_id)
+	# Lots that closed without a single bid
+	for player_id, ap in aps.items():
+		if player_id not in built:
+			_fill(_timeline_for(ap), ap, ())
+	db.session.commit()
+	return len(aps)
+
+
+def encode_cursor(ts: datetime, bid_id: int) -> str:
+	return f"{ts.isoformat()}|{bid_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+	ts, _, bid_id = cursor.rpartition("|")
+	return datetime.fromisoformat(ts), int(bid_id)
+
+
+def bid_page(auction_id: int, player_id: int, cursor: Optional[str] = None, limit: int = PAGE_LIMIT) -> Tuple[List[dict], Optional[str]]:
+	# Keyset page of one lot's bids, served from ix_bids_auction_player_ts;
+	# cost does not grow with how deep into the lot the client has paged.
+	limit = max(1, min(limit, PAGE_LIMIT))
+	q = (
+		db.session.query(Bid.id, Bid.timestamp, Bid.team_id, Bid.amount)
+		.filter(Bid.auction_id == auction_id, Bid.player_id == player_id)
+	)
+	if cursor:
+		q = q.filter(tuple_(Bid.timestamp, Bid.id) > decode_cursor(cursor))
+	rows = q.order_by(Bid.timestamp.asc(), Bid.id.asc()).limit(limit + 1).all()
+	next_cursor = encode_cursor(rows[limit - 1].timestamp, rows[limit - 1].id) if len(rows) > limit else None
+	bids = [{"id": r.id, "timestamp": r.timestamp.isoformat(), "team_id": r.team_id, "amount": r.amount} for r in rows[:limit]]
+	return bids, next_cursor
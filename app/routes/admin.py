@@ -1,8 +1,9 @@
 from datetime import datetime
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import Blueprint, Response, abort, current_app, jsonify, render_template, request, redirect, stream_with_context, url_for, flash
 from flask_login import login_required, current_user
 from ..models import db, User, Team, Player, Auction, AuctionPlayer
-from .. import socketio
+from .. import socketio, budget_ledger, live_cache, auction_runner, entity_cache, leaderboard, lobby
+from ..exports import DATASETS, FORMATS, stream_export
 
 admin_bp = Blueprint("admin", __name__)
 
@@ -23,10 +24,78 @@ def check_admin():
 @admin_bp.route("/dashboard", methods=["GET"]) 
 @login_required
 def dashboard():
-	auctions = Auction.query.order_by(Auction.scheduled_at.desc()).all()
-	pending_teams = Team.query.filter_by(approved=False).all()
-	pending_players = Player.query.filter_by(approved=False).all()
-	return render_template("admin/dashboard.html", auctions=auctions, pending_teams=pending_teams, pending_players=pending_players)
+	from .. import admin_lists
+	args = request.args
+	search = _player_search_args()
+	return render_template(
+		"admin/dashboard.html",
+		counts=admin_lists.counts(),
+		auctions=_page_or_first(admin_lists.auction_page, args.get("auctions_after")),
+		pending_teams=_page_or_first(admin_lists.pending_team_page, args.get("teams_after")),
+		players=_page_or_first(admin_lists.player_page, args.get("players_after"), **search),
+		search=args.to_dict(),
+		open_auctions=Auction.query.with_entities(Auction.id, Auction.name).filter(Auction.status != "ended").order_by(Auction.scheduled_at.desc()).limit(200).all(),
+	)
+
+
+def _page_or_first(page, cursor, **kwargs):
+	# A stale or hand-edited cursor shows the first page rather than a 500
+	try:
+		return page(cursor=cursor, **kwargs)
+	except ValueError:
+		return page(**kwargs)
+
+
+def _player_search_args() -> dict:
+	args = request.args
+	status = args.get("status", "pending")
+	return {
+		"q": args.get("q") or None,
+		"role": args.get("role") or None,
+		"min_price": args.get("min_price", type=int),
+		"max_price": args.get("max_price", type=int),
+		"approved": {"pending": False, "approved": True}.get(status),
+	}
+
+
+@admin_bp.route("/players/search", methods=["GET"])
+@login_required
+def search_players():
+	from .. import admin_lists
+	try:
+		page = admin_lists.player_page(cursor=request.args.get("cursor"), limit=request.args.get("limit", admin_lists.PAGE_SIZE, type=int), **_player_search_args())
+	except ValueError:
+		return jsonify({"error": "invalid cursor"}), 400
+	return jsonify({"players": [dict(r._mapping) for r in page.items], "next_cursor": page.next_cursor})
+
+
+@admin_bp.route("/players/bulk", methods=["POST"])
+@login_required
+def bulk_players():
+	from .. import admin_lists
+	ids = request.form.getlist("ids")
+	if request.form.get("action") == "reject":
+		flash(f"Rejected {admin_lists.reject_players(ids)} players", "success")
+	else:
+		flash(f"Approved {admin_lists.approve_players(ids)} players", "success")
+	return redirect(url_for("admin.dashboard", **request.args))
+
+
+@admin_bp.route("/teams/bulk", methods=["POST"])
+@login_required
+def bulk_teams():
+	from .. import admin_lists
+	ids = request.form.getlist("ids")
+	if request.form.get("action") == "reject":
+		flash(f"Rejected {admin_lists.reject_teams(ids)} teams", "success")
+	else:
+		approved = admin_lists.approve_teams(ids)
+		for team_id in approved:
+			budget_ledger.invalidate(team_id)
+		flash(f"Approved {len(approved)} teams", "success")
+	live_cache.invalidate_teams()
+	leaderboard.invalidate()
+	return redirect(url_for("admin.dashboard", **request.args))
 
 
 @admin_bp.route("/create_auction", methods=["POST"]) 
@@ -42,6 +111,7 @@ def create_auction():
 	auction = Auction(name=name, scheduled_at=scheduled_at, budget_per_team=budget, status="scheduled", created_by_id=current_user.id)
 	db.session.add(auction)
 	db.session.commit()
+	lobby.auctions_changed()
 	flash("Auction created", "success")
 	return redirect(url_for("admin.dashboard"))
 
@@ -53,6 +123,9 @@ def approve_team(team_id):
 	team.approved = True
 	team.budget_remaining = team.budget_total
 	db.session.commit()
+	budget_ledger.invalidate(team.id)
+	live_cache.invalidate_teams()
+	leaderboard.invalidate()
 	flash("Team approved", "success")
 	return redirect(url_for("admin.dashboard"))
 
@@ -67,6 +140,15 @@ def approve_player(player_id):
 	return redirect(url_for("admin.dashboard"))
 
 
+@admin_bp.route("/revalue_players", methods=["POST"])
+@login_required
+def revalue_players():
+	from ..valuation import revalue_all
+	checked, updated = revalue_all()
+	flash(f"Re-valued {checked} players ({updated} changed)", "success")
+	return redirect(url_for("admin.dashboard"))
+
+
 @admin_bp.route("/add_player_to_auction", methods=["POST"]) 
 @login_required
 def add_player_to_auction():
@@ -76,10 +158,35 @@ def add_player_to_auction():
 	ap = AuctionPlayer(auction_id=auction_id, player_id=player_id, order_index=order_index)
 	db.session.add(ap)
 	db.session.commit()
+	live_cache.invalidate(auction_id)
 	flash("Player added to auction", "success")
 	return redirect(url_for("admin.dashboard"))
 
 
+@admin_bp.route("/import_players", methods=["POST"])
+@login_required
+def import_players():
+	from ..player_import import FORMATS, import_players as run_import, text_stream
+	upload = request.files.get("file")
+	auction_id = request.form.get("auction_id", type=int)
+	fmt = (upload.filename.rsplit(".", 1)[-1].lower() if upload and upload.filename else "")
+	if fmt == "jsonl":
+		fmt = "ndjson"
+	if not upload or fmt not in FORMATS:
+		flash("Upload a .csv or .ndjson file", "error")
+		return redirect(url_for("admin.dashboard"))
+	try:
+		report = run_import(text_stream(upload.stream), fmt, auction_id=auction_id)
+	except ValueError as exc:
+		flash(f"Import failed: {exc}", "error")
+		return redirect(url_for("admin.dashboard"))
+	current_app.logger.info("Player import: %s", report.summary())
+	flash(f"Imported {report.summary()}", "success")
+	for line_no, message in report.errors[:10]:
+		flash(f"Line {line_no}: {message}", "error")
+	return redirect(url_for("admin.dashboard"))
+
+
 @admin_bp.route("/start_player", methods=["POST"]) 
 @login_required
 def start_player():
@@ -90,28 +197,66 @@ def start_player():
 	min_inc = int(request.form.get("min_increment", 100000))
 
 	# Start via server-side handler to set timers & state
-	on_start_player({"auction_id": auction_id, "auction_player_id": ap_id, "duration": duration, "min_increment": min_inc})
+	ack = on_start_player({"auction_id": auction_id, "auction_player_id": ap_id, "duration": duration, "min_increment": min_inc})
+	if not ack["ok"]:
+		flash("The last lot is still closing; start the next one in a moment", "error")
+	return redirect(url_for("admin.dashboard"))
+
+
+@admin_bp.route("/runner/<int:auction_id>/<action>", methods=["POST"])
+@login_required
+def control_runner(auction_id, action):
+	if action == "start":
+		if auction_runner.get(auction_id) is not None:
+			flash("Auction runner is already running", "error")
+			return redirect(url_for("admin.dashboard"))
+		auction_runner.start(
+			auction_id,
+			duration=request.form.get("duration", 30, type=int),
+			gap=request.form.get("gap", 3, type=float),
+			min_increment=request.form.get("min_increment", 100000, type=int),
+			unsold_round=request.form.get("unsold_round", "1") == "1",
+			unsold_duration=request.form.get("unsold_duration", 15, type=int),
+		)
+	elif action in ("pause", "resume", "skip", "stop"):
+		getattr(auction_runner, action)(auction_id)
+	else:
+		abort(404)
+	flash(f"Auction runner: {action}", "success")
 	return redirect(url_for("admin.dashboard"))
 
 
+@admin_bp.route("/cache/stats")
+@login_required
+def cache_stats():
+	return jsonify(entity_cache.stats())
+
+
+def _export_response(dataset, fmt, auction_ids, filename, with_auction):
+	if dataset not in DATASETS or fmt not in FORMATS:
+		abort(404)
+	return Response(
+		stream_with_context(stream_export(dataset, fmt, auction_ids, with_auction=with_auction)),
+		mimetype=FORMATS[fmt],
+		headers={"Content-Disposition": f"attachment; filename={filename}.{fmt}"},
+	)
+
+
 @admin_bp.route("/export/teams/<int:auction_id>.csv")
 @login_required
 def export_teams_csv(auction_id):
-	import csv
-	from io import StringIO
-	aps = AuctionPlayer.query.filter_by(auction_id=auction_id, status='sold').all()
-	buf = StringIO()
-	writer = csv.writer(buf)
-	writer.writerow(["Team", "Player", "Role", "Final Price"])
-	for ap in aps:
-		team = ap.sold_to_team
-		player = ap.player
-		writer.writerow([
-			team.name if team else '',
-			player.name if player else '',
-			player.role if player else '',
-			ap.final_price or 0,
-		])
-	buf.seek(0)
-	from flask import Response
-	return Response(buf.read(), mimetype='text/csv', headers={'Content-Disposition': f'attachment; filename=auction_{auction_id}_teams.csv'})
\ No newline at end of file
+	return _export_response("squads", "csv", [auction_id], f"auction_{auction_id}_teams", with_auction=False)
+
+
+@admin_bp.route("/export/<dataset>/<int:auction_id>.<fmt>")
+@login_required
+def export_auction(dataset, auction_id, fmt):
+	return _export_response(dataset, fmt, [auction_id], f"auction_{auction_id}_{dataset}", with_auction=False)
+
+
+@admin_bp.route("/export/<dataset>/season.<fmt>")
+@login_required
+def export_season(dataset, fmt):
+	# Season-end report across several auctions (?auction_id=1&auction_id=2), or all
+	auction_ids = request.args.getlist("auction_id", type=int) or None
+	return _export_response(dataset, fmt, auction_ids, f"season_{dataset}", with_auction=True)
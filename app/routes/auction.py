@@ -1,41 +1,98 @@
-from flask import Blueprint, render_template, request
+from flask import Blueprint, Response, abort, render_template, request, jsonify
 from flask_login import current_user
-from ..models import Auction, AuctionPlayer, Team, Player, Bid
+from sqlalchemy.orm import joinedload
+from ..models import Auction, AuctionPlayer, Team, Player, Bid, PlayerTimeline
+from ..replay import bid_page, build_timelines
+from .. import entity_cache, leaderboard, live_cache
 
 auction_bp = Blueprint("auction", __name__)
 
 
+def _conditional(body, etag: str, mimetype: str = "text/html"):
+	# Revalidate on every load, but skip the body when the client is current
+	if request.if_none_match.contains(etag):
+		resp = Response(status=304)
+	else:
+		resp = Response(body, mimetype=mimetype)
+	resp.set_etag(etag)
+	resp.headers["Cache-Control"] = "private, no-cache"
+	return resp
+
+
+def _auction_or_404(auction_id):
+	auction = entity_cache.auction(auction_id)
+	if auction is None:
+		abort(404)
+	return auction
+
+
 @auction_bp.route("/live/<int:auction_id>")
 def live(auction_id):
-	auction = Auction.query.get_or_404(auction_id)
-	teams = Team.query.filter_by(approved=True).all()
-	aps = AuctionPlayer.query.filter_by(auction_id=auction_id).order_by(AuctionPlayer.order_index.asc()).all()
-	players_json = []
-	for ap in aps:
-		players_json.append({
-			"id": ap.id,
-			"player_id": ap.player_id,
-			"status": ap.status,
-			"order_index": ap.order_index,
-			"player": {
-				"id": ap.player.id if ap.player else None,
-				"name": ap.player.name if ap.player else None,
-				"role": ap.player.role if ap.player else None,
-				"base_price": ap.player.base_price if ap.player else 0,
-				"highlight_url": ap.player.highlight_url if ap.player else None,
-			}
-		})
-	teams_json = [{
-		"id": t.id,
-		"name": t.name,
-		"budget_total": t.budget_total,
-		"budget_remaining": t.budget_remaining
-	} for t in teams]
-	return render_template("auction/live.html", auction=auction, teams=teams, players_json=players_json, teams_json=teams_json, user=current_user if current_user.is_authenticated else None)
+	auction = _auction_or_404(auction_id)
+	etag, bootstrap = live_cache.get(auction_id)
+	user = current_user if current_user.is_authenticated else None
+	# The page also embeds the viewer's team, so the ETag is per user
+	page_etag = f"{etag}-{user.id if user else 'anon'}"
+	if request.if_none_match.contains(page_etag):
+		return _conditional(None, page_etag)
+	return _conditional(render_template("auction/live.html", auction=auction, bootstrap=bootstrap, user=user), page_etag)
+
+
+@auction_bp.route("/live/<int:auction_id>/bootstrap")
+def live_bootstrap(auction_id):
+	_auction_or_404(auction_id)
+	etag, bootstrap = live_cache.get(auction_id)
+	return _conditional(str(bootstrap), etag, mimetype="application/json")
+
+
+@auction_bp.route("/live/<int:auction_id>/leaderboard")
+def live_leaderboard(auction_id):
+	_auction_or_404(auction_id)
+	etag, body = leaderboard.get(auction_id)
+	return _conditional(body, etag, mimetype="application/json")
+
+
+def _timelines(auction_id):
+	return (
+		PlayerTimeline.query.filter_by(auction_id=auction_id)
+		.options(joinedload(PlayerTimeline.player))
+		.order_by(PlayerTimeline.closed_at.asc())
+		.all()
+	)
 
 
 @auction_bp.route("/replay/<int:auction_id>")
 def replay(auction_id):
-	auction = Auction.query.get_or_404(auction_id)
-	bids = Bid.query.filter_by(auction_id=auction_id).order_by(Bid.timestamp.asc()).all()
-	return render_template("auction/replay.html", auction=auction, bids=bids)
\ No newline at end of file
+	auction = _auction_or_404(auction_id)
+	timelines = _timelines(auction_id)
+	if not timelines and AuctionPlayer.query.filter(AuctionPlayer.auction_id == auction_id, AuctionPlayer.status != "available").first():
+		# Lots closed before timelines were materialized: backfill once
+		build_timelines(auction_id)
+		timelines = _timelines(auction_id)
+	lots = [{
+		"player_id": t.player_id,
+		"name": t.player.name if t.player else None,
+		"role": t.player.role if t.player else None,
+		"status": t.status,
+		"sold_to_team_id": t.sold_to_team_id,
+		"final_price": t.final_price,
+		"opening_bid": t.opening_bid,
+		"bid_count": t.bid_count,
+		"opened_at": t.opened_at.isoformat() if t.opened_at else None,
+		"closed_at": t.closed_at.isoformat() if t.closed_at else None,
+		"price_steps": t.price_steps or [],
+	} for t in timelines]
+	return render_template("auction/replay.html", auction=auction, lots=lots)
+
+
+@auction_bp.route("/replay/<int:auction_id>/bids")
+def replay_bids(auction_id):
+	player_id = request.args.get("player_id", type=int)
+	if player_id is None:
+		return jsonify({"error": "player_id is required"}), 400
+	try:
+		bids, next_cursor = bid_page(auction_id, player_id, request.args.get("cursor"), request.args.get("limit", 500, type=int))
+	except ValueError:
+		# decode_cursor() on a cursor we didn't issue
+		return jsonify({"error": "invalid cursor"}), 400
+	return jsonify({"bids": bids, "next_cursor": next_cursor})
\ No newline at end of file
@@ -1,6 +1,8 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 from flask_login import login_user, logout_user, login_required, current_user
+from .. import login_limiter, password_hasher
 from ..models import db, User
+from ..passwords import HasherBusy
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -19,8 +21,14 @@ def register():
 			flash("User already exists", "error")
 			return render_template("auth/register.html")
 
+		# Don't hold a pooled DB connection while the hash runs
+		db.session.rollback()
 		user = User(username=username, email=email, role=role)
-		user.set_password(password)
+		try:
+			user.set_password(password)
+		except HasherBusy:
+			flash("The server is busy, please try again in a moment", "error")
+			return render_template("auth/register.html"), 503
 		db.session.add(user)
 		db.session.commit()
 		flash("Registration successful. Please login.", "success")
@@ -31,10 +39,25 @@ def register():
 @auth_bp.route("/login", methods=["GET", "POST"])
 def login():
 	if request.method == "POST":
+		if not login_limiter.hit(request.remote_addr):
+			flash("Too many login attempts, please wait a minute", "error")
+			return render_template("auth/login.html"), 429
 		username = request.form.get("username")
-		password = request.form.get("password")
+		password = request.form.get("password") or ""
 		user = User.query.filter_by(username=username).first()
-		if not user or not user.check_password(password):
+		pwhash = user.password_hash if user else None
+		# Don't hold a pooled DB connection while the hash runs
+		db.session.rollback()
+		try:
+			ok = bool(pwhash) and password_hasher.check(pwhash, password)
+			if ok and password_hasher.needs_rehash(pwhash):
+				# Hashed with older parameters: upgrade while we have the password
+				user.password_hash = password_hasher.hash(password)
+				db.session.commit()
+		except HasherBusy:
+			flash("The server is busy, please try again in a moment", "error")
+			return render_template("auth/login.html"), 503
+		if not ok:
 			flash("Invalid credentials", "error")
 			return render_template("auth/login.html")
 		login_user(user, remember=True)
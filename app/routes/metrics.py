@@ -0,0 +1,22 @@
+import hmac
+from flask import Blueprint, Response, abort, current_app, request
+from flask_login import current_user
+from .. import metrics
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+def _authorized() -> bool:
+	if current_user.is_authenticated and current_user.role == "admin":
+		return True
+	# Prometheus cannot log in; it sends the shared token instead
+	token = current_app.config.get("METRICS_TOKEN")
+	header = request.headers.get("Authorization", "")
+	return bool(token) and hmac.compare_digest(header, f"Bearer {token}")
+
+
+@metrics_bp.route("/metrics")
+def metrics_text():
+	if not _authorized():
+		abort(403)
+	return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
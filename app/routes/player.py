@@ -1,6 +1,7 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 from flask_login import login_required, current_user
 from ..models import db, Player
+from ..valuation import estimate_valuation
 
 player_bp = Blueprint("player", __name__)
 
@@ -23,19 +24,7 @@ def register_player():
 			"strike_rate": float(request.form.get("strike_rate", 0) or 0),
 			"economy": float(request.form.get("economy", 0) or 0),
 		}
-		# Simple AI valuation heuristic (placeholder):
-		def estimate_valuation(stats):
-			matches = stats.get("matches", 0)
-			runs = stats.get("runs", 0)
-			wickets = stats.get("wickets", 0)
-			strike = stats.get("strike_rate", 0.0)
-			economy = stats.get("economy", 0.0)
-			bat_score = runs * (strike/100.0)
-			bowl_score = wickets * (6.0 / max(1.0, economy))
-			score = bat_score * 5000 + bowl_score * 15000 + matches * 10000
-			return int(max(base_price, min(score, base_price * 50)))
-
-		ai_val = estimate_valuation(stats)
+		ai_val = estimate_valuation(stats, role, base_price, player.id if player is not None else None)
 
 		if player is None:
 			player = Player(user_id=current_user.id, name=name, role=role, base_price=base_price, highlight_url=highlight_url, stats_json=stats, ai_valuation=ai_val)
@@ -1,10 +1,34 @@
-from flask import Blueprint, render_template
-from ..models import Auction
+from flask import Blueprint, Response, jsonify, render_template, request, session
+from .. import lobby
 
 spectator_bp = Blueprint("spectator", __name__)
 
+# Browsers and proxies may reuse the lobby for this long; the list itself
+# only changes on auction and lot transitions
+LOBBY_MAX_AGE = 5
+
+
+def _cached(resp: Response, etag: str) -> Response:
+	resp.set_etag(etag)
+	resp.headers["Cache-Control"] = f"public, max-age={LOBBY_MAX_AGE}"
+	return resp
+
 
 @spectator_bp.route("/live")
 def live_list():
-	auctions = Auction.query.filter(Auction.status != "ended").order_by(Auction.scheduled_at.desc()).all()
-	return render_template("spectator/live_list.html", auctions=auctions)
\ No newline at end of file
+	if "_flashes" in session:
+		# A pending flash message makes this response user-specific
+		_, auctions = lobby.snapshot()
+		return render_template("spectator/live_list.html", auctions=auctions)
+	etag, body = lobby.page(lambda auctions: render_template("spectator/live_list.html", auctions=auctions))
+	if request.if_none_match.contains(etag):
+		return _cached(Response(status=304), etag)
+	return _cached(Response(body, mimetype="text/html"), etag)
+
+
+@spectator_bp.route("/live.json")
+def live_list_json():
+	etag, auctions = lobby.snapshot()
+	if request.if_none_match.contains(etag):
+		return _cached(Response(status=304), etag)
+	return _cached(jsonify({"auctions": auctions}), etag)
@@ -1,6 +1,7 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 from flask_login import login_required, current_user
 from ..models import db, Team, Auction
+from .. import budget_ledger, live_cache, leaderboard
 
 team_bp = Blueprint("team", __name__)
 
@@ -26,6 +27,9 @@ def dashboard():
 			team.budget_total = budget
 			db.session.add(team)
 		db.session.commit()
+		budget_ledger.invalidate(team.id)
+		live_cache.invalidate_teams()
+		leaderboard.invalidate()
 		flash("Team profile saved", "success")
 	auctions = Auction.query.order_by(Auction.scheduled_at.desc()).all()
 	return render_template("team/dashboard.html", team=team, auctions=auctions)
\ No newline at end of file
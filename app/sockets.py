@@ -1,36 +1,107 @@
 from __future__ import annotations
-from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from typing import Dict, Optional
-from flask import request
-from . import socketio
+import math
+from datetime import timedelta
+from typing import NamedTuple, Optional
+from flask import current_app, request
+from flask_login import current_user
+from . import socketio, clock, bid_writer, state_store, timer_wheel, fraud_engine, budget_ledger, state_journal, live_cache, fanout, metrics, auction_runner, db_executor, leaderboard, lobby
+from .fanout import auction_room, bidders_room, spectators_room
+from .lobby import LOBBY_ROOM
 from .models import db, Auction, AuctionPlayer, Bid, Team, Player
+from .proxy_bidding import resolve_proxy_bids
+from .replay import materialize_timeline
+from .state_store import AuctionState
+from .valuation import market_cache
 
 
-@dataclass
-class AuctionState:
-	auction_id: int
-	current_ap_id: Optional[int] = None
-	highest_bid_amount: int = 0
-	highest_bid_team_id: Optional[int] = None
-	bid_history: list = field(default_factory=list)
-	end_time: Optional[datetime] = None
-	min_increment: int = 100000  # 1 lakh default
-	auto_bids: Dict[int, int] = field(default_factory=dict)  # team_id -> max_limit
-	timer_running: bool = False
+# Clients count down locally from end_time; the server only resyncs them
+# with a tick on these coarse boundaries.
+TICK_INTERVAL = 10
+# A lot whose settlement fails (database unavailable) is retried with backoff
+SETTLE_RETRIES = 5
+SETTLE_RETRY_DELAY = 1.0
 
 
-_state_by_auction: Dict[int, AuctionState] = {}
+class ClosingLot(NamedTuple):
+	# The lot and high bid as they stood when bidding stopped
+	ap_id: int
+	team_id: Optional[int]
+	amount: int
 
 
 def get_state(auction_id: int) -> AuctionState:
-	if auction_id not in _state_by_auction:
-		_state_by_auction[auction_id] = AuctionState(auction_id=auction_id)
-	return _state_by_auction[auction_id]
+	return state_store.get(auction_id)
+
+
+def _remaining(state: AuctionState) -> float:
+	return (state.end_time - clock.utcnow()).total_seconds() if state.end_time else 0
+
+
+def _schedule_close(auction_id: int, delay: float) -> None:
+	timer_wheel.schedule(("close", auction_id), delay, lambda: _on_close_timer(auction_id))
+
+
+def _schedule_tick(auction_id: int, remaining: float) -> None:
+	boundary = (math.ceil(remaining / TICK_INTERVAL) - 1) * TICK_INTERVAL
+	if boundary > 0:
+		timer_wheel.schedule(("tick", auction_id), remaining - boundary, lambda: _on_tick_timer(auction_id))
+
+
+def _on_close_timer(auction_id: int) -> None:
+	state = get_state(auction_id)
+	if not state.timer_running or not state.end_time:
+		return
+	remaining = _remaining(state)
+	if remaining > 0:
+		# Extended since scheduling (possibly by another worker); wait it out
+		_schedule_close(auction_id, remaining)
+		return
+	# Only stopping the bidding runs on the wheel. Settling waits on the bid
+	# writer and a commit, and every other auction's ticks, closes and runner
+	# advances would wait behind it; each closing lot gets its own greenlet.
+	lot = _stop_bidding(auction_id)
+	if lot:
+		socketio.start_background_task(_settle_in_background, current_app._get_current_object(), auction_id, lot)
+
+
+def _settle_in_background(app, auction_id: int, lot: ClosingLot) -> None:
+	with app.app_context():
+		for attempt in range(SETTLE_RETRIES):
+			try:
+				with metrics.time(metrics.finalize_seconds):
+					_settle_and_announce(auction_id, lot)
+				return
+			except Exception:
+				app.logger.exception("Failed to close the lot in auction %s (attempt %d of %d)", auction_id, attempt + 1, SETTLE_RETRIES)
+				db.session.rollback()
+			clock.sleep(SETTLE_RETRY_DELAY * 2 ** attempt)
+		# Still journaled as closing: a restart finishes it
+		app.logger.error("Gave up closing the lot in auction %s", auction_id)
+
+
+def _on_tick_timer(auction_id: int) -> None:
+	state = get_state(auction_id)
+	if not state.timer_running or not state.end_time:
+		return
+	remaining = _remaining(state)
+	if remaining <= 0:
+		return
+	fanout.emit(auction_id, "tick", {"remaining": round(remaining), "end_time": state.end_time.isoformat()}, log=False)
+	_schedule_tick(auction_id, remaining)
+
+
+def _publish_fraud_alert(alert: dict) -> None:
+	socketio.emit("fraud_alert", alert, room="admin")
+
+
+fraud_engine.publish = _publish_fraud_alert
 
 
 @socketio.on("connect")
 def on_connect():
+	from flask_socketio import join_room
+	if current_user.is_authenticated and current_user.role == "admin":
+		join_room("admin")
 	return True
 
 
@@ -38,20 +109,87 @@ def on_connect():
 def on_join_auction(data):
 	from flask_socketio import join_room
 	auction_id = int(data.get("auction_id"))
-	join_room(f"auction:{auction_id}")
+	join_room(auction_room(auction_id))
+	# Bidders need every bid at once; spectators get coalesced frames
+	bidder = current_user.is_authenticated and current_user.role in ("team", "admin")
+	if bidder:
+		join_room(bidders_room(auction_id))
+	else:
+		join_room(spectators_room(auction_id))
+
+	# Reconnect: send only what was missed while the log still covers it
+	last_seq = data.get("last_seq")
+	if last_seq is not None and data.get("epoch") == fanout.epoch:
+		missed = fanout.events_since(auction_id, int(last_seq), bidder)
+		if missed is not None:
+			socketio.emit("resume", _resume_payload(auction_id, missed), room=request.sid)
+			return
+	snap, tail = _snapshot(auction_id, bidder)
+	socketio.emit("snapshot", snap, room=request.sid)
+	if tail is not None:
+		socketio.emit("resume", _resume_payload(auction_id, tail), room=request.sid)
+
+
+def _resume_payload(auction_id: int, events: list) -> dict:
 	state = get_state(auction_id)
-	# Send current snapshot
-	socketio.emit(
-		"snapshot",
-		{
-			"current_ap_id": state.current_ap_id,
-			"highest_bid_amount": state.highest_bid_amount,
-			"highest_bid_team_id": state.highest_bid_team_id,
-			"end_time": state.end_time.isoformat() if state.end_time else None,
-			"bid_history": state.bid_history[-30:],
-		},
-		room=request.sid,
-	)
+	return {
+		"events": events,
+		"seq": fanout.event_seq(auction_id),
+		"epoch": fanout.epoch,
+		"frame_seq": fanout.seq(auction_id),
+		"current_ap_id": state.current_ap_id,
+		"highest_bid_amount": state.highest_bid_amount,
+		"highest_bid_team_id": state.highest_bid_team_id,
+		"end_time": state.end_time.isoformat() if state.end_time else None,
+	}
+
+
+# auction_id -> (built at, snapshot). During a reconnect storm a snapshot is
+# built at most once per SNAPSHOT_MIN_INTERVAL per auction; joiners in between
+# get the cached one followed by a resume with what changed since. An
+# unchanged snapshot is reused for up to SNAPSHOT_MAX_AGE (the state store
+# may be shared with workers whose events this process doesn't see).
+_snapshots: dict = {}
+SNAPSHOT_MIN_INTERVAL = 0.25
+SNAPSHOT_MAX_AGE = 2.0
+
+
+def _snapshot(auction_id: int, bidder: bool):
+	# Returns (snapshot, events to send after it as a resume, or None)
+	now = clock.monotonic()
+	cached = _snapshots.get(auction_id)
+	if cached is not None:
+		built_at, snap = cached
+		unchanged = snap["seq"] == fanout.event_seq(auction_id) and snap["frame_seq"] == fanout.seq(auction_id)
+		if (unchanged and now - built_at < SNAPSHOT_MAX_AGE) or now - built_at < SNAPSHOT_MIN_INTERVAL:
+			missed = fanout.events_since(auction_id, snap["seq"], bidder)
+			if missed is not None:
+				return snap, (None if unchanged else missed)
+	state = get_state(auction_id)
+	snap = {
+		"current_ap_id": state.current_ap_id,
+		"highest_bid_amount": state.highest_bid_amount,
+		"highest_bid_team_id": state.highest_bid_team_id,
+		"end_time": state.end_time.isoformat() if state.end_time else None,
+		"bid_history": state.bid_history.to_wire(30),
+		"frame_seq": fanout.seq(auction_id),
+		"seq": fanout.event_seq(auction_id),
+		"epoch": fanout.epoch,
+		"next_player": auction_runner.next_card(auction_id),
+	}
+	_snapshots[auction_id] = (now, snap)
+	return snap, None
+
+
+@socketio.on("join_lobby")
+def on_join_lobby(data=None):
+	lobby.join(request.sid)
+
+
+@socketio.on("leave_lobby")
+def on_leave_lobby(data=None):
+	from flask_socketio import leave_room
+	leave_room(LOBBY_ROOM)
 
 
 @socketio.on("start_player")
@@ -62,34 +200,93 @@ def on_start_player(data):
 	min_increment = int(data.get("min_increment", 100000))
 
 	state = get_state(auction_id)
+	if _settle_pending(state):
+		# The last lot's result isn't out yet and the reset after it would
+		# wipe this one; the runner retries, an admin tries again
+		return {"ok": False, "reason": "settling"}
 	state.current_ap_id = ap_id
 	state.highest_bid_amount = 0
 	state.highest_bid_team_id = None
-	state.bid_history = []
+	state.bid_history.clear()
 	state.min_increment = min_increment
-	state.end_time = datetime.utcnow() + timedelta(seconds=duration_sec)
+	state.end_time = clock.utcnow() + timedelta(seconds=duration_sec)
 	state.timer_running = True
 	state.auto_bids = {}
-
-	socketio.emit("player_start", {"auction_player_id": ap_id, "end_time": state.end_time.isoformat()}, room=f"auction:{auction_id}")
-
-	def countdown_loop():
-		while state.timer_running and state.end_time:
-			remaining = (state.end_time - datetime.utcnow()).total_seconds()
-			if remaining <= 0:
-				break
-			# push countdown ticks every second
-			socketio.emit("tick", {"remaining": int(remaining)}, room=f"auction:{auction_id}")
-			from eventlet import sleep  # local import to avoid hard dependency when testing
-			sleep(1)
-		finalize_sale(auction_id)
-
-	from . import socketio as _s
-	_s.start_background_task(countdown_loop)
+	state_store.save(state)
+	budget_ledger.release_auction(auction_id)
+
+	fanout.reset(auction_id)
+	fanout.emit(auction_id, "player_start", {"auction_player_id": ap_id, "end_time": state.end_time.isoformat()})
+
+	# Replaces any timers left from a previous start of this auction
+	_schedule_close(auction_id, duration_sec)
+	_schedule_tick(auction_id, duration_sec)
+	state_journal.mark(auction_id)
+	lobby.lot_changed(auction_id)
+	return {"ok": True}
+
+
+def _settle_pending(state: AuctionState) -> bool:
+	# Bidding has stopped on the lot but its result hasn't been announced.
+	# Read from the shared store, so it holds for every worker.
+	return state.current_ap_id is not None and not state.timer_running
+
+
+def _record_bid(state: AuctionState, team_id: int, amount: int, player_id: int, ip: str) -> None:
+	# Accept in memory; the Bid row is group-committed by the bid writer
+	bid_writer.submit({
+		"auction_id": state.auction_id,
+		"player_id": player_id,
+		"team_id": team_id,
+		"amount": amount,
+		"timestamp": clock.utcnow(),
+		"ip_address": ip,
+	})
+	ts_ns = clock.monotonic_ns()
+	state_store.append_history(state, team_id, amount, ts_ns, ip)
+	fraud_engine.submit(state.auction_id, team_id, amount, ip, ts_ns)
+
+
+def _accept_bid(state: AuctionState, team_id: int, amount: int, player_id: int, ip: str) -> Optional[str]:
+	# Returns None if accepted, else why not. The purse is held first, atomically,
+	# so two workers can't both spend it in different auctions; then an atomic
+	# compare-and-set against the shared state: of two concurrent bids for the
+	# same increment only one wins, whichever worker received it.
+	previous = budget_ledger.try_reserve(team_id, state.auction_id, amount)
+	if previous is None:
+		return "budget"
+	if not state_store.try_accept_bid(state, team_id, amount):
+		budget_ledger.restore(team_id, state.auction_id, amount, previous)
+		return "outbid"
+	# The outbid team's high bid no longer holds its purse
+	budget_ledger.release_others(state.auction_id, team_id, amount)
+	_record_bid(state, team_id, amount, player_id, ip)
+	return None
+
+
+def _resolve_auto_bids(state: AuctionState, player_id: int) -> list:
+	if not state.auto_bids:
+		return []
+	budgets = {t: budget_ledger.available(t, state.auction_id) for t in state.auto_bids}
+	outcome = resolve_proxy_bids(state.highest_bid_amount, state.highest_bid_team_id, state.min_increment, state.auto_bids, budgets)
+	placed = []
+	for team_id, amount in outcome:
+		if _accept_bid(state, team_id, amount, player_id, None):
+			break
+		placed.append((team_id, amount))
+	return placed
 
 
 @socketio.on("place_bid")
 def on_place_bid(data):
+	# The return value is the Socket.IO ack sent back to the bidder
+	with metrics.time(metrics.bid_seconds):
+		ack = _place_bid(data)
+	metrics.count_bid("accepted" if ack["ok"] else ack["reason"])
+	return ack
+
+
+def _place_bid(data) -> dict:
 	auction_id = int(data.get("auction_id"))
 	team_id = int(data.get("team_id"))
 	amount = int(data.get("amount"))
@@ -97,65 +294,38 @@ def on_place_bid(data):
 
 	state = get_state(auction_id)
 	if not state.end_time or not state.timer_running:
-		return
+		return {"ok": False, "reason": "closed"}
 	if amount < max(state.highest_bid_amount + state.min_increment, 0):
-		return
+		return {"ok": False, "reason": "too_low"}
 
-	team: Team = Team.query.get(team_id)
-	if not team or not team.approved:
-		return
-	if team.budget_remaining is None or team.budget_remaining < amount:
-		return
-
-	# Basic fraud detection: rapid-fire bids or repeated IPs
-	last_events = state.bid_history[-5:]
-	if last_events:
-		last_ts = datetime.fromisoformat(last_events[-1]["ts"])
-		if (datetime.utcnow() - last_ts).total_seconds() < 0.5:
-			socketio.emit("commentary", {"text": "Fraud alert: rapid bids detected"}, room=f"auction:{auction_id}")
-		last_ips = [e.get("ip") for e in last_events if e.get("ip")]
-		if request.remote_addr in last_ips:
-			socketio.emit("commentary", {"text": "Fraud alert: repeated IP bids"}, room=f"auction:{auction_id}")
-
-	# Persist bid
-	bid = Bid(
-		auction_id=auction_id,
-		player_id=player_id,
-		team_id=team_id,
-		amount=amount,
-		ip_address=request.remote_addr,
-	)
-	db.session.add(bid)
-	db.session.commit()
+	# Approval and purse (net of high bids held in other auctions), no DB hit
+	if not budget_ledger.can_bid(team_id, auction_id, amount):
+		return {"ok": False, "reason": "budget"}
+	reason = _accept_bid(state, team_id, amount, player_id, request.remote_addr)
+	if reason:
+		return {"ok": False, "reason": reason}
 
-	state.highest_bid_amount = amount
-	state.highest_bid_team_id = team_id
-	state.bid_history.append({"team_id": team_id, "amount": amount, "ts": datetime.utcnow().isoformat(), "ip": request.remote_addr})
+	# Settle any auto-bid war in one step rather than increment by increment
+	auto_placed = _resolve_auto_bids(state, player_id)
+	if auto_placed:
+		text = ", ".join(f"Team {t} ₹{a:,}" for t, a in auto_placed)
+		fanout.emit(auction_id, "commentary", {"text": f"Auto-bid placed: {text}"})
 
 	# Extend timer slightly on last moments (anti-sniping)
-	remaining = (state.end_time - datetime.utcnow()).total_seconds() if state.end_time else 0
-	if remaining is not None and remaining < 5:
-		state.end_time = datetime.utcnow() + timedelta(seconds=5)
-
-	socketio.emit(
-		"bid_update",
-		{"team_id": team_id, "amount": amount, "remaining": int((state.end_time - datetime.utcnow()).total_seconds()) if state.end_time else 0},
-		room=f"auction:{auction_id}",
-	)
-
-	# Auto-bid check
-	for auto_team_id, max_limit in list(state.auto_bids.items()):
-		if auto_team_id == state.highest_bid_team_id:
-			continue
-		if max_limit >= state.highest_bid_amount + state.min_increment:
-			_auto_amount = min(max_limit, state.highest_bid_amount + state.min_increment)
-			socketio.emit("commentary", {"text": f"Auto-bid placed by Team {auto_team_id} for ₹{_auto_amount:,}"}, room=f"auction:{auction_id}")
-			on_place_bid({
-				"auction_id": auction_id,
-				"team_id": auto_team_id,
-				"amount": _auto_amount,
-				"player_id": player_id,
-			})
+	if _remaining(state) < 5:
+		state.end_time = clock.utcnow() + timedelta(seconds=5)
+		state_store.save(state, "end_time")
+		_schedule_close(auction_id, 5)
+
+	fanout.bid_update(auction_id, {
+		"team_id": state.highest_bid_team_id,
+		"amount": state.highest_bid_amount,
+		"remaining": int(_remaining(state)),
+		"end_time": state.end_time.isoformat(),
+	})
+	state_journal.mark(auction_id)
+	lobby.lot_changed(auction_id)
+	return {"ok": True, "team_id": state.highest_bid_team_id, "amount": state.highest_bid_amount}
 
 
 @socketio.on("set_auto_bid")
@@ -164,48 +334,155 @@ def on_set_auto_bid(data):
 	team_id = int(data.get("team_id"))
 	max_limit = int(data.get("max_limit"))
 	state = get_state(auction_id)
-	state.auto_bids[team_id] = max_limit
-	socketio.emit("commentary", {"text": f"Team {team_id} enabled auto-bid up to ₹{max_limit:,}"}, room=f"auction:{auction_id}")
+	state_store.set_auto_bid(state, team_id, max_limit)
+	state_journal.mark(auction_id)
+	fanout.emit(auction_id, "commentary", {"text": f"Team {team_id} enabled auto-bid up to ₹{max_limit:,}"})
+
+
+def pass_lot(auction_id: int) -> None:
+	# Close the lot on the block unsold, whatever has been bid. Bidding stops
+	# before the high bid is dropped so no worker can accept one in between.
+	lot = _stop_bidding(auction_id)
+	if not lot:
+		return
+	state = get_state(auction_id)
+	state.highest_bid_amount = 0
+	state.highest_bid_team_id = None
+	state_store.save(state, "highest_bid_amount", "highest_bid_team_id")
+	fanout.emit(auction_id, "commentary", {"text": "Lot passed"})
+	with metrics.time(metrics.finalize_seconds):
+		_settle_and_announce(auction_id, ClosingLot(lot.ap_id, None, 0))
 
 
 def finalize_sale(auction_id: int) -> None:
+	with metrics.time(metrics.finalize_seconds):
+		lot = _stop_bidding(auction_id)
+		if lot:
+			_settle_and_announce(auction_id, lot)
+
+
+def _stop_bidding(auction_id: int) -> Optional[ClosingLot]:
+	# Atomic running -> stopped: with a shared store several workers can reach
+	# here for one lot, and only the one that wins settles and announces it.
+	# The store hands back the high bid as it stood at the stop, and that is
+	# what gets settled, whatever lands on the block while the bids flush.
 	state = get_state(auction_id)
-	if not state.current_ap_id:
-		return
-	state.timer_running = False
+	if not state_store.try_stop_bidding(state):
+		return None
+	timer_wheel.cancel(("close", auction_id))
+	timer_wheel.cancel(("tick", auction_id))
+	return ClosingLot(state.current_ap_id, state.highest_bid_team_id, state.highest_bid_amount)
+
+
+def _settle_and_announce(auction_id: int, lot: ClosingLot) -> None:
+	# The winning bid must be durable before the sale is announced. A row the
+	# database rejected is recorded by _settle_lot itself; an outage is not
+	# something to settle through.
+	if not bid_writer.flush() and bid_writer.pending:
+		raise RuntimeError(f"bids for auction {auction_id} could not be written")
+
+	sale = db_executor.run(_settle_lot, lot.ap_id, lot.team_id, lot.amount)
+
+	if sale and sale["team_id"]:
+		budget_ledger.commit(sale["team_id"], auction_id, sale["budget_remaining"])
+	budget_ledger.release_auction(auction_id)
+	live_cache.invalidate(auction_id)
+	if sale and sale["team_id"]:
+		live_cache.invalidate_teams()
+		market_cache.invalidate()  # a new comparable for valuations
 
-	ap: AuctionPlayer = AuctionPlayer.query.get(state.current_ap_id)
+	# Broadcast
+	if sale:
+		fanout.emit(auction_id, "player_sold", {
+			"auction_player_id": sale["auction_player_id"],
+			"sold_to_team_id": sale["sold_to_team_id"],
+			"final_price": sale["final_price"],
+			"status": sale["status"],
+		})
+	if sale and sale["team_id"]:
+		standing = leaderboard.record_sale(auction_id, sale["team_id"], sale["player_id"], sale["player_name"], sale["role"], sale["final_price"], sale["budget_remaining"])
+		if standing is not None:
+			fanout.emit(auction_id, "leaderboard", standing)
+
+	# Reset, even if the lot has gone from the DB, or nothing could start again
+	state = get_state(auction_id)
+	if state.current_ap_id == lot.ap_id:
+		state.current_ap_id = None
+		state.end_time = None
+		state.highest_bid_amount = 0
+		state.highest_bid_team_id = None
+		state.bid_history.clear()
+		state_store.save(state)
+	state_journal.mark(auction_id)
+	lobby.lot_changed(auction_id)
+	auction_runner.lot_closed(auction_id, lot.ap_id, sale["status"] if sale else "missing")
+
+
+def _settle_lot(ap_id: int, team_id, amount: int):
+	# Runs on the DB executor: mark the lot, charge the winner, commit
+	ap: AuctionPlayer = AuctionPlayer.query.get(ap_id)
 	if not ap:
-		return
+		return None
 
-	if state.highest_bid_team_id is None:
+	team = None
+	if ap.status != "available":
+		pass  # already closed before a restart; don't charge the team twice
+	elif team_id is None:
 		ap.status = "unsold"
 	else:
-		ap.status = "sold"
-		ap.sold_to_team_id = state.highest_bid_team_id
-		ap.final_price = state.highest_bid_amount
 		# deduct budget
-		team = Team.query.get(state.highest_bid_team_id)
-		if team:
-			team.spend_budget(state.highest_bid_amount)
+		team = Team.query.get(team_id)
+		try:
+			if team:
+				team.spend_budget(amount)
+		except ValueError as exc:
+			# The ledger should make this impossible; never sell on credit
+			current_app.logger.error("Lot %s left unsold: %s", ap_id, exc)
+			ap.status = "unsold"
+			team = None
+		else:
+			ap.status = "sold"
+			ap.sold_to_team_id = team_id
+			ap.final_price = amount
+			_ensure_winning_bid(ap, team_id, amount)
+	materialize_timeline(ap, closed_at=clock.utcnow())
 
 	db.session.commit()
-
-	# Broadcast
-	socketio.emit(
-		"player_sold",
-		{
-			"auction_player_id": ap.id,
-			"sold_to_team_id": ap.sold_to_team_id,
-			"final_price": ap.final_price,
-			"status": ap.status,
-		},
-		room=f"auction:{auction_id}",
-	)
-
-	# Reset
-	state.current_ap_id = None
-	state.end_time = None
-	state.highest_bid_amount = 0
-	state.highest_bid_team_id = None
-	state.bid_history = []
\ No newline at end of file
+	return {
+		"auction_player_id": ap.id,
+		"sold_to_team_id": ap.sold_to_team_id,
+		"final_price": ap.final_price,
+		"status": ap.status,
+		"team_id": team.id if team else None,
+		"budget_remaining": team.budget_remaining if team else None,
+		"player_id": ap.player_id,
+		"player_name": ap.player.name if team and ap.player else None,
+		"role": ap.player.role if team and ap.player else None,
+	}
+
+
+def _ensure_winning_bid(ap: AuctionPlayer, team_id: int, amount: int) -> None:
+	# Every queued bid has been flushed; if the winner's row isn't there the
+	# writer dropped it, and the sale's own commit records it instead
+	if db.session.query(Bid.id).filter_by(auction_id=ap.auction_id, player_id=ap.player_id, team_id=team_id, amount=amount).first() is None:
+		current_app.logger.error("Winning bid for lot %s was not written; recording it with the sale", ap.id)
+		db.session.add(Bid(auction_id=ap.auction_id, player_id=ap.player_id, team_id=team_id, amount=amount, timestamp=clock.utcnow()))
+		db.session.flush()
+
+
+def restore_live_auctions() -> int:
+	# Rebuild live lots from the state journal after a restart and re-arm their
+	# timers; lots that expired while the server was down close right away.
+	restored = state_journal.load()
+	for auction_id, state in restored.items():
+		if not state.timer_running:
+			# Went down while closing this lot: finish the close
+			state.timer_running = True
+			state.end_time = clock.utcnow()
+		state_store.save(state)
+		if state.highest_bid_team_id is not None:
+			budget_ledger.reserve(state.highest_bid_team_id, auction_id, state.highest_bid_amount)
+		remaining = max(_remaining(state), 0)
+		_schedule_close(auction_id, remaining)
+		_schedule_tick(auction_id, remaining)
+	return len(restored)
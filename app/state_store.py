@@ -0,0 +1,219 @@
+from __future__ import annotations
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Optional
+from flask import Flask
+from .bid_history import BidHistory, monotonic_to_iso
+
+
+@dataclass
+class AuctionState:
+	auction_id: int
+	current_ap_id: Optional[int] = None
+	highest_bid_amount: int = 0
+	highest_bid_team_id: Optional[int] = None
+	bid_history: BidHistory = field(default_factory=BidHistory)
+	end_time: Optional[datetime] = None
+	min_increment: int = 100000  # 1 lakh default
+	auto_bids: Dict[int, int] = field(default_factory=dict)  # team_id -> max_limit, in registration order
+	timer_running: bool = False
+
+
+class InProcessBackend:
+	# Default backend: state lives in this process only.
+
+	def __init__(self) -> None:
+		self._states: Dict[int, AuctionState] = {}
+
+	def get(self, auction_id: int) -> AuctionState:
+		if auction_id not in self._states:
+			self._states[auction_id] = AuctionState(auction_id=auction_id)
+		return self._states[auction_id]
+
+	def save(self, state: AuctionState, *fields: str) -> None:
+		self._states[state.auction_id] = state
+
+	def try_accept_bid(self, state: AuctionState, team_id: int, amount: int) -> bool:
+		# Runs without yielding to the hub, so check-and-set is atomic per process
+		if not state.timer_running or amount < state.highest_bid_amount + state.min_increment:
+			return False
+		state.highest_bid_amount = amount
+		state.highest_bid_team_id = team_id
+		return True
+
+	def try_stop_bidding(self, state: AuctionState) -> bool:
+		if not state.timer_running or state.current_ap_id is None:
+			return False
+		state.timer_running = False
+		return True
+
+	def append_history(self, state: AuctionState, team_id: int, amount: int, ts_ns: int, ip: Optional[str]) -> None:
+		state.bid_history.append(team_id, amount, ts_ns, ip)
+
+	def set_auto_bid(self, state: AuctionState, team_id: int, max_limit: int) -> None:
+		# Changing a limit re-registers it, moving the team to the back for ties
+		state.auto_bids.pop(team_id, None)
+		state.auto_bids[team_id] = max_limit
+
+
+# Compare-and-set for a bid: only accepted if the lot is still running, is the
+# lot the bidder saw, and the amount clears the current high bid + increment.
+_ACCEPT_BID_LUA = """
+local h = KEYS[1]
+local vals = redis.call('HMGET', h, 'timer_running', 'current_ap_id', 'highest_bid_amount', 'min_increment')
+if vals[1] ~= '1' or vals[2] ~= ARGV[3] then return 0 end
+local high = tonumber(vals[3] or '0') or 0
+local inc = tonumber(vals[4] or '0') or 0
+if tonumber(ARGV[2]) < high + inc then return 0 end
+redis.call('HSET', h, 'highest_bid_amount', ARGV[2], 'highest_bid_team_id', ARGV[1])
+return 1
+"""
+
+# Running -> stopped for the lot the caller saw. Every worker may hold a close
+# timer for the same lot; only the one that wins this settles and announces it,
+# with the high bid returned here: none can be accepted after the stop.
+_STOP_BIDDING_LUA = """
+local h = KEYS[1]
+local vals = redis.call('HMGET', h, 'timer_running', 'current_ap_id', 'highest_bid_amount', 'highest_bid_team_id')
+if vals[1] ~= '1' or vals[2] ~= ARGV[1] then return 0 end
+redis.call('HSET', h, 'timer_running', '0')
+return {vals[3] or '0', vals[4] or ''}
+"""
+
+_SCALAR_FIELDS = ("current_ap_id", "highest_bid_amount", "highest_bid_team_id", "end_time", "min_increment", "timer_running")
+
+
+class RedisBackend:
+	# Shared backend over the Redis protocol so several Socket.IO workers see the
+	# same live auction. Any client exposing hget/hset/hgetall/eval/rpush/lrange
+	# /delete/pipeline (redis-py, or a local stand-in) can be passed in.
+
+	def __init__(self, client, prefix: str = "auction", history_len: int = 200) -> None:
+		self.client = client
+		self.prefix = prefix
+		self.history_len = history_len
+
+	@classmethod
+	def from_url(cls, url: str, **kwargs) -> "RedisBackend":
+		import redis  # local import: only needed when a shared store is configured
+		return cls(redis.Redis.from_url(url, decode_responses=True), **kwargs)
+
+	def _key(self, auction_id: int, part: str) -> str:
+		return f"{self.prefix}:{auction_id}:{part}"
+
+	def get(self, auction_id: int) -> AuctionState:
+		raw = self.client.hgetall(self._key(auction_id, "state")) or {}
+		state = AuctionState(auction_id=auction_id)
+		if raw:
+			state.current_ap_id = _opt_int(raw.get("current_ap_id"))
+			state.highest_bid_amount = int(raw.get("highest_bid_amount") or 0)
+			state.highest_bid_team_id = _opt_int(raw.get("highest_bid_team_id"))
+			state.end_time = datetime.fromisoformat(raw["end_time"]) if raw.get("end_time") else None
+			state.min_increment = int(raw.get("min_increment") or state.min_increment)
+			state.timer_running = raw.get("timer_running") == "1"
+		# Stored with wall-clock timestamps; monotonic ones mean nothing across processes
+		entries = [json.loads(e) for e in self.client.lrange(self._key(auction_id, "history"), 0, -1)]
+		state.bid_history = BidHistory.from_wire(entries)
+		# Values are "limit:registered_ns"; hashes are unordered, so restore order
+		autos = []
+		for k, v in (self.client.hgetall(self._key(auction_id, "auto")) or {}).items():
+			limit, _, registered = v.partition(":")
+			autos.append((int(registered or 0), int(k), int(limit)))
+		state.auto_bids = {team_id: limit for _, team_id, limit in sorted(autos)}
+		return state
+
+	def save(self, state: AuctionState, *fields: str) -> None:
+		fields = fields or _SCALAR_FIELDS + ("bid_history", "auto_bids")
+		scalars = {f: _encode(getattr(state, f)) for f in fields if f in _SCALAR_FIELDS}
+		pipe = self.client.pipeline()
+		if scalars:
+			pipe.hset(self._key(state.auction_id, "state"), mapping=scalars)
+		if "bid_history" in fields:
+			key = self._key(state.auction_id, "history")
+			pipe.delete(key)
+			if len(state.bid_history):
+				pipe.rpush(key, *[json.dumps(e) for e in state.bid_history.to_wire(self.history_len)])
+		if "auto_bids" in fields:
+			key = self._key(state.auction_id, "auto")
+			pipe.delete(key)
+			if state.auto_bids:
+				pipe.hset(key, mapping={str(k): f"{v}:{i}" for i, (k, v) in enumerate(state.auto_bids.items())})
+		pipe.execute()
+
+	def try_accept_bid(self, state: AuctionState, team_id: int, amount: int) -> bool:
+		ok = self.client.eval(_ACCEPT_BID_LUA, 1, self._key(state.auction_id, "state"), str(team_id), str(amount), _encode(state.current_ap_id))
+		if int(ok or 0) != 1:
+			return False
+		state.highest_bid_amount = amount
+		state.highest_bid_team_id = team_id
+		return True
+
+	def try_stop_bidding(self, state: AuctionState) -> bool:
+		high = self.client.eval(_STOP_BIDDING_LUA, 1, self._key(state.auction_id, "state"), _encode(state.current_ap_id))
+		if not isinstance(high, list):
+			return False
+		state.timer_running = False
+		state.highest_bid_amount = int(high[0] or 0)
+		state.highest_bid_team_id = _opt_int(high[1])
+		return True
+
+	def append_history(self, state: AuctionState, team_id: int, amount: int, ts_ns: int, ip: Optional[str]) -> None:
+		key = self._key(state.auction_id, "history")
+		entry = {"team_id": team_id, "amount": amount, "ts": monotonic_to_iso(ts_ns), "ip": ip}
+		pipe = self.client.pipeline()
+		pipe.rpush(key, json.dumps(entry))
+		pipe.ltrim(key, -self.history_len, -1)
+		pipe.execute()
+		state.bid_history.append(team_id, amount, ts_ns, ip)
+
+	def set_auto_bid(self, state: AuctionState, team_id: int, max_limit: int) -> None:
+		self.client.hset(self._key(state.auction_id, "auto"), str(team_id), f"{max_limit}:{time.time_ns()}")
+		state.auto_bids.pop(team_id, None)
+		state.auto_bids[team_id] = max_limit
+
+
+def _opt_int(value) -> Optional[int]:
+	return int(value) if value not in (None, "") else None
+
+
+def _encode(value) -> str:
+	if value is None:
+		return ""
+	if isinstance(value, bool):
+		return "1" if value else "0"
+	if isinstance(value, datetime):
+		return value.isoformat()
+	return str(value)
+
+
+class AuctionStateStore:
+	# Flask extension choosing the state backend from AUCTION_STATE_URL.
+
+	def __init__(self, backend=None) -> None:
+		self.backend = backend or InProcessBackend()
+
+	def init_app(self, app: Flask) -> None:
+		url = app.config.get("AUCTION_STATE_URL")
+		if url:
+			self.backend = RedisBackend.from_url(url)
+		app.extensions["auction_state_store"] = self
+
+	def get(self, auction_id: int) -> AuctionState:
+		return self.backend.get(auction_id)
+
+	def save(self, state: AuctionState, *fields: str) -> None:
+		self.backend.save(state, *fields)
+
+	def try_accept_bid(self, state: AuctionState, team_id: int, amount: int) -> bool:
+		return self.backend.try_accept_bid(state, team_id, amount)
+
+	def try_stop_bidding(self, state: AuctionState) -> bool:
+		return self.backend.try_stop_bidding(state)
+
+	def append_history(self, state: AuctionState, team_id: int, amount: int, ts_ns: int, ip: Optional[str]) -> None:
+		self.backend.append_history(state, team_id, amount, ts_ns, ip)
+
+	def set_auto_bid(self, state: AuctionState, team_id: int, max_limit: int) -> None:
+		self.backend.set_auto_bid(state, team_id, max_limit)
@@ -0,0 +1,80 @@
+from __future__ import annotations
+import math
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+from flask import Flask
+
+
+class TimerWheel:
+	# Hashed timer wheel: one background task serves every live auction's
+	# timers. Scheduling and cancelling are O(1); each step only looks at the
+	# one slot whose turn it is, so overhead does not grow with live auctions.
+
+	def __init__(self, resolution: float = 0.25, slots: int = 256) -> None:
+		self.app: Optional[Flask] = None
+		self.resolution = resolution
+		self._slots: List[Dict[Hashable, Tuple[int, Callable[[], None]]]] = [{} for _ in range(slots)]
+		self._where: Dict[Hashable, int] = {}  # key -> slot index
+		self._tick = 0
+		self._task_started = False
+
+	def init_app(self, app: Flask) -> None:
+		self.app = app
+		app.extensions["timer_wheel"] = self
+
+	def __len__(self) -> int:
+		return len(self._where)
+
+	def __contains__(self, key: Hashable) -> bool:
+		return key in self._where
+
+	def keys(self) -> List[Hashable]:
+		return list(self._where)
+
+	def schedule(self, key: Hashable, delay: float, callback: Callable[[], None]) -> None:
+		# A key has at most one pending timer; rescheduling replaces it
+		self.cancel(key)
+		due = self._tick + max(1, math.ceil(delay / self.resolution))
+		idx = due % len(self._slots)
+		self._slots[idx][key] = (due, callback)
+		self._where[key] = idx
+		self._ensure_task()
+
+	def cancel(self, key: Hashable) -> None:
+		idx = self._where.pop(key, None)
+		if idx is not None:
+			self._slots[idx].pop(key, None)
+
+	def advance(self) -> None:
+		self._tick += 1
+		slot = self._slots[self._tick % len(self._slots)]
+		# Entries more than one rotation away share the slot but are not due yet
+		due_keys = [k for k, (due, _) in slot.items() if due <= self._tick]
+		for key in due_keys:
+			_, callback = slot.pop(key)
+			del self._where[key]
+			try:
+				callback()
+			except Exception:
+				if self.app is not None:
+					self.app.logger.exception("Timer %r failed", key)
+
+	def _ensure_task(self) -> None:
+		if self._task_started or self.app is None:
+			return
+		from . import socketio
+		self._task_started = True
+		socketio.start_background_task(self._run)
+
+	def _run(self) -> None:
+		from . import clock
+		started = clock.monotonic() - self._tick * self.resolution
+		while True:
+			target = started + (self._tick + 1) * self.resolution
+			clock.sleep(max(0.0, target - clock.monotonic()))
+			# Catch up if the hub was busy for longer than one step
+			while started + (self._tick + 1) * self.resolution <= clock.monotonic():
+				if self._slots[(self._tick + 1) % len(self._slots)]:
+					with self.app.app_context():
+						self.advance()
+				else:
+					self._tick += 1
@@ -0,0 +1,236 @@
+from __future__ import annotations
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+# Bump whenever the formula or weights change: cached values are keyed on it
+MODEL_VERSION = 2
+
+STAT_KEYS = ("matches", "runs", "wickets", "strike_rate", "economy")
+MATCHES, RUNS, WICKETS, STRIKE, ECONOMY = range(len(STAT_KEYS))
+
+# Rupees per (batting point, bowling point, match) by role; unknown roles get
+# the original single formula
+DEFAULT_WEIGHTS = (5000.0, 15000.0, 10000.0)
+ROLE_WEIGHTS: Dict[str, Tuple[float, float, float]] = {
+	"Batter": (6500.0, 5000.0, 10000.0),
+	"Bowler": (2500.0, 18000.0, 10000.0),
+	"All-Rounder": (5000.0, 15000.0, 12000.0),
+	"Wicketkeeper": (5500.0, 5000.0, 14000.0),
+}
+MAX_MULTIPLE = 50  # valuations are clamped to [base, base * MAX_MULTIPLE]
+
+COMPARABLES_K = 5
+COMPARABLES_WEIGHT = 0.4  # share of the estimate taken from comparable sales
+ROLE_MISMATCH = 4.0  # added squared distance between players of different roles
+CHUNK = 1024  # query rows per distance block, bounds memory at CHUNK x market
+CACHE_SIZE = 50000
+MARKET_TTL = 300.0  # bounds staleness from sales settled by other workers
+
+
+class Market:
+	# Sold lots used as comparables: normalized features, roles and prices
+	def __init__(self, player_ids: np.ndarray, features: np.ndarray, roles: np.ndarray, prices: np.ndarray, mean: np.ndarray, std: np.ndarray) -> None:
+		self.player_ids = player_ids
+		self.features = features
+		self.roles = roles
+		self.prices = prices
+		self.mean = mean
+		self.std = std
+		self._ids = set(player_ids.tolist())
+		digest = hashlib.sha1(player_ids.tobytes() + prices.tobytes()).hexdigest()
+		self.version = digest[:12]
+
+	def owner(self, player_id: Optional[int]) -> Optional[int]:
+		# The player's id if they are one of the comparables (and so excluded)
+		return player_id if player_id in self._ids else None
+
+	def __len__(self) -> int:
+		return len(self.prices)
+
+
+def stats_matrix(stats_rows: Sequence[Optional[dict]]) -> np.ndarray:
+	out = np.zeros((len(stats_rows), len(STAT_KEYS)), dtype=np.float64)
+	for i, stats in enumerate(stats_rows):
+		if stats:
+			out[i] = [float(stats.get(k) or 0) for k in STAT_KEYS]
+	return out
+
+
+def model_scores(X: np.ndarray, roles: Sequence[Optional[str]]) -> np.ndarray:
+	weights = np.array([ROLE_WEIGHTS.get(r, DEFAULT_WEIGHTS) for r in roles], dtype=np.float64).reshape(-1, 3)
+	bat = X[:, RUNS] * (X[:, STRIKE] / 100.0)
+	bowl = X[:, WICKETS] * (6.0 / np.maximum(1.0, X[:, ECONOMY]))
+	return bat * weights[:, 0] + bowl * weights[:, 1] + X[:, MATCHES] * weights[:, 2]
+
+
+def _features(X: np.ndarray) -> np.ndarray:
+	# Per-match rates so a veteran and a newcomer with the same form look alike
+	matches = np.maximum(1.0, X[:, MATCHES])
+	return np.column_stack([
+		np.log1p(X[:, MATCHES]),
+		X[:, RUNS] / matches,
+		X[:, WICKETS] / matches,
+		X[:, STRIKE],
+		X[:, ECONOMY],
+	])
+
+
+def load_market() -> Market:
+	from .models import db, AuctionPlayer, Player
+	rows = (
+		db.session.query(Player.id, Player.stats_json, Player.role, AuctionPlayer.final_price)
+		.join(AuctionPlayer, AuctionPlayer.player_id == Player.id)
+		.filter(AuctionPlayer.status == "sold", AuctionPlayer.final_price.isnot(None))
+		.order_by(AuctionPlayer.id)
+		.all()
+	)
+	F = _features(stats_matrix([r.stats_json for r in rows]))
+	mean = F.mean(axis=0) if len(rows) else np.zeros(F.shape[1])
+	std = F.std(axis=0) if len(rows) else np.ones(F.shape[1])
+	std[std == 0] = 1.0
+	return Market(
+		np.array([r.id for r in rows], dtype=np.int64),
+		(F - mean) / std,
+		np.array([r.role or "" for r in rows], dtype=object),
+		np.array([r.final_price for r in rows], dtype=np.float64),
+		mean,
+		std,
+	)
+
+
+def comparable_prices(X: np.ndarray, roles: Sequence[Optional[str]], market: Market, player_ids: Optional[np.ndarray] = None, k: int = COMPARABLES_K) -> np.ndarray:
+	# Inverse-distance weighted price of each row's k nearest sold players;
+	# NaN where there is nothing to compare against. A player never counts as
+	# their own comparable.
+	out = np.full(len(X), np.nan)
+	if not len(market) or not len(X):
+		return out
+	Q = (_features(X) - market.mean) / market.std
+	qroles = np.array([r or "" for r in roles], dtype=object)
+	m_sq = (market.features ** 2).sum(axis=1)
+	k = min(k, len(market))
+	for start in range(0, len(Q), CHUNK):
+		q = Q[start:start + CHUNK]
+		d = (q ** 2).sum(axis=1)[:, None] + m_sq[None, :] - 2.0 * q @ market.features.T
+		np.maximum(d, 0.0, out=d)
+		d += ROLE_MISMATCH * (qroles[start:start + CHUNK, None] != market.roles[None, :])
+		if player_ids is not None:
+			d[player_ids[start:start + CHUNK, None] == market.player_ids[None, :]] = np.inf
+		idx = np.argpartition(d, k - 1, axis=1)[:, :k]
+		nd = np.take_along_axis(d, idx, axis=1)
+		w = np.where(np.isfinite(nd), 1.0 / (np.sqrt(nd) + 1e-3), 0.0)
+		total = w.sum(axis=1)
+		prices = (w * market.prices[idx]).sum(axis=1)
+		with np.errstate(invalid="ignore", divide="ignore"):
+			out[start:start + len(q)] = np.where(total > 0, prices / total, np.nan)
+	return out
+
+
+def valuate(X: np.ndarray, roles: Sequence[Optional[str]], base_prices: np.ndarray, market: Optional[Market] = None, player_ids: Optional[np.ndarray] = None) -> np.ndarray:
+	score = model_scores(X, roles)
+	if market is not None and len(market):
+		comps = comparable_prices(X, roles, market, player_ids)
+		score = np.where(np.isnan(comps), score, (1 - COMPARABLES_WEIGHT) * score + COMPARABLES_WEIGHT * comps)
+	base = base_prices.astype(np.float64)
+	return np.maximum(base, np.minimum(score, base * MAX_MULTIPLE)).astype(np.int64)
+
+
+class ValuationCache:
+	# LRU of computed valuations keyed on (stats, role, base price), the model
+	# version and the comparables market, so a formula change or a new sale
+	# naturally misses instead of serving stale values.
+
+	def __init__(self, maxsize: int = CACHE_SIZE) -> None:
+		self.maxsize = maxsize
+		self._data: "OrderedDict[str, int]" = OrderedDict()
+		self.hits = 0
+		self.misses = 0
+
+	@staticmethod
+	def key(stats: Optional[dict], role: Optional[str], base_price: int, market_version: str, own: Optional[int] = None) -> str:
+		blob = json.dumps([[float((stats or {}).get(k) or 0) for k in STAT_KEYS], role, base_price, own], separators=(",", ":"))
+		return hashlib.sha1(f"{MODEL_VERSION}:{market_version}:{blob}".encode("utf-8")).hexdigest()
+
+	def get(self, key: str) -> Optional[int]:
+		value = self._data.get(key)
+		if value is None:
+			self.misses += 1
+			return None
+		self._data.move_to_end(key)
+		self.hits += 1
+		return value
+
+	def put(self, key: str, value: int) -> None:
+		self._data[key] = value
+		self._data.move_to_end(key)
+		while len(self._data) > self.maxsize:
+			self._data.popitem(last=False)
+
+
+class MarketCache:
+	# The comparables market, kept between registrations and rebuilt only once
+	# a sale has changed it (finalize_sale invalidates it) or it has aged out.
+
+	def __init__(self, ttl: float = MARKET_TTL) -> None:
+		self.ttl = ttl
+		self._market: Optional[Market] = None
+		self._expires = 0.0
+
+	def get(self) -> Market:
+		if self._market is None or time.monotonic() >= self._expires:
+			self._market = load_market()
+			self._expires = time.monotonic() + self.ttl
+		return self._market
+
+	def invalidate(self) -> None:
+		self._market = None
+
+
+cache = ValuationCache()
+market_cache = MarketCache()
+
+
+def estimate_valuation(stats: dict, role: Optional[str], base_price: int, player_id: Optional[int] = None, market: Optional[Market] = None) -> int:
+	# Single player (registration form); same model as the bulk pass
+	market = market if market is not None else market_cache.get()
+	key = cache.key(stats, role, base_price, market.version, market.owner(player_id))
+	value = cache.get(key)
+	if value is None:
+		ids = np.array([player_id if player_id is not None else -1], dtype=np.int64)
+		value = int(valuate(stats_matrix([stats]), [role], np.array([base_price or 0]), market, ids)[0])
+		cache.put(key, value)
+	return value
+
+
+def revalue_all(batch_size: int = 1000) -> Tuple[int, int]:
+	# Re-values the whole pool in one vectorized pass and writes only changed
+	# rows, batch_size per executemany UPDATE, in a single transaction.
+	# Returns (players checked, players updated).
+	from sqlalchemy import update
+	from .models import db, Player
+	market = load_market()
+	rows = db.session.query(Player.id, Player.stats_json, Player.role, Player.base_price, Player.ai_valuation).all()
+	keys = [cache.key(r.stats_json, r.role, r.base_price or 0, market.version, market.owner(r.id)) for r in rows]
+	values: List[Optional[int]] = [cache.get(k) for k in keys]
+	todo = [i for i, v in enumerate(values) if v is None]
+	if todo:
+		sub = [rows[i] for i in todo]
+		computed = valuate(
+			stats_matrix([r.stats_json for r in sub]),
+			[r.role for r in sub],
+			np.array([r.base_price or 0 for r in sub], dtype=np.int64),
+			market,
+			np.array([r.id for r in sub], dtype=np.int64),
+		)
+		for i, value in zip(todo, computed.tolist()):
+			values[i] = value
+			cache.put(keys[i], value)
+	changed = [{"id": r.id, "ai_valuation": v} for r, v in zip(rows, values) if r.ai_valuation != v]
+	for start in range(0, len(changed), batch_size):
+		db.session.execute(update(Player), changed[start:start + batch_size])
+	db.session.commit()
+	return len(rows), len(changed)
@@ -0,0 +1,369 @@
+# Virtual-time auction simulator for capacity planning.
+#
+#   python -m benchmarks.simulate --lots 600 --teams 10 --output sim.json
+#   python -m benchmarks.simulate --replay-db sqlite:////workspace/auction.db --auction-id 3
+#
+# Runs a whole auction through the real engine (auction_runner, place_bid,
+# set_auto_bid, the timer wheel, finalize_sale) against a throwaway SQLite DB,
+# with the app clock swapped for a VirtualClock. Virtual time jumps straight
+# to the next timer or bidder wake-up, so a 600-lot auction of 30 s lots runs
+# in seconds of wall time.
+#
+# Bidders come from one of two sources:
+#   - Synthetic models. Each team draws a per-lot valuation around the base
+#     price and the engine enforces its purse. Some teams bid through auto-bid
+#     limits; the rest bid by hand with random reaction times, and a few wait
+#     to snipe near the close.
+#   - A recorded auction's Bid history, replayed at its original offsets from
+#     each lot's first bid.
+#
+# For a given --seed the report is deterministic: final prices, timer
+# extensions and bid outcomes are the same on every run. Only the wall-time
+# cost figures change. Stdout gets the summary; --output also records every
+# lot.
+from __future__ import annotations
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import eventlet
+from eventlet.hubs import get_hub
+
+from .socket_load import _setup_env, percentiles
+
+ROLES = ("Batter", "Bowler", "All-Rounder", "Wicketkeeper")
+BASE_PRICES = (200000, 500000, 1000000, 2000000)
+REPLAY_LEAD = 1.0  # seconds from lot start to its first recorded bid
+
+
+@dataclass
+class TeamSpec:
+	name: str
+	budget: int
+	auto: bool = False
+	id: int = 0
+	client: object = None
+
+
+@dataclass
+class LotSpec:
+	name: str
+	role: Optional[str]
+	base_price: int
+	bids: List[Tuple[float, int, int]] = field(default_factory=list)  # replay: (offset s, team index, amount)
+	ap_id: int = 0
+	player_id: int = 0
+
+
+def synthetic(args) -> Tuple[List[TeamSpec], List[LotSpec]]:
+	rng = random.Random(f"{args.seed}:setup")
+	teams = [TeamSpec(f"Sim Team {i}", args.budget, auto=i < round(args.teams * args.auto_share)) for i in range(args.teams)]
+	lots = [LotSpec(f"Sim Player {i}", rng.choice(ROLES), rng.choice(BASE_PRICES)) for i in range(args.lots)]
+	return teams, lots
+
+
+def recorded(url: str, auction_id: int) -> Tuple[List[TeamSpec], List[LotSpec]]:
+	# Lots, bidding teams and bids of one auction, read with Core so the
+	# source DB is never touched through the app's session
+	from sqlalchemy import create_engine, select
+	from app.models import AuctionPlayer, Bid, Player, Team
+	ap, p, b, t = AuctionPlayer.__table__, Player.__table__, Bid.__table__, Team.__table__
+	engine = create_engine(url)
+	try:
+		with engine.connect() as conn:
+			lot_rows = conn.execute(
+				select(ap.c.player_id, p.c.name, p.c.role, p.c.base_price)
+				.join_from(ap, p, ap.c.player_id == p.c.id)
+				.where(ap.c.auction_id == auction_id)
+				.order_by(ap.c.order_index, ap.c.id)
+			).all()
+			bid_rows = conn.execute(
+				select(b.c.player_id, b.c.team_id, b.c.amount, b.c.timestamp)
+				.where(b.c.auction_id == auction_id)
+				.order_by(b.c.timestamp, b.c.id)
+			).all()
+			team_ids = sorted({r.team_id for r in bid_rows})
+			team_rows = conn.execute(select(t.c.id, t.c.name, t.c.budget_total).where(t.c.id.in_(team_ids))).all()
+	finally:
+		engine.dispose()
+	index = {r.id: i for i, r in enumerate(team_rows)}
+	teams = [TeamSpec(r.name, r.budget_total or 0) for r in team_rows]
+	by_player: Dict[int, list] = {}
+	for r in bid_rows:
+		if r.team_id in index:
+			by_player.setdefault(r.player_id, []).append(r)
+	lots = []
+	for r in lot_rows:
+		bids = by_player.get(r.player_id, [])
+		first = bids[0].timestamp if bids else None
+		lots.append(LotSpec(r.name, r.role, r.base_price or 0, [
+			(REPLAY_LEAD + (bid.timestamp - first).total_seconds(), index[bid.team_id], bid.amount) for bid in bids
+		]))
+	return teams, lots
+
+
+def _seed(db, teams: List[TeamSpec], lots: List[LotSpec]) -> int:
+	from app.models import User, Team, Player, Auction, AuctionPlayer
+	admin = User(username="sim-admin", email="sim-admin@example.com", role="admin")
+	admin.set_password("sim")
+	db.session.add(admin)
+	db.session.flush()
+	# One real hash shared by every team owner; hashing each would dominate setup
+	for i, spec in enumerate(teams):
+		user = User(username=f"sim-team{i}", email=f"sim-team{i}@example.com", role="team", password_hash=admin.password_hash)
+		db.session.add(user)
+		db.session.flush()
+		team = Team(name=spec.name, owner_user_id=user.id, approved=True, budget_total=spec.budget, budget_remaining=spec.budget)
+		db.session.add(team)
+		db.session.flush()
+		spec.id = team.id
+	auction = Auction(name="Simulation", created_by_id=admin.id)
+	players = [Player(name=lot.name, role=lot.role, base_price=lot.base_price, approved=True) for lot in lots]
+	db.session.add(auction)
+	db.session.add_all(players)
+	db.session.flush()
+	aps = [AuctionPlayer(auction_id=auction.id, player_id=player.id, order_index=i) for i, player in enumerate(players)]
+	db.session.add_all(aps)
+	db.session.flush()
+	for lot, ap in zip(lots, aps):
+		lot.ap_id, lot.player_id = ap.id, ap.player_id
+	db.session.commit()
+	return auction.id
+
+
+class Simulator:
+	def __init__(self, args, teams: List[TeamSpec], lots: List[LotSpec]) -> None:
+		from app.clock import VirtualClock
+		self.args = args
+		self.teams = teams
+		self.lots = lots
+		self.by_ap = {}
+		self.vclock = VirtualClock()
+		self.app = None
+		self.auction_id = 0
+		self.costs: List[float] = []
+		self.outcomes: Dict[str, int] = {}
+		self.stats: Dict[int, dict] = {}
+
+	def setup(self) -> None:
+		from app import create_app, clock, db, socketio
+		self.app = create_app()
+		self.app.config["TESTING"] = True
+		# Before any background loop starts, so every one of them sleeps on it
+		clock.use(self.vclock)
+		with self.app.app_context():
+			db.create_all()
+			self.auction_id = _seed(db, self.teams, self.lots)
+		self.by_ap = {lot.ap_id: lot for lot in self.lots}
+		for i, team in enumerate(self.teams):
+			http = self.app.test_client()
+			http.post("/login", data={"username": f"sim-team{i}", "password": "sim"})
+			team.client = socketio.test_client(self.app, flask_test_client=http)
+			team.client.emit("join_auction", {"auction_id": self.auction_id})
+
+	def run(self) -> dict:
+		from app import auction_runner
+		from app.sockets import get_state
+		a = self.args
+		wall0 = time.perf_counter()
+		with self.app.app_context():
+			auction_runner.start(self.auction_id, duration=a.duration, gap=a.gap, min_increment=a.min_increment, unsold_round=a.unsold_round, unsold_duration=a.unsold_duration)
+		hub = get_hub()
+		current = None
+		while auction_runner.get(self.auction_id) is not None:
+			ap_id = get_state(self.auction_id).current_ap_id
+			if ap_id != current:
+				current = ap_id
+				if ap_id is not None:
+					self._open_lot(ap_id)
+			# Bidders, lots settling off the timer wheel and lazily started
+			# engine loops run to their next sleep
+			if hub.next_timers or hub.timers:
+				eventlet.sleep(0)
+			wake = self.vclock.next_wake()
+			if wake is None:
+				raise RuntimeError("auction still running but nothing is scheduled")
+			self.vclock.run_until(wake)
+		self._drain()
+		return self.report(time.perf_counter() - wall0)
+
+	# Bidders
+
+	def _open_lot(self, ap_id: int) -> None:
+		lot = self.by_ap[ap_id]
+		stats = self.stats.setdefault(ap_id, {"calls": 0, "bids": 0, "accepted": 0, "extensions": 0})
+		stats["calls"] += 1
+		self._drain()
+		if self.args.replay_db:
+			eventlet.spawn(self._replay, lot)
+		else:
+			for i, team in enumerate(self.teams):
+				rng = random.Random(f"{self.args.seed}:{ap_id}:{i}:{stats['calls']}")
+				eventlet.spawn(self._model, team, lot, rng)
+
+	def _model(self, team: TeamSpec, lot: LotSpec, rng: random.Random) -> None:
+		from app import clock
+		from app.sockets import get_state, _remaining
+		a = self.args
+		valuation = int(lot.base_price * rng.lognormvariate(a.value_mu, a.value_sigma))
+		sniper = not team.auto and rng.random() < a.snipe_share
+		if rng.random() >= a.interest:
+			return
+		clock.sleep(rng.expovariate(1 / a.reaction))
+		if team.auto:
+			# The engine bids for it from here; it only opens the bidding
+			if not self._open(lot):
+				return
+			team.client.emit("set_auto_bid", {"auction_id": self.auction_id, "team_id": team.id, "max_limit": valuation})
+			if get_state(self.auction_id).highest_bid_team_id is None and lot.base_price <= valuation:
+				self._bid(team, lot, lot.base_price)
+			return
+		while self._open(lot):
+			state = get_state(self.auction_id)
+			if state.highest_bid_team_id != team.id:
+				amount = state.highest_bid_amount + state.min_increment if state.highest_bid_team_id else lot.base_price
+				if amount > valuation:
+					return
+				remaining = _remaining(state)
+				if sniper and remaining > a.snipe_window:
+					clock.sleep(remaining - rng.uniform(0, a.snipe_window))
+					continue
+				ack = self._bid(team, lot, amount)
+				if ack.get("reason") in ("budget", "closed"):
+					return
+			clock.sleep(rng.expovariate(1 / a.reaction))
+
+	def _replay(self, lot: LotSpec) -> None:
+		from app import clock
+		start = self.vclock.elapsed
+		for offset, team_index, amount in lot.bids:
+			delay = start + offset - self.vclock.elapsed
+			if delay > 0:
+				clock.sleep(delay)
+			if not self._open(lot):
+				return
+			self._bid(self.teams[team_index], lot, amount)
+
+	def _open(self, lot: LotSpec) -> bool:
+		from app.sockets import get_state
+		state = get_state(self.auction_id)
+		return state.current_ap_id == lot.ap_id and state.timer_running
+
+	def _bid(self, team: TeamSpec, lot: LotSpec, amount: int) -> dict:
+		from app.sockets import get_state
+		end_time = get_state(self.auction_id).end_time
+		payload = {"auction_id": self.auction_id, "team_id": team.id, "amount": amount, "player_id": lot.player_id}
+		t0 = time.perf_counter()
+		ack = team.client.emit("place_bid", payload, callback=True) or {}
+		self.costs.append((time.perf_counter() - t0) * 1e6)
+		reason = "accepted" if ack.get("ok") else ack.get("reason", "no_ack")
+		self.outcomes[reason] = self.outcomes.get(reason, 0) + 1
+		stats = self.stats[lot.ap_id]
+		stats["bids"] += 1
+		if ack.get("ok"):
+			stats["accepted"] += 1
+			if get_state(self.auction_id).end_time > end_time:
+				stats["extensions"] += 1
+		return ack
+
+	def _drain(self) -> None:
+		for team in self.teams:
+			team.client.get_received()
+
+	# Report
+
+	def report(self, wall: float) -> dict:
+		from app.models import db, AuctionPlayer
+		with self.app.app_context():
+			rows = {
+				r.id: r for r in db.session.query(AuctionPlayer.id, AuctionPlayer.status, AuctionPlayer.final_price, AuctionPlayer.sold_to_team_id)
+				.filter(AuctionPlayer.auction_id == self.auction_id)
+			}
+		names = {team.id: team.name for team in self.teams}
+		lots, ratios = [], []
+		teams = {team.name: {"spend": 0, "players": 0, "budget": team.budget} for team in self.teams}
+		for lot in self.lots:
+			r = rows[lot.ap_id]
+			stats = self.stats.get(lot.ap_id, {"calls": 0, "bids": 0, "accepted": 0, "extensions": 0})
+			team = names.get(r.sold_to_team_id)
+			lots.append(dict({"lot": lot.name, "role": lot.role, "base_price": lot.base_price, "status": r.status, "final_price": r.final_price, "team": team}, **stats))
+			if r.status == "sold":
+				teams[team]["spend"] += r.final_price
+				teams[team]["players"] += 1
+				if lot.base_price:
+					ratios.append(r.final_price / lot.base_price)
+		sold = [lot for lot in lots if lot["status"] == "sold"]
+		virtual = self.vclock.elapsed
+		return {
+			"summary": {
+				"lots": len(lots),
+				"sold": len(sold),
+				"unsold": len(lots) - len(sold),
+				"spend": sum(lot["final_price"] for lot in sold),
+				"price_to_base": percentiles(ratios),
+				"extensions": sum(lot["extensions"] for lot in lots),
+				"lots_extended": sum(1 for lot in lots if lot["extensions"]),
+				"max_extensions": max((lot["extensions"] for lot in lots), default=0),
+				"bid_outcomes": dict(sorted(self.outcomes.items())),
+				"bid_cost_us": percentiles(self.costs),
+				"virtual_seconds": round(virtual, 3),
+				"wall_seconds": round(wall, 3),
+				"speedup": round(virtual / wall, 1) if wall else None,
+			},
+			"teams": teams,
+			"lots": lots,
+		}
+
+
+def parse_args(argv=None):
+	parser = argparse.ArgumentParser(description="Run a whole auction through the engine in virtual time")
+	parser.add_argument("--lots", type=int, default=600)
+	parser.add_argument("--teams", type=int, default=10)
+	parser.add_argument("--budget", type=int, default=100000000, help="each synthetic team's purse")
+	parser.add_argument("--auto-share", type=float, default=0.3, help="fraction of teams bidding through auto-bid limits")
+	parser.add_argument("--interest", type=float, default=0.6, help="chance a team bids on a given lot at all")
+	parser.add_argument("--value-mu", type=float, default=0.4, help="log-mean of valuation / base price")
+	parser.add_argument("--value-sigma", type=float, default=0.5)
+	parser.add_argument("--reaction", type=float, default=2.0, help="mean seconds before a manual team responds")
+	parser.add_argument("--snipe-share", type=float, default=0.15, help="fraction of manual bidders who wait for the close")
+	parser.add_argument("--snipe-window", type=float, default=3.0, help="seconds before the close a sniper bids")
+	parser.add_argument("--duration", type=int, default=30, help="lot clock in seconds")
+	parser.add_argument("--gap", type=float, default=3.0, help="seconds between lots")
+	parser.add_argument("--min-increment", type=int, default=100000)
+	parser.add_argument("--unsold-round", action=argparse.BooleanOptionalAction, default=True)
+	parser.add_argument("--unsold-duration", type=int, default=15)
+	parser.add_argument("--replay-db", help="database URL to replay recorded bids from")
+	parser.add_argument("--auction-id", type=int, help="auction in --replay-db to replay")
+	parser.add_argument("--seed", type=int, default=1)
+	parser.add_argument("--output", help="also write the full report, every lot included, to this file")
+	args = parser.parse_args(argv)
+	if args.replay_db and args.auction_id is None:
+		parser.error("--replay-db needs --auction-id")
+	return args
+
+
+def main(argv=None) -> int:
+	args = parse_args(argv)
+	teams, lots = recorded(args.replay_db, args.auction_id) if args.replay_db else synthetic(args)
+	_setup_env(tempfile.mkdtemp(prefix="auction-sim-"))
+	# Settle inline: the executor's worker thread runs on real time
+	os.environ["DB_EXECUTOR"] = "0"
+	sim = Simulator(args, teams, lots)
+	sim.setup()
+	report = sim.run()
+	report["config"] = {k: v for k, v in vars(args).items() if k != "output"}
+	print(json.dumps({k: v for k, v in report.items() if k != "lots"}, indent=2))
+	if args.output:
+		with open(args.output, "w", encoding="utf-8") as fh:
+			fh.write(json.dumps(report, indent=2) + "\n")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
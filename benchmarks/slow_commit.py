@@ -0,0 +1,220 @@
+# Slow-commit isolation check.
+#
+#   python -m benchmarks.slow_commit --delay 2
+#
+# Three auctions run side by side, each lot closed by its timer on the timer
+# wheel, as in production. Lot A closes first and is given an artificially
+# slow commit (a real, thread-blocking sleep in before_commit, standing in
+# for a stalled fsync or a locked database). Lot B is due to close halfway
+# through that stall, and teams keep bidding in auction C throughout. The run
+# is repeated with the DB executor on and off and prints how late B stopped
+# taking bids, C's ack latency and the hub lag (how late a 10 ms timer fires)
+# during the stall. With the executor on, none of them should grow with
+# --delay. B's result is still announced only once its own commit has
+# followed A's through the single DB writer (b_result_late_ms).
+from __future__ import annotations
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from typing import List
+
+import eventlet
+
+from .socket_load import BASE_PRICE, MIN_INCREMENT, _HubLag, _seed, _setup_env, percentiles
+
+
+class SlowCommit:
+	# Sleeps inside the commit of the session that settled the watched lot
+	def __init__(self, delay: float) -> None:
+		self.delay = delay
+		self.ap_id = None
+		self.stalls = 0
+
+	def after_flush(self, session, flush_context) -> None:
+		from app.models import AuctionPlayer
+		for obj in session.dirty:
+			if isinstance(obj, AuctionPlayer) and obj.id == self.ap_id:
+				session.info["slow_commit"] = True
+
+	def before_commit(self, session) -> None:
+		if session.info.pop("slow_commit", False):
+			self.stalls += 1
+			time.sleep(self.delay)
+
+
+def _extra_auction(db, admin_username: str, name: str, n_lots: int):
+	from app.models import User, Player, Auction, AuctionPlayer
+	admin = User.query.filter_by(username=admin_username).one()
+	auction = Auction(name=f"Benchmark {name}", created_by_id=admin.id)
+	db.session.add(auction)
+	db.session.flush()
+	lots = []
+	for i in range(n_lots):
+		player = Player(name=f"Bench {name} Player {i}", role="Batter", base_price=BASE_PRICE, approved=True)
+		db.session.add(player)
+		db.session.flush()
+		ap = AuctionPlayer(auction_id=auction.id, player_id=player.id, order_index=i)
+		db.session.add(ap)
+		lots.append(ap)
+	db.session.commit()
+	return auction.id, [(ap.id, ap.player_id) for ap in lots]
+
+
+class Bench:
+	def __init__(self, args) -> None:
+		self.args = args
+		self.app = None
+		self.admin = None
+		self.teams: list = []
+		self.auction_a = self.auction_b = self.auction_c = 0
+		self.lots_a: list = []
+		self.lots_b: list = []
+		self.lots_c: list = []
+		self.slow = SlowCommit(args.delay)
+
+	def setup(self) -> None:
+		from sqlalchemy import event
+		from sqlalchemy.orm import Session
+		from app import create_app, socketio, db
+		from app.models import Team
+		self.app = create_app()
+		self.app.config["TESTING"] = True
+		runs = len(self.args.modes)
+		with self.app.app_context():
+			db.create_all()
+			self.auction_a, teams, self.lots_a = _seed(db, self.args.teams, runs)
+			self.auction_b, self.lots_b = _extra_auction(db, "bench-admin", "B", runs)
+			self.auction_c, self.lots_c = _extra_auction(db, "bench-admin", "C", runs)
+			# C's price climbs for the whole stall; keep purses out of the way
+			Team.query.update({"budget_total": 10 ** 15, "budget_remaining": 10 ** 15})
+			db.session.commit()
+		event.listen(Session, "after_flush", self.slow.after_flush)
+		event.listen(Session, "before_commit", self.slow.before_commit)
+
+		admin_http = self.app.test_client()
+		admin_http.post("/login", data={"username": "bench-admin", "password": "bench"})
+		self.admin = socketio.test_client(self.app, flask_test_client=admin_http)
+		for team_id, username in teams:
+			http = self.app.test_client()
+			http.post("/login", data={"username": username, "password": "bench"})
+			self.teams.append((team_id, socketio.test_client(self.app, flask_test_client=http)))
+		for auction_id in (self.auction_a, self.auction_b, self.auction_c):
+			self.admin.emit("join_auction", {"auction_id": auction_id})
+		for _, client in self.teams:
+			client.emit("join_auction", {"auction_id": self.auction_c})
+
+	def _start(self, auction_id: int, lot, duration: int) -> float:
+		# Returns when, by perf_counter, the lot is due to close
+		self.admin.emit("start_player", {
+			"auction_id": auction_id,
+			"auction_player_id": lot[0],
+			"duration": duration,
+			"min_increment": MIN_INCREMENT,
+		})
+		return time.perf_counter() + duration
+
+	@staticmethod
+	def _when(auction_id: int, done) -> float:
+		# perf_counter time at which done(state) first held, polled every 2 ms
+		from app.sockets import get_state
+		while not done(get_state(auction_id)):
+			eventlet.sleep(0.002)
+		return time.perf_counter()
+
+	def run(self, mode: str, i: int) -> dict:
+		from app import db_executor
+		from app.sockets import finalize_sale
+		db_executor.enabled = mode == "executor"
+		db_executor._offload = None
+
+		lot_a, lot_b, lot_c = self.lots_a[i], self.lots_b[i], self.lots_c[i]
+		# B is due halfway through A's stalled commit; C stays open throughout
+		lead = self.args.lead
+		a_due = self._start(self.auction_a, lot_a, lead)
+		b_due = self._start(self.auction_b, lot_b, lead + max(1, round(self.args.delay / 2)))
+		self._start(self.auction_c, lot_c, 3600)
+		# No bids on A or B: a bid this close to the end would extend the lot.
+		# Closing A unsold still commits, and that commit is the one stalled.
+
+		acks: List[float] = []
+		outcomes: dict = {}
+		amount = [BASE_PRICE]
+		closing = [True]
+
+		def bidder(team_id: int, client) -> None:
+			while closing[0]:
+				amount[0] += MIN_INCREMENT
+				payload = {"auction_id": self.auction_c, "team_id": team_id, "amount": amount[0], "player_id": lot_c[1]}
+				t0 = time.perf_counter()
+				ack = client.emit("place_bid", payload, callback=True)
+				if time.perf_counter() >= a_due:
+					acks.append((time.perf_counter() - t0) * 1000)
+					reason = "accepted" if ack and ack.get("ok") else (ack or {}).get("reason", "no_ack")
+					outcomes[reason] = outcomes.get(reason, 0) + 1
+				eventlet.sleep(self.args.pace * random.uniform(0.5, 1.5))
+
+		self.slow.ap_id = lot_a[0]
+		hub_lag = _HubLag()
+		workers = [eventlet.spawn(bidder, team_id, client) for team_id, client in self.teams]
+		eventlet.sleep(max(0.0, a_due - time.perf_counter()))
+		hub_lag.start()
+		# The timer wheel stops bidding at the due time; the result is out once
+		# the sale has committed, which waits its turn on the single DB writer
+		stopped = lambda state: not state.timer_running
+		announced = lambda state: state.current_ap_id is None
+		probes = [eventlet.spawn(self._when, auction_id, done) for auction_id, done in (
+			(self.auction_a, announced), (self.auction_b, stopped), (self.auction_b, announced),
+		)]
+		a_sold, b_stopped, b_sold = [probe.wait() for probe in probes]
+		closing[0] = False
+		for worker in workers:
+			worker.wait()
+		hub_lag.stop()
+		self.slow.ap_id = None
+
+		with self.app.app_context():
+			finalize_sale(self.auction_c)
+		for _, client in self.teams:
+			client.get_received()
+		self.admin.get_received()
+		return {
+			"a_close_ms": round((a_sold - a_due) * 1000, 3),
+			"b_close_late_ms": round((b_stopped - b_due) * 1000, 3),
+			"b_result_late_ms": round((b_sold - b_due) * 1000, 3),
+			"c_bids": len(acks),
+			"c_outcomes": dict(sorted(outcomes.items())),
+			"c_ack_latency_ms": percentiles(acks),
+			"hub_lag_ms": percentiles(hub_lag.samples),
+		}
+
+
+def parse_args(argv=None):
+	parser = argparse.ArgumentParser(description="Check that a slow commit in one auction does not stall another")
+	parser.add_argument("--delay", type=float, default=2.0, help="seconds the injected commit blocks for")
+	parser.add_argument("--teams", type=int, default=4, help="team clients bidding in auction C")
+	parser.add_argument("--lead", type=int, default=1, help="seconds from the start of lot A to its close")
+	parser.add_argument("--pace", type=float, default=0.005, help="mean seconds between a team's bids")
+	parser.add_argument("--modes", nargs="+", choices=("executor", "inline"), default=["executor", "inline"])
+	parser.add_argument("--seed", type=int, default=1)
+	return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+	args = parse_args(argv)
+	random.seed(args.seed)
+	_setup_env(tempfile.mkdtemp(prefix="auction-bench-"))
+	bench = Bench(args)
+	bench.setup()
+	report = {"config": vars(args), "runs": {}}
+	for i, mode in enumerate(args.modes):
+		report["runs"][mode] = bench.run(mode, i)
+	report["stalled_commits"] = bench.slow.stalls
+	print(json.dumps(report, indent=2))
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
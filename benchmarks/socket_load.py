@@ -0,0 +1,400 @@
+# Socket-level load benchmark for one app process.
+#
+#   python -m benchmarks.socket_load --teams 8 --spectators 500 --output run.json
+#
+# Starts the app against a throwaway SQLite DB, connects N logged-in team
+# clients and M anonymous spectators through the in-process Socket.IO test
+# client, drives join_auction / start_player / place_bid / set_auto_bid for a
+# few scenarios and prints one JSON report (ack latency percentiles, bids/sec,
+# spectator frame lag, event-loop lag, memory per connection) so runs can be
+# diffed. --login-burst N adds N concurrent viewer logins to each scenario.
+# Transport cost (websocket framing, network) is not included.
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import eventlet
+
+SCENARIOS = ("war", "auto", "mixed")
+BASE_PRICE = 1000000
+MIN_INCREMENT = 100000
+
+
+def percentiles(samples: List[float]) -> dict:
+	if not samples:
+		return {"count": 0}
+	s = sorted(samples)
+
+	def pick(q: float) -> float:
+		return round(s[min(len(s) - 1, int(q * len(s)))], 3)
+
+	return {
+		"count": len(s),
+		"mean": round(sum(s) / len(s), 3),
+		"p50": pick(0.50),
+		"p90": pick(0.90),
+		"p99": pick(0.99),
+		"max": round(s[-1], 3),
+	}
+
+
+def _setup_env(workdir: str) -> None:
+	# Must run before the app package is imported by create_app
+	os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(workdir, "bench.db")
+	os.environ["AUCTION_JOURNAL_PATH"] = os.path.join(workdir, "auction_state.journal")
+	# Every simulated client logs in from 127.0.0.1
+	os.environ["LOGIN_RATE_LIMIT"] = "1000000000"
+
+
+def _seed(db, n_teams: int, n_lots: int, n_viewers: int = 0):
+	from app.models import User, Team, Player, Auction, AuctionPlayer
+	if n_viewers:
+		# One real hash shared by every viewer; hashing each would dominate setup
+		shared = User(username="bench-viewer0", email="bench-viewer0@example.com", role="spectator")
+		shared.set_password("bench")
+		db.session.add(shared)
+		for i in range(1, n_viewers):
+			db.session.add(User(username=f"bench-viewer{i}", email=f"bench-viewer{i}@example.com", role="spectator", password_hash=shared.password_hash))
+	admin = User(username="bench-admin", email="bench-admin@example.com", role="admin")
+	admin.set_password("bench")
+	db.session.add(admin)
+	db.session.flush()
+	teams = []
+	for i in range(n_teams):
+		user = User(username=f"bench-team{i}", email=f"bench-team{i}@example.com", role="team")
+		user.set_password("bench")
+		db.session.add(user)
+		db.session.flush()
+		team = Team(name=f"Bench Team {i}", owner_user_id=user.id, approved=True)
+		db.session.add(team)
+		teams.append(team)
+	auction = Auction(name="Benchmark", created_by_id=admin.id)
+	db.session.add(auction)
+	db.session.flush()
+	lots = []
+	for i in range(n_lots):
+		player = Player(name=f"Bench Player {i}", role="Batter", base_price=BASE_PRICE, approved=True)
+		db.session.add(player)
+		db.session.flush()
+		ap = AuctionPlayer(auction_id=auction.id, player_id=player.id, order_index=i)
+		db.session.add(ap)
+		lots.append(ap)
+	db.session.commit()
+	return auction.id, [(t.id, f"bench-team{i}") for i, t in enumerate(teams)], [(ap.id, ap.player_id) for ap in lots]
+
+
+class _FrameProbe:
+	# Drains every spectator queue on a short interval (so they do not grow
+	# for the whole run) and timestamps the frames seen by a sample of them.
+
+	def __init__(self, spectators: list, sample: int, interval: float) -> None:
+		self.spectators = spectators
+		self.sample = set(range(min(sample, len(spectators))))
+		self.interval = interval
+		self.accepted: Dict[int, float] = {}  # amount -> time the ack said it was accepted
+		self.lags: List[float] = []
+		self.frames = 0
+		self._running = False
+		self._thread = None
+
+	def start(self) -> None:
+		self._running = True
+		self._thread = eventlet.spawn(self._run)
+
+	def stop(self) -> None:
+		self._running = False
+		if self._thread is not None:
+			self._thread.wait()
+		self.drain()
+
+	def drain(self) -> None:
+		now = time.perf_counter()
+		for i, client in enumerate(self.spectators):
+			received = client.get_received()
+			if i not in self.sample:
+				continue
+			for msg in received:
+				if msg["name"] != "frame":
+					continue
+				self.frames += 1
+				frame = json.loads(msg["args"][0])
+				sent = self.accepted.get(frame.get("a"))
+				if sent is not None:
+					self.lags.append((now - sent) * 1000)
+
+	def _run(self) -> None:
+		while self._running:
+			eventlet.sleep(self.interval)
+			self.drain()
+
+
+class _HubLag:
+	# How late a 10 ms sleep wakes up: anything blocking the eventlet hub
+	# (hashing, a slow commit) shows up here even when no ack is in flight.
+
+	def __init__(self, interval: float = 0.01) -> None:
+		self.interval = interval
+		self.samples: List[float] = []
+		self._running = False
+		self._thread = None
+
+	def start(self) -> None:
+		self._running = True
+		self._thread = eventlet.spawn(self._run)
+
+	def stop(self) -> None:
+		self._running = False
+		if self._thread is not None:
+			self._thread.wait()
+
+	def _run(self) -> None:
+		while self._running:
+			t0 = time.perf_counter()
+			eventlet.sleep(self.interval)
+			self.samples.append(max(0.0, (time.perf_counter() - t0 - self.interval) * 1000))
+
+
+class _Team:
+	def __init__(self, team_id: int, client) -> None:
+		self.team_id = team_id
+		self.client = client
+		self.latest = 0
+
+	def refresh(self) -> None:
+		for msg in self.client.get_received():
+			if msg["name"] in ("bid_update", "snapshot"):
+				args = msg["args"][0]
+				self.latest = args.get("amount", args.get("highest_bid_amount", 0)) or 0
+			elif msg["name"] == "player_start":
+				self.latest = 0
+
+
+def _bidder(bench: "Bench", team: _Team, lot, bids: int, pace: float) -> None:
+	ap_id, player_id = lot
+	for _ in range(bids):
+		team.refresh()
+		amount = max(team.latest + MIN_INCREMENT, BASE_PRICE)
+		payload = {"auction_id": bench.auction_id, "team_id": team.team_id, "amount": amount, "player_id": player_id}
+		t0 = time.perf_counter()
+		ack = team.client.emit("place_bid", payload, callback=True)
+		t1 = time.perf_counter()
+		bench.record_ack(ack, t1 - t0, t1)
+		eventlet.sleep(pace * random.uniform(0.5, 1.5))
+
+
+class Bench:
+	def __init__(self, args) -> None:
+		self.args = args
+		self.app = None
+		self.auction_id = 0
+		self.teams: List[_Team] = []
+		self.spectators: list = []
+		self.lots: list = []
+		self.admin = None
+		self._lot = 0
+		self._acks: List[float] = []
+		self._outcomes: Dict[str, int] = {}
+		self._probe: Optional[_FrameProbe] = None
+		self._burst = None
+
+	def setup(self) -> dict:
+		from app import create_app, socketio, db
+		self.app = create_app()
+		self.app.config["TESTING"] = True
+		with self.app.app_context():
+			db.create_all()
+			lots_needed = len(self.args.scenarios) * self.args.lots
+			self.auction_id, teams, self.lots = _seed(db, self.args.teams, lots_needed, self.args.login_burst)
+
+		tracemalloc.start()
+		before = tracemalloc.take_snapshot()
+		t0 = time.perf_counter()
+		admin_http = self.app.test_client()
+		admin_http.post("/login", data={"username": "bench-admin", "password": "bench"})
+		self.admin = socketio.test_client(self.app, flask_test_client=admin_http)
+		for team_id, username in teams:
+			http = self.app.test_client()
+			http.post("/login", data={"username": username, "password": "bench"})
+			client = socketio.test_client(self.app, flask_test_client=http)
+			self.teams.append(_Team(team_id, client))
+		for _ in range(self.args.spectators):
+			self.spectators.append(socketio.test_client(self.app))
+		for client in [self.admin] + [t.client for t in self.teams] + self.spectators:
+			client.emit("join_auction", {"auction_id": self.auction_id})
+		connect_s = time.perf_counter() - t0
+		after = tracemalloc.take_snapshot()
+		tracemalloc.stop()
+		grown = sum(s.size_diff for s in after.compare_to(before, "filename"))
+		connections = len(self.teams) + len(self.spectators) + 1
+		for client in [self.admin] + [t.client for t in self.teams] + self.spectators:
+			client.get_received()
+		return {
+			"connections": connections,
+			"connect_and_join_s": round(connect_s, 3),
+			"bytes_per_connection": grown // connections,
+		}
+
+	def record_ack(self, ack, seconds: float, at: float) -> None:
+		self._acks.append(seconds * 1000)
+		if ack and ack.get("ok"):
+			reason = "accepted"
+			self._probe.accepted[ack["amount"]] = at
+		else:
+			reason = (ack or {}).get("reason", "no_ack")
+		self._outcomes[reason] = self._outcomes.get(reason, 0) + 1
+
+	def _next_lot(self):
+		lot = self.lots[self._lot]
+		self._lot += 1
+		return lot
+
+	def _start(self, lot) -> float:
+		t0 = time.perf_counter()
+		self.admin.emit("start_player", {
+			"auction_id": self.auction_id,
+			"auction_player_id": lot[0],
+			"duration": 3600,  # closed explicitly below, never by the timer
+			"min_increment": MIN_INCREMENT,
+		})
+		return (time.perf_counter() - t0) * 1000
+
+	def _finalize(self) -> float:
+		from app.sockets import finalize_sale
+		eventlet.sleep(self.args.settle)
+		t0 = time.perf_counter()
+		with self.app.app_context():
+			finalize_sale(self.auction_id)
+		return (time.perf_counter() - t0) * 1000
+
+	def _login_burst(self) -> Tuple[List[float], Dict[str, int]]:
+		# Viewers logging in all at once while bidding is under way
+		latencies: List[float] = []
+		statuses: Dict[str, int] = {}
+
+		def login(i: int) -> None:
+			http = self.app.test_client()
+			t0 = time.perf_counter()
+			resp = http.post("/login", data={"username": f"bench-viewer{i}", "password": "bench"})
+			latencies.append((time.perf_counter() - t0) * 1000)
+			statuses[str(resp.status_code)] = statuses.get(str(resp.status_code), 0) + 1
+
+		pool = eventlet.GreenPool(self.args.login_burst)
+		for i in range(self.args.login_burst):
+			pool.spawn_n(login, i)
+		self._burst = pool
+		return latencies, statuses
+
+	def _set_auto_bids(self, teams: List[_Team]) -> None:
+		# Spread limits so the proxy resolution has real work to do
+		for team in teams:
+			limit = BASE_PRICE + MIN_INCREMENT * random.randint(10, 10 + self.args.bids)
+			team.client.emit("set_auto_bid", {"auction_id": self.auction_id, "team_id": team.team_id, "max_limit": limit})
+
+	def run_scenario(self, name: str) -> dict:
+		from app import fanout
+		self._acks, self._outcomes = [], {}
+		self._probe = _FrameProbe(self.spectators, self.args.lag_sample, self.args.probe_interval)
+		start_ms: List[float] = []
+		finalize_ms: List[float] = []
+		fan0 = dict(fanout.stats())
+		hub_lag = _HubLag()
+		hub_lag.start()
+		self._probe.start()
+		t0 = time.perf_counter()
+		logins = self._login_burst() if self.args.login_burst else None
+		for _ in range(self.args.lots):
+			lot = self._next_lot()
+			start_ms.append(self._start(lot))
+			if name == "war":
+				manual = self.teams
+			elif name == "auto":
+				self._set_auto_bids(self.teams)
+				manual = self.teams[:1]  # one opening bid triggers the proxy war
+			else:
+				half = len(self.teams) // 2
+				self._set_auto_bids(self.teams[:half])
+				manual = self.teams[half:] or self.teams
+			bids = self.args.bids if name != "auto" else 1
+			workers = [eventlet.spawn(_bidder, self, team, lot, bids, self.args.pace) for team in manual]
+			for worker in workers:
+				worker.wait()
+			finalize_ms.append(self._finalize())
+		elapsed = time.perf_counter() - t0
+		if logins is not None:
+			self._burst.waitall()
+		self._probe.stop()
+		hub_lag.stop()
+		for team in self.teams:
+			team.client.get_received()
+		fan1 = fanout.stats()
+		accepted = self._outcomes.get("accepted", 0)
+		return {
+			"lots": self.args.lots,
+			"elapsed_s": round(elapsed, 3),
+			"bids_attempted": len(self._acks),
+			"bids_accepted": accepted,
+			"outcomes": dict(sorted(self._outcomes.items())),
+			"accepted_per_sec": round(accepted / elapsed, 1) if elapsed else 0,
+			"attempted_per_sec": round(len(self._acks) / elapsed, 1) if elapsed else 0,
+			"ack_latency_ms": percentiles(self._acks),
+			"start_player_ms": percentiles(start_ms),
+			"finalize_ms": percentiles(finalize_ms),
+			"spectator_frame_lag_ms": percentiles(self._probe.lags),
+			"hub_lag_ms": percentiles(hub_lag.samples),
+			"spectator_frames_seen": self._probe.frames,
+			"fanout": {k: fan1[k] - fan0[k] for k in fan1},
+			**({"login_burst": {"latency_ms": percentiles(logins[0]), "status": logins[1]}} if logins is not None else {}),
+		}
+
+
+def parse_args(argv=None):
+	parser = argparse.ArgumentParser(description="Socket.IO load benchmark for the auction server")
+	parser.add_argument("--teams", type=int, default=8, help="team (bidder) clients")
+	parser.add_argument("--spectators", type=int, default=200, help="spectator clients")
+	parser.add_argument("--lots", type=int, default=3, help="lots per scenario")
+	parser.add_argument("--bids", type=int, default=25, help="bids per team per lot")
+	parser.add_argument("--pace", type=float, default=0.002, help="mean seconds between a team's bids")
+	parser.add_argument("--settle", type=float, default=0.2, help="seconds to let frames drain before closing a lot")
+	parser.add_argument("--lag-sample", type=int, default=20, help="spectators whose frames are timed")
+	parser.add_argument("--probe-interval", type=float, default=0.001, help="seconds between spectator queue polls")
+	parser.add_argument("--login-burst", type=int, default=0, help="viewer logins fired concurrently at the start of each scenario")
+	parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+	parser.add_argument("--seed", type=int, default=1)
+	parser.add_argument("--output", help="also write the JSON report to this file")
+	return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+	args = parse_args(argv)
+	random.seed(args.seed)
+	workdir = tempfile.mkdtemp(prefix="auction-bench-")
+	_setup_env(workdir)
+	bench = Bench(args)
+	report = {
+		"started_at": datetime.utcnow().isoformat(),
+		"python": platform.python_version(),
+		"config": {k: v for k, v in vars(args).items() if k != "output"},
+		"memory": bench.setup(),
+		"scenarios": {},
+	}
+	for name in args.scenarios:
+		report["scenarios"][name] = bench.run_scenario(name)
+	text = json.dumps(report, indent=2)
+	print(text)
+	if args.output:
+		with open(args.output, "w", encoding="utf-8") as fh:
+			fh.write(text + "\n")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -5,7 +5,13 @@ app = create_app()
 if __name__ == "__main__":
 	# Create DB tables on first run
 	with app.app_context():
-		from app.models import db
+		from app.models import db, create_missing_indexes
 		db.create_all()
+		create_missing_indexes()
+		# Resume any lots that were live when the process last stopped
+		from app.sockets import restore_live_auctions
+		restored = restore_live_auctions()
+		if restored:
+			app.logger.info("Restored %d live auction(s) from the state journal", restored)
 	# Run SocketIO server (eventlet)
 	socketio.run(app, host="0.0.0.0", port=5000)
\ No newline at end of file
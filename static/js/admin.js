@@ -1,4 +1,11 @@
 (function(){
-	// Placeholder for live analytics via sockets on admin dashboards
-	// Future: connect to /admin room and update charts
+	// Admin sockets are joined to the "admin" room server-side
+	const socket = io();
+	const alerts = document.getElementById('fraudAlerts');
+	if (!alerts) return;
+	socket.on('fraud_alert', (a) => {
+		const li = document.createElement('li');
+		li.textContent = `[${a.rule}] Auction ${a.auction_id}: ${a.detail}`;
+		alerts.prepend(li);
+	});
 })();
\ No newline at end of file
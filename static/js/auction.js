@@ -26,6 +26,8 @@
 	const leaderboardChart = new Chart(leaderboardCtx, { type: 'bar', data: { labels: teamNames, datasets: [{ label: 'Spent (₹)', data: teamSpent, backgroundColor: '#8b5cf6' }]}, options: {responsive: true, scales: { y: { beginAtZero: true }}}});
 	const bidHistoryChart = new Chart(bidHistoryCtx, { type: 'line', data: { labels: [], datasets: [{ label: 'Bid (₹)', data: [], borderColor: '#6cf0ff'}]}, options: {responsive: true}});
 
+	// Server timestamps are naive UTC ISO strings
+	function parseTs(s){ return s ? new Date(/([zZ]|[+-]\d\d:\d\d)$/.test(s) ? s : s + 'Z') : null; }
 	function fmt(n){ return '₹' + (n||0).toLocaleString('en-IN'); }
 	function pushComment(text){
 		const li = document.createElement('li');
@@ -40,34 +42,96 @@
 		if (ap.player.highlight_url){ playerVideo.src = ap.player.highlight_url; playerVideo.style.display = 'block'; }
 	}
 
-	socket.on('connect', () => {
-		socket.emit('join_auction', { auction_id: auctionId });
+	// Count down locally from the lot's end time; server ticks only resync it
+	let lastShown = null;
+	function renderCountdown(){
+		if (!current.end){ countdown.textContent = '--'; lastShown = null; return; }
+		const remaining = Math.max(0, Math.ceil((current.end - Date.now()) / 1000));
+		if (remaining === lastShown) return;
+		lastShown = remaining;
+		countdown.textContent = remaining + 's';
+		if (remaining > 0 && remaining <= 10) beep();
+	}
+	setInterval(renderCountdown, 250);
+
+	// Room events carry a per-auction seq; on reconnect the server replays
+	// only what we missed (a 'resume') instead of a full snapshot
+	let lastSeq = null, epoch = null;
+	function rejoin(){
+		const msg = { auction_id: auctionId };
+		if (lastSeq !== null){ msg.last_seq = lastSeq; msg.epoch = epoch; }
+		socket.emit('join_auction', msg);
+	}
+	socket.onAny((event, data) => {
+		if (data && typeof data === 'object' && typeof data.seq === 'number' && event !== 'snapshot' && event !== 'resume'){
+			lastSeq = Math.max(lastSeq || 0, data.seq);
+		}
+	});
+	socket.on('connect', rejoin);
+
+	socket.on('resume', (r) => {
+		epoch = r.epoch;
+		r.events.forEach(([event, data]) => {
+			if (data.seq <= (lastSeq || 0)) return;
+			socket.listeners(event).forEach(fn => fn(data));
+			lastSeq = data.seq;
+		});
+		lastSeq = Math.max(lastSeq || 0, r.seq);
+		frameSeq = r.frame_seq;
+		if (r.current_ap_id && r.current_ap_id !== current.apId) showPlayer(r.current_ap_id);
+		current.apId = r.current_ap_id;
+		current.highest = r.highest_bid_amount || 0;
+		current.highestTeamId = r.highest_bid_team_id;
+		current.end = parseTs(r.end_time);
+		currentBid.textContent = fmt(current.highest);
 	});
 
 	socket.on('snapshot', (snap) => {
+		lastSeq = snap.seq; epoch = snap.epoch;
 		current.apId = snap.current_ap_id;
 		current.highest = snap.highest_bid_amount || 0;
 		current.highestTeamId = snap.highest_bid_team_id;
-		current.end = snap.end_time ? new Date(snap.end_time) : null;
+		current.end = parseTs(snap.end_time);
+		frameSeq = snap.frame_seq;
 		currentBid.textContent = fmt(current.highest);
-		bidHistoryChart.data.labels = snap.bid_history.map(b => new Date(b.ts).toLocaleTimeString());
+		bidHistoryChart.data.labels = snap.bid_history.map(b => parseTs(b.ts).toLocaleTimeString());
 		bidHistoryChart.data.datasets[0].data = snap.bid_history.map(b => b.amount);
 		bidHistoryChart.update();
+		if (snap.next_player) cacheCard(snap.next_player);
 		if (current.apId) showPlayer(current.apId);
 	});
 
+	// The runner announces the next lot while the current one is running
+	function cacheCard(card){
+		const idx = players.findIndex(p => p.id === card.id);
+		if (idx >= 0) players[idx] = card; else players.push(card);
+		if (card.player.highlight_url){
+			const link = document.createElement('link');
+			link.rel = 'prefetch'; link.href = card.player.highlight_url;
+			document.head.appendChild(link);
+		}
+	}
+	socket.on('next_player', (card) => {
+		cacheCard(card);
+		pushComment(`Up next: ${card.player.name} (${card.player.role})`);
+	});
+	socket.on('auction_complete', () => pushComment('Auction complete!'));
+
 	socket.on('player_start', (data) => {
+		current.highest = 0; current.highestTeamId = null;
+		current.end = parseTs(data.end_time);
 		showPlayer(data.auction_player_id);
 		pushComment('New player on the block!');
 	});
 
 	socket.on('tick', (data) => {
-		countdown.textContent = data.remaining + 's';
-		if (data.remaining <= 10) beep();
+		if (data.end_time) current.end = parseTs(data.end_time);
+		renderCountdown();
 	});
 
-	socket.on('bid_update', (data) => {
-		current.highest = data.amount; current.highestTeamId = data.team_id;
+	function applyBid(amount, bidTeamId, endTime){
+		current.highest = amount; current.highestTeamId = bidTeamId;
+		if (endTime) current.end = parseTs(endTime);
 		currentBid.textContent = fmt(current.highest);
 		bidAmount.value = current.highest + 100000;
 		gavel.classList.remove('drop');
@@ -75,21 +139,50 @@
 		bidHistoryChart.data.labels.push(new Date().toLocaleTimeString());
 		bidHistoryChart.data.datasets[0].data.push(current.highest);
 		bidHistoryChart.update();
+	}
+
+	// Bidders: every accepted bid, immediately
+	socket.on('bid_update', (data) => applyBid(data.amount, data.team_id, data.end_time));
+
+	// Spectators: coalesced delta frames {s: seq, a: amount, t: team, e: end_time}
+	let frameSeq = null;
+	socket.on('frame', (raw) => {
+		const f = JSON.parse(raw);
+		if (frameSeq !== null && f.s !== frameSeq + 1){
+			// Missed a frame: deltas no longer apply; resync (resume or snapshot)
+			frameSeq = null;
+			rejoin();
+			return;
+		}
+		frameSeq = f.s;
+		if ('a' in f) applyBid(f.a, f.t, f.e);
+		else if (f.e) current.end = parseTs(f.e);
 	});
 
 	socket.on('player_sold', (data) => {
+		current.end = null;
 		pushComment(`SOLD for ${fmt(data.final_price || 0)} to Team ${data.sold_to_team_id || '-'}!`);
 		gavel.classList.remove('drop'); setTimeout(()=> gavel.classList.add('drop'), 20);
-		const idx = teams.findIndex(t => t.id === data.sold_to_team_id);
-		if (idx >= 0){
-			const t = teams[idx];
-			const spent = Math.max(0, (t.budget_total||0) - (t.budget_remaining||0)) + (data.final_price||0);
-			leaderboardChart.data.datasets[0].data[idx] = spent;
-			leaderboardChart.update();
-		}
 		confetti();
 	});
 
+	// Server-maintained standings: loaded once, then patched per sale
+	function applyStanding(s){
+		let idx = teams.findIndex(t => t.id === s.team_id);
+		if (idx < 0){
+			teams.push({ id: s.team_id, name: s.name });
+			leaderboardChart.data.labels.push(s.name);
+			idx = teams.length - 1;
+		}
+		leaderboardChart.data.datasets[0].data[idx] = s.spend;
+	}
+	fetch(`/auction/live/${auctionId}/leaderboard`).then(r => r.ok ? r.json() : null).then(board => {
+		if (!board) return;
+		board.teams.forEach(applyStanding);
+		leaderboardChart.update();
+	}).catch(() => {});
+	socket.on('leaderboard', (s) => { applyStanding(s); leaderboardChart.update(); });
+
 	socket.on('commentary', (msg) => pushComment(msg.text));
 
 	function placeBid(){
@@ -0,0 +1,40 @@
+'use strict';
+(function(){
+	// Server pushes the changed lobby entries about once a second
+	const list = document.getElementById('lobby');
+	if (!list) return;
+	const socket = io();
+
+	function fmt(n){ return '₹' + (n||0).toLocaleString('en-IN'); }
+	function render(a){
+		let li = list.querySelector(`li[data-auction-id="${a.id}"]`);
+		if (!li){
+			li = document.createElement('li');
+			li.dataset.auctionId = a.id;
+			li.innerHTML = '<strong></strong> — <span class="status"></span> · <span class="viewers"></span> watching <span class="lot"></span> <a class="btn small">Open</a>';
+			li.querySelector('a').href = `/auction/live/${a.id}`;
+			list.appendChild(li);
+			const empty = list.querySelector('.empty');
+			if (empty) empty.remove();
+		}
+		li.querySelector('strong').textContent = a.name;
+		li.querySelector('.status').textContent = a.status;
+		li.querySelector('.viewers').textContent = a.viewers;
+		li.querySelector('.lot').textContent = a.lot ? `· ${a.lot.player_name}: ${fmt(a.high_bid)}${a.high_bid_team ? ` (${a.high_bid_team})` : ''}` : '';
+	}
+
+	socket.on('connect', () => socket.emit('join_lobby'));
+	socket.on('lobby', (data) => {
+		list.querySelectorAll('li[data-auction-id]').forEach(li => {
+			if (!data.auctions.some(a => String(a.id) === li.dataset.auctionId)) li.remove();
+		});
+		data.auctions.forEach(render);
+	});
+	socket.on('lobby_update', (data) => {
+		data.changed.forEach(render);
+		data.removed.forEach(id => {
+			const li = list.querySelector(`li[data-auction-id="${id}"]`);
+			if (li) li.remove();
+		});
+	});
+})();
@@ -0,0 +1,84 @@
+import itertools
+import os
+import tempfile
+
+import eventlet
+import pytest
+
+
+@pytest.fixture(scope="session")
+def vclock():
+	from app.clock import VirtualClock
+	return VirtualClock()
+
+
+@pytest.fixture(scope="session")
+def app(vclock):
+	workdir = tempfile.mkdtemp(prefix="auction-tests-")
+	os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(workdir, "test.db")
+	os.environ["AUCTION_JOURNAL_PATH"] = os.path.join(workdir, "auction_state.journal")
+	# Settle inline: the executor's worker thread runs on real time
+	os.environ["DB_EXECUTOR"] = "0"
+	from app import create_app, clock
+	from app.models import db
+	app = create_app()
+	app.config["TESTING"] = True
+	# Before any background loop starts, so every one of them sleeps on it
+	clock.use(vclock)
+	with app.app_context():
+		db.create_all()
+	return app
+
+
+@pytest.fixture
+def run_for(vclock):
+	# Move virtual time on by `seconds`, letting freshly spawned tasks start
+	def run_for(seconds):
+		until = vclock.elapsed_ns + int(seconds * 1e9)
+		while True:
+			eventlet.sleep(0)
+			wake = vclock.next_wake()
+			if wake is None or wake > until:
+				break
+			vclock.run_until(wake)
+		vclock.run_until(until)
+	return run_for
+
+
+_serial = itertools.count()
+
+
+@pytest.fixture
+def make_auction(app):
+	# An auction with approved teams and its lots, in order
+	from app.models import db, Auction, AuctionPlayer, Player, Team, User
+	made = []
+
+	def make_auction(n_lots=3, n_teams=2, budget=10000000):
+		n = next(_serial)
+		admin = User(username=f"admin{n}", email=f"admin{n}@example.com", role="admin", password_hash="x")
+		db.session.add(admin)
+		db.session.flush()
+		teams = []
+		for i in range(n_teams):
+			owner = User(username=f"owner{n}-{i}", email=f"owner{n}-{i}@example.com", role="team", password_hash="x")
+			db.session.add(owner)
+			db.session.flush()
+			team = Team(name=f"Team {n}-{i}", owner_user_id=owner.id, approved=True, budget_total=budget, budget_remaining=budget)
+			db.session.add(team)
+			teams.append(team)
+		auction = Auction(name=f"Auction {n}", created_by_id=admin.id)
+		players = [Player(name=f"Player {n}-{i}", role="Batter", base_price=100000, approved=True) for i in range(n_lots)]
+		db.session.add(auction)
+		db.session.add_all(players)
+		db.session.flush()
+		lots = [AuctionPlayer(auction_id=auction.id, player_id=p.id, order_index=i) for i, p in enumerate(players)]
+		db.session.add_all(lots)
+		db.session.commit()
+		made.append(auction.id)
+		return auction.id, [t.id for t in teams], [ap.id for ap in lots]
+
+	yield make_auction
+	from app import auction_runner
+	for auction_id in made:
+		auction_runner.stop(auction_id)
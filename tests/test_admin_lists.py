@@ -0,0 +1,47 @@
+import pytest
+
+from app.models import db, User
+
+JUNK = ["garbage", "|", "x|7", "2026-03-01T18:30:05|x", "not-a-date|7", "99999999999999999999", "Ann|99999999999999999999"]
+
+
+@pytest.fixture
+def admin_client(app):
+	with app.app_context():
+		admin = User(username="lists-admin", email="lists-admin@example.com", role="admin", password_hash="x")
+		db.session.add(admin)
+		db.session.commit()
+		admin_id = admin.id
+	client = app.test_client()
+	with client.session_transaction() as session:
+		session["_user_id"] = str(admin_id)
+		session["_fresh"] = True
+	yield client
+	with app.app_context():
+		db.session.delete(db.session.get(User, admin_id))
+		db.session.commit()
+
+
+@pytest.mark.parametrize("cursor", JUNK)
+@pytest.mark.parametrize("param", ["auctions_after", "teams_after", "players_after"])
+def test_dashboard_falls_back_to_the_first_page(admin_client, param, cursor):
+	response = admin_client.get("/admin/dashboard", query_string={param: cursor})
+	assert response.status_code == 200
+
+
+# Any name is a valid key here, so only the id part can be junk
+@pytest.mark.parametrize("cursor", ["garbage", "|", "Ann|x", "99999999999999999999", "Ann|99999999999999999999"])
+def test_player_search_rejects_a_junk_cursor(admin_client, cursor):
+	response = admin_client.get("/admin/players/search", query_string={"cursor": cursor})
+	assert response.status_code == 400
+	assert response.get_json() == {"error": "invalid cursor"}
+
+
+def test_player_search_pages_with_its_own_cursor(admin_client, make_auction, app):
+	with app.app_context():
+		make_auction(n_lots=3)
+	first = admin_client.get("/admin/players/search", query_string={"status": "approved", "limit": 1}).get_json()
+	assert first["next_cursor"]
+	second = admin_client.get("/admin/players/search", query_string={"status": "approved", "limit": 1, "cursor": first["next_cursor"]})
+	assert second.status_code == 200
+	assert second.get_json()["players"][0]["id"] != first["players"][0]["id"]
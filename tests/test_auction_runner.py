@@ -0,0 +1,42 @@
+from app import auction_runner, state_store
+from app.models import db, AuctionPlayer
+from app.sockets import get_state, on_start_player
+
+
+def test_start_twice_keeps_the_live_lot(app, make_auction):
+	with app.app_context():
+		auction_id, (team, _), (first, *_) = make_auction()
+		run = auction_runner.start(auction_id, duration=30)
+		state = get_state(auction_id)
+		assert state.current_ap_id == first
+		assert state_store.try_accept_bid(state, team, 100000)
+
+		assert auction_runner.start(auction_id, duration=30) is run
+		state = get_state(auction_id)
+		assert (state.current_ap_id, state.highest_bid_team_id, state.highest_bid_amount) == (first, team, 100000)
+
+
+def test_start_adopts_a_lot_started_by_hand(app, make_auction):
+	with app.app_context():
+		auction_id, (team, _), (first, second, third) = make_auction()
+		on_start_player({"auction_id": auction_id, "auction_player_id": second, "duration": 30})
+		state_store.try_accept_bid(get_state(auction_id), team, 100000)
+
+		run = auction_runner.start(auction_id, duration=30)
+		assert run.current_ap_id == second
+		assert list(run.queue) == [first, third]
+		assert get_state(auction_id).highest_bid_team_id == team
+
+
+def test_skip_passes_the_lot_on_the_block(app, make_auction, run_for):
+	with app.app_context():
+		auction_id, (team, _), (first, second, _) = make_auction()
+		run = auction_runner.start(auction_id, duration=30, gap=1.0)
+		state_store.try_accept_bid(get_state(auction_id), team, 100000)
+
+		auction_runner.skip(auction_id)
+		assert db.session.get(AuctionPlayer, first).status == "unsold"
+		assert run.unsold == [first]
+		run_for(1.5)
+		assert get_state(auction_id).current_ap_id == second
+		assert get_state(auction_id).highest_bid_team_id is None
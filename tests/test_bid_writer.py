@@ -0,0 +1,68 @@
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from app import bid_writer
+from app.bid_writer import BidWriter
+from app.models import db, AuctionPlayer, Bid
+from app.sockets import SETTLE_RETRY_DELAY, _record_bid, finalize_sale, get_state, on_start_player
+from app import state_store
+
+
+def _reject(amounts=None, error=IntegrityError):
+	# An _insert that fails any batch holding one of `amounts` (all if None)
+	insert = BidWriter._insert
+
+	def failing(batch):
+		if amounts is None or any(row["amount"] in amounts for row in batch):
+			raise error("INSERT", {}, Exception("rejected"))
+		insert(batch)
+	return staticmethod(failing)
+
+
+def _bid(auction_id, team_id, amount, player_id):
+	state = get_state(auction_id)
+	assert state_store.try_accept_bid(state, team_id, amount)
+	_record_bid(state, team_id, amount, player_id, None)
+
+
+def _lot_bids(ap):
+	return sorted(r.amount for r in db.session.query(Bid.amount).filter_by(auction_id=ap.auction_id, player_id=ap.player_id))
+
+
+def test_a_dropped_winning_bid_is_recorded_with_the_sale(app, make_auction, monkeypatch):
+	with app.app_context():
+		auction_id, (team, rival), (ap_id,) = make_auction(n_lots=1)
+		ap = db.session.get(AuctionPlayer, ap_id)
+		on_start_player({"auction_id": auction_id, "auction_player_id": ap_id, "duration": 30})
+		monkeypatch.setattr(BidWriter, "_insert", _reject({200000}))
+		dropped = bid_writer.dropped
+		_bid(auction_id, rival, 100000, ap.player_id)
+		_bid(auction_id, team, 200000, ap.player_id)
+
+		assert bid_writer.flush() is False
+		assert bid_writer.dropped == dropped + 1
+		finalize_sale(auction_id)
+		db.session.expire_all()
+		assert (ap.status, ap.sold_to_team_id, ap.final_price) == ("sold", team, 200000)
+		assert _lot_bids(ap) == [100000, 200000]
+
+
+def test_a_close_during_an_outage_settles_once_the_database_is_back(app, make_auction, monkeypatch, run_for, caplog):
+	with app.app_context():
+		auction_id, (team, _), (ap_id,) = make_auction(n_lots=1)
+		ap = db.session.get(AuctionPlayer, ap_id)
+		on_start_player({"auction_id": auction_id, "auction_player_id": ap_id, "duration": 1})
+		monkeypatch.setattr(BidWriter, "_insert", _reject(error=OperationalError))
+		_bid(auction_id, team, 100000, ap.player_id)
+
+		run_for(1.5)
+		assert not get_state(auction_id).timer_running
+		assert get_state(auction_id).current_ap_id == ap_id
+		assert bid_writer.pending >= 1
+		assert "could not be written" in caplog.text
+
+		monkeypatch.undo()
+		run_for(SETTLE_RETRY_DELAY * 4)
+		db.session.expire_all()
+		assert (ap.status, ap.final_price) == ("sold", 100000)
+		assert get_state(auction_id).current_ap_id is None
+		assert _lot_bids(ap) == [100000]
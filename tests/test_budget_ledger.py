@@ -0,0 +1,95 @@
+import threading
+
+import pytest
+
+from app.budget_ledger import InProcessLedger, RedisLedger, TeamBudget
+
+TEAM = 1
+RIVAL = 2
+
+
+@pytest.fixture
+def redis_client():
+	fakeredis = pytest.importorskip("fakeredis")
+	pytest.importorskip("lupa")  # fakeredis needs it for EVAL
+	import redis
+	server = fakeredis.TcpFakeServer(("127.0.0.1", 0))
+	thread = threading.Thread(target=server.serve_forever, daemon=True)
+	thread.start()
+	yield redis.Redis(port=server.server_address[1], decode_responses=True)
+	server.shutdown()
+	server.server_close()
+
+
+def _in_process(purses):
+	ledger = InProcessLedger()
+	for team_id, remaining in purses.items():
+		ledger._teams[team_id] = TeamBudget(team_id=team_id, approved=True, remaining=remaining)
+	ledger._loaded = True
+	return ledger
+
+
+def _shared(client, purses):
+	ledger = RedisLedger(client)
+	for team_id, remaining in purses.items():
+		client.hset(ledger._team_key(team_id), mapping={"approved": "1", "remaining": remaining})
+	return ledger
+
+
+def test_reservations_hold_across_workers(redis_client):
+	# Two workers, each with its own ledger over the same Redis
+	a = _shared(redis_client, {TEAM: 1000})
+	b = RedisLedger(redis_client)
+	assert a.try_reserve(TEAM, 1, 600) == 0
+	assert b.available(TEAM, 2) == 400
+	assert b.try_reserve(TEAM, 2, 600) is None
+	# Raising its own high bid in the same auction replaces the reservation
+	assert b.try_reserve(TEAM, 1, 900) == 600
+	assert a.available(TEAM, 2) == 100
+
+	# The sale is committed on worker A; worker B sees the new purse
+	a.commit(TEAM, 1, 100)
+	assert b.available(TEAM, 2) == 100
+	assert b.try_reserve(TEAM, 2, 100) == 0
+
+
+def test_invalidate_reloads_on_every_worker(redis_client):
+	a = _shared(redis_client, {TEAM: 1000})
+	b = RedisLedger(redis_client)
+	a.try_reserve(TEAM, 1, 300)
+	loaded = []
+	b._load = lambda team_id: (loaded.append(team_id), redis_client.hset(b._team_key(team_id), mapping={"approved": "1", "remaining": 2000}))
+	a.invalidate(TEAM)
+	# Reservations are runtime state and survive the reload
+	assert b.available(TEAM, 2) == 1700
+	assert loaded == [TEAM]
+
+
+@pytest.mark.parametrize("backend", ["in_process", "redis"])
+def test_outbid_and_lost_bids_free_the_purse(backend, request):
+	purses = {TEAM: 1000, RIVAL: 1000}
+	ledger = _in_process(purses) if backend == "in_process" else _shared(request.getfixturevalue("redis_client"), purses)
+
+	assert ledger.try_reserve(RIVAL, 1, 500) == 0
+	assert ledger.try_reserve(TEAM, 1, 600) == 0
+	ledger.release_others(1, TEAM, 600)
+	assert ledger.available(RIVAL, 2) == 1000
+	assert ledger.available(TEAM, 2) == 400
+
+	# A bid that lost the compare-and-set gives back the reservation it replaced
+	assert ledger.try_reserve(TEAM, 1, 700) == 600
+	ledger.restore(TEAM, 1, 700, 600)
+	assert ledger.available(TEAM, 2) == 400
+
+	ledger.release_auction(1)
+	assert ledger.available(TEAM, 2) == 1000
+
+
+def test_spend_budget_rejects_an_overdraft():
+	from app.models import Team
+	team = Team(budget_remaining=500)
+	with pytest.raises(ValueError):
+		team.spend_budget(600)
+	assert team.budget_remaining == 500
+	team.spend_budget(500)
+	assert team.budget_remaining == 0
@@ -0,0 +1,29 @@
+import sys
+import threading
+
+from app.entity_cache import _LRU, _MISSING
+
+
+def test_lru_survives_invalidations_from_another_thread():
+	# after_commit runs on the DB executor's native thread while the hub reads
+	cache = _LRU(maxsize=64, ttl=60.0)
+	stop = threading.Event()
+
+	def invalidate():
+		while not stop.is_set():
+			cache.discard("hot")
+
+	interval = sys.getswitchinterval()
+	sys.setswitchinterval(1e-6)  # switch threads often enough to hit the window
+	thread = threading.Thread(target=invalidate)
+	thread.start()
+	try:
+		for i in range(300000):
+			# Without the lock this raises KeyError from move_to_end
+			if cache.get("hot") is _MISSING:
+				cache.put("hot", i)
+	finally:
+		stop.set()
+		thread.join()
+		sys.setswitchinterval(interval)
+	assert cache.hits + cache.misses == 300000
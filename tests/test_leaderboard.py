@@ -0,0 +1,20 @@
+from app.models import db, Team
+
+
+def test_rebuild_leaderboards_fails_on_budget_drift(app, make_auction):
+	runner = app.test_cli_runner()
+	with app.app_context():
+		_, (team_id, _), _ = make_auction(n_lots=1)
+		result = runner.invoke(args=["rebuild-leaderboards"])
+		assert result.exit_code == 0, result.output
+
+		team = db.session.get(Team, team_id)
+		team.budget_remaining -= 500000  # spent on nothing it bought
+		db.session.commit()
+		try:
+			result = runner.invoke(args=["rebuild-leaderboards"])
+			assert result.exit_code == 1
+			assert f"team {team_id}: budget says 500,000 spent, purchases total 0" in result.output
+		finally:
+			team.budget_remaining += 500000
+			db.session.commit()
@@ -0,0 +1,16 @@
+import pytest
+from werkzeug.security import generate_password_hash
+
+from app.passwords import PasswordHasher, method_spec
+
+
+@pytest.mark.parametrize("method", ["scrypt", "scrypt:16384:8:1", "pbkdf2", "pbkdf2:sha512", "pbkdf2:sha256:1000"])
+def test_method_spec_matches_werkzeug(method):
+	assert method_spec(method) == generate_password_hash("x", method).split("$", 1)[0]
+
+
+def test_needs_rehash_does_not_hash(monkeypatch):
+	hasher = PasswordHasher(method="pbkdf2:sha256:1000")
+	monkeypatch.setattr("app.passwords.generate_password_hash", lambda *a: pytest.fail("hashed inline"))
+	assert not hasher.needs_rehash("pbkdf2:sha256:1000$salt$hash")
+	assert hasher.needs_rehash("scrypt:32768:8:1$salt$hash")
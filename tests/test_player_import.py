@@ -0,0 +1,26 @@
+import io
+
+import pytest
+
+from app.models import db, AuctionPlayer, Player
+from app.player_import import import_players
+
+ROWS = "name,role,base_price\nImport Test Batter,Batter,2000000\n"
+
+
+def test_import_into_a_missing_auction_writes_nothing(app):
+	with app.app_context():
+		players = db.session.query(Player).count()
+		lots = db.session.query(AuctionPlayer).count()
+		with pytest.raises(ValueError, match="no auction"):
+			import_players(io.StringIO(ROWS), "csv", auction_id=999999)
+		assert db.session.query(Player).count() == players
+		assert db.session.query(AuctionPlayer).count() == lots
+
+
+def test_import_into_an_auction_pools_the_players(app, make_auction):
+	with app.app_context():
+		auction_id, _, _ = make_auction(n_lots=0)
+		report = import_players(io.StringIO(ROWS), "csv", auction_id=auction_id)
+		assert report.pooled == 1
+		assert db.session.query(AuctionPlayer).filter_by(auction_id=auction_id).count() == 1
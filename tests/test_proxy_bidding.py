@@ -0,0 +1,68 @@
+import random
+import time
+
+from app.proxy_bidding import resolve_proxy_bids
+
+INC = 100
+MANUAL = 99  # a team that bid by hand and has no auto-bid
+
+
+def _budgets(auto_bids, amount=10 ** 9):
+	return {team_id: amount for team_id in auto_bids}
+
+
+def test_equal_limits_go_to_the_earlier_registration():
+	auto_bids = {1: 5000, 2: 5000}
+	assert resolve_proxy_bids(1000, MANUAL, INC, auto_bids, _budgets(auto_bids)) == [(2, 4900), (1, 5000)]
+	# Registration order, not team id, decides
+	auto_bids = {2: 5000, 1: 5000}
+	assert resolve_proxy_bids(1000, MANUAL, INC, auto_bids, _budgets(auto_bids)) == [(1, 4900), (2, 5000)]
+
+
+def test_price_is_second_limit_plus_one_increment():
+	auto_bids = {1: 5000, 2: 3000}
+	assert resolve_proxy_bids(1000, MANUAL, INC, auto_bids, _budgets(auto_bids)) == [(2, 3000), (1, 3100)]
+	# The leader's own proxy defends its lead the same way
+	assert resolve_proxy_bids(1000, 1, INC, auto_bids, _budgets(auto_bids)) == [(2, 3000), (1, 3100)]
+
+
+def test_limits_are_capped_by_budget_remaining():
+	auto_bids = {1: 10000, 2: 6000}
+	budgets = {1: 3000, 2: 6000}
+	assert resolve_proxy_bids(1000, MANUAL, INC, auto_bids, budgets) == [(1, 3000), (2, 3100)]
+	# A team without a budget entry (unapproved) cannot auto-bid at all
+	assert resolve_proxy_bids(1000, MANUAL, INC, auto_bids, {2: 6000}) == [(2, 1100)]
+
+
+def test_limits_below_the_current_price_are_ignored():
+	auto_bids = {1: 900, 2: 1050}
+	assert resolve_proxy_bids(1000, MANUAL, INC, auto_bids, _budgets(auto_bids)) == []
+	# One proxy left above the floor just clears the manual bid
+	auto_bids = {1: 900, 2: 5000}
+	assert resolve_proxy_bids(1000, MANUAL, INC, auto_bids, _budgets(auto_bids)) == [(2, 1100)]
+
+
+def test_leader_outbid_by_nobody_places_nothing():
+	auto_bids = {1: 5000}
+	assert resolve_proxy_bids(1000, 1, INC, auto_bids, _budgets(auto_bids)) == []
+
+
+def test_thousands_of_bidders():
+	rng = random.Random(4)
+	auto_bids = {team_id: rng.randrange(1000, 500000, INC) for team_id in range(1, 5001)}
+	budgets = {team_id: rng.randrange(1000, 500000, INC) for team_id in auto_bids}
+	t0 = time.perf_counter()
+	bids = resolve_proxy_bids(1000, MANUAL, INC, auto_bids, budgets)
+	elapsed = time.perf_counter() - t0
+
+	# Reference: sort by effective limit, earliest registration first on ties
+	ranked = sorted(
+		((min(limit, budgets[team_id]), seq, team_id) for seq, (team_id, limit) in enumerate(auto_bids.items())),
+		key=lambda c: (-c[0], c[1]),
+	)
+	(win_limit, _, winner), (run_limit, _, runner) = ranked[:2]
+	expected = [(winner, min(win_limit, run_limit + INC))]
+	if min(run_limit, win_limit - INC) >= 1000 + INC:
+		expected.insert(0, (runner, min(run_limit, win_limit - INC)))
+	assert bids == expected
+	assert elapsed < 0.5
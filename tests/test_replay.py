@@ -0,0 +1,17 @@
+from datetime import datetime
+
+import pytest
+
+from app.replay import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+	ts = datetime(2026, 3, 1, 18, 30, 5, 123456)
+	assert decode_cursor(encode_cursor(ts, 42)) == (ts, 42)
+
+
+@pytest.mark.parametrize("cursor", ["garbage", "2026-03-01T18:30:05|x", "|", "not-a-date|7"])
+def test_malformed_cursor_is_a_bad_request(app, cursor):
+	response = app.test_client().get("/auction/replay/1/bids", query_string={"player_id": 1, "cursor": cursor})
+	assert response.status_code == 400
+	assert response.get_json() == {"error": "invalid cursor"}
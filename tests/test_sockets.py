@@ -0,0 +1,96 @@
+import eventlet
+
+from app import auction_runner, clock, fanout, state_store
+from app import sockets
+from app.models import db, AuctionPlayer
+from app.sockets import _place_bid, get_state, on_start_player
+
+SLOW_COMMIT = 3.0
+
+
+def _slow_settle_for(monkeypatch, slow_ap_id):
+	settle = sockets._settle_lot
+
+	def slow_settle(ap_id, team_id, amount):
+		if ap_id == slow_ap_id:
+			clock.sleep(SLOW_COMMIT)  # a stalled commit, in virtual time
+		return settle(ap_id, team_id, amount)
+
+	monkeypatch.setattr(sockets, "_settle_lot", slow_settle)
+
+
+def test_slow_settle_does_not_hold_up_other_auctions(app, make_auction, run_for, vclock, monkeypatch):
+	with app.app_context():
+		auction_a, (team, _), (lot_a, *_) = make_auction(n_lots=1)
+		auction_b, (team_b, _), (lot_b, *_) = make_auction(n_lots=1)
+		auction_c, (team_c, _), (lot_c, *_) = make_auction(n_lots=1)
+		_slow_settle_for(monkeypatch, lot_a)
+
+		closed = {}
+		lot_closed = auction_runner.lot_closed
+
+		def record_close(auction_id, ap_id, status):
+			closed[auction_id] = (vclock.elapsed - t0, status)
+			lot_closed(auction_id, ap_id, status)
+
+		ticks = []
+		emit = fanout.emit
+
+		def record_tick(auction_id, event, payload, log=True):
+			if auction_id == auction_c and event == "tick":
+				ticks.append(vclock.elapsed - t0)
+			emit(auction_id, event, payload, log)
+
+		monkeypatch.setattr(auction_runner, "lot_closed", record_close)
+		monkeypatch.setattr(fanout, "emit", record_tick)
+
+		acks = []
+
+		def bid_on_c():
+			# Lands while A's commit is stalled
+			clock.sleep(2.5)
+			with app.test_request_context():
+				ack = _place_bid({"auction_id": auction_c, "team_id": team_c, "amount": 100000, "player_id": 0})
+			acks.append((vclock.elapsed - t0, ack["ok"]))
+
+		t0 = vclock.elapsed
+		on_start_player({"auction_id": auction_a, "auction_player_id": lot_a, "duration": 1})
+		on_start_player({"auction_id": auction_b, "auction_player_id": lot_b, "duration": 2})
+		# First resync tick at 2s, while A is still settling
+		on_start_player({"auction_id": auction_c, "auction_player_id": lot_c, "duration": 12})
+		state_store.try_accept_bid(get_state(auction_a), team, 100000)
+		state_store.try_accept_bid(get_state(auction_b), team_b, 100000)
+		eventlet.spawn(bid_on_c)
+		run_for(SLOW_COMMIT + 2)
+
+	wheel = sockets.timer_wheel.resolution
+	b_at, b_status = closed[auction_b]
+	a_at, a_status = closed[auction_a]
+	assert (a_status, b_status) == ("sold", "sold")
+	# B closes on its own schedule while A's commit is still stalled
+	assert 2.0 <= b_at <= 2.0 + 2 * wheel
+	assert a_at >= 1.0 + SLOW_COMMIT
+	# and C keeps acking bids and resyncing its clients
+	assert acks == [(2.5, True)]
+	assert ticks and 2.0 <= ticks[0] <= 2.0 + 2 * wheel
+
+
+def test_next_lot_waits_for_the_last_one_to_settle(app, make_auction, run_for, monkeypatch):
+	with app.app_context():
+		auction_id, (team, rival), (first, second) = make_auction(n_lots=2)
+		_slow_settle_for(monkeypatch, first)
+		on_start_player({"auction_id": auction_id, "auction_player_id": first, "duration": 1})
+		state_store.try_accept_bid(get_state(auction_id), team, 100000)
+		run_for(1.5)
+
+		# Bidding on the first lot has stopped but its commit hasn't landed
+		assert on_start_player({"auction_id": auction_id, "auction_player_id": second, "duration": 30}) == {"ok": False, "reason": "settling"}
+		run_for(SLOW_COMMIT)
+
+		# The lot that closed was settled, with the bid it closed on
+		lot = db.session.get(AuctionPlayer, first)
+		assert (lot.status, lot.sold_to_team_id, lot.final_price) == ("sold", team, 100000)
+		assert db.session.get(AuctionPlayer, second).status == "available"
+		assert get_state(auction_id).current_ap_id is None
+		assert on_start_player({"auction_id": auction_id, "auction_player_id": second, "duration": 30}) == {"ok": True}
+		sockets.pass_lot(auction_id)
@@ -0,0 +1,93 @@
+import multiprocessing
+import threading
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")  # fakeredis needs it for EVAL
+
+AUCTION_ID = 1
+AP_ID = 7
+INCREMENT = 100
+TARGET = 3000
+
+
+def _bidder(port: int, team_id: int, results) -> None:
+	# One worker process: keep bidding one increment over whatever it last saw
+	import redis
+	from app.state_store import RedisBackend
+	backend = RedisBackend(redis.Redis(port=port, decode_responses=True))
+	accepted = []
+	while True:
+		state = backend.get(AUCTION_ID)
+		if state.highest_bid_amount >= TARGET:
+			break
+		amount = state.highest_bid_amount + state.min_increment
+		if backend.try_accept_bid(state, team_id, amount):
+			accepted.append(amount)
+	results.put((team_id, accepted))
+
+
+@pytest.fixture
+def redis_port():
+	server = fakeredis.TcpFakeServer(("127.0.0.1", 0))
+	thread = threading.Thread(target=server.serve_forever, daemon=True)
+	thread.start()
+	yield server.server_address[1]
+	server.shutdown()
+	server.server_close()
+
+
+def test_one_winner_per_price_step_across_processes(redis_port):
+	import redis
+	from app.state_store import AuctionState, RedisBackend
+	backend = RedisBackend(redis.Redis(port=redis_port, decode_responses=True))
+	backend.save(AuctionState(auction_id=AUCTION_ID, current_ap_id=AP_ID, min_increment=INCREMENT, timer_running=True))
+
+	ctx = multiprocessing.get_context("spawn")
+	results = ctx.Queue()
+	workers = [ctx.Process(target=_bidder, args=(redis_port, team_id, results)) for team_id in range(1, 5)]
+	for worker in workers:
+		worker.start()
+	by_team = dict(results.get(timeout=60) for _ in workers)
+	for worker in workers:
+		worker.join(timeout=10)
+		assert worker.exitcode == 0
+
+	accepted = sorted(amount for amounts in by_team.values() for amount in amounts)
+	# Every step from the opening bid to the target was won exactly once
+	assert accepted == list(range(INCREMENT, TARGET + 1, INCREMENT))
+	final = backend.get(AUCTION_ID)
+	assert final.highest_bid_amount == TARGET
+	assert TARGET in by_team[final.highest_bid_team_id]
+
+
+def test_bid_for_a_stale_lot_is_rejected(redis_port):
+	import redis
+	from app.state_store import AuctionState, RedisBackend
+	backend = RedisBackend(redis.Redis(port=redis_port, decode_responses=True))
+	backend.save(AuctionState(auction_id=AUCTION_ID, current_ap_id=AP_ID, min_increment=INCREMENT, timer_running=True))
+	stale = backend.get(AUCTION_ID)
+	stale.current_ap_id = AP_ID - 1
+	assert not backend.try_accept_bid(stale, 1, INCREMENT)
+	assert backend.try_accept_bid(backend.get(AUCTION_ID), 1, INCREMENT)
+	assert not backend.try_accept_bid(backend.get(AUCTION_ID), 2, INCREMENT)
+
+
+def test_only_one_worker_stops_a_lot(redis_port):
+	import redis
+	from app.state_store import AuctionState, RedisBackend
+	workers = [RedisBackend(redis.Redis(port=redis_port, decode_responses=True)) for _ in range(2)]
+	workers[0].save(AuctionState(auction_id=AUCTION_ID, current_ap_id=AP_ID, min_increment=INCREMENT, timer_running=True))
+	assert workers[0].try_accept_bid(workers[0].get(AUCTION_ID), 3, INCREMENT)
+	# Both close timers fire having seen the lot running
+	seen = [backend.get(AUCTION_ID) for backend in workers]
+	assert [backend.try_stop_bidding(state) for backend, state in zip(workers, seen)] == [True, False]
+	assert not workers[1].get(AUCTION_ID).timer_running
+	# The winner settles the high bid as it stood at the stop
+	assert (seen[0].highest_bid_team_id, seen[0].highest_bid_amount) == (3, INCREMENT)
+
+	# A close timer left over from the previous lot doesn't stop the next one
+	workers[0].save(AuctionState(auction_id=AUCTION_ID, current_ap_id=AP_ID + 1, timer_running=True))
+	assert not workers[1].try_stop_bidding(seen[1])
+	assert workers[1].get(AUCTION_ID).timer_running
@@ -0,0 +1,39 @@
+import numpy as np
+
+from app import valuation
+from app.valuation import MarketCache, estimate_valuation
+
+
+def _market():
+	return valuation.Market(
+		np.array([1], dtype=np.int64),
+		np.zeros((1, 5)),
+		np.array(["Batter"], dtype=object),
+		np.array([5000000.0]),
+		np.zeros(5),
+		np.ones(5),
+	)
+
+
+def test_market_is_built_once_until_a_sale(monkeypatch):
+	loads = []
+	monkeypatch.setattr(valuation, "load_market", lambda: loads.append(1) or _market())
+	monkeypatch.setattr(valuation, "market_cache", MarketCache())
+	stats = {"matches": 10, "runs": 300, "wickets": 2, "strike_rate": 130.0, "economy": 8.0}
+
+	first = estimate_valuation(stats, "Batter", 1000000)
+	assert estimate_valuation(dict(stats, runs=400), "Batter", 1000000) >= first
+	assert len(loads) == 1
+
+	valuation.market_cache.invalidate()
+	estimate_valuation(stats, "Batter", 1000000)
+	assert len(loads) == 2
+
+
+def test_market_ages_out(monkeypatch):
+	loads = []
+	monkeypatch.setattr(valuation, "load_market", lambda: loads.append(1) or _market())
+	markets = MarketCache(ttl=0)
+	markets.get()
+	markets.get()
+	assert len(loads) == 2